@@ -0,0 +1,107 @@
+# bench_html.py
+"""
+Markdown -> HTML with per-theme chunk caching, against one md.render() per document.
+
+    python benchmarks/bench_html.py
+    python benchmarks/bench_html.py --profiles 5000 --edits 500 --fuzz 50000
+
+Three runs: --profiles distinct synthetic profiles (a batch --html export),
+--edits single-field edits of one profile (the live preview), and --fuzz
+random documents built from Markdown constructs that defeat naive chunking
+(unclosed fences and HTML blocks, loose lists, link references, setext
+headings, ...). Fails (exit 1) if any HTML differs from a plain md.render().
+"""
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from profilegen.generate_readme import RenderContext, _load_theme, render_profile  # noqa: E402
+from profilegen.html_render import HtmlRenderer, _markdown  # noqa: E402
+from profilegen.profile_input import ProfileInput  # noqa: E402
+from synthetic import make_user_data  # noqa: E402
+
+SNIPPETS = [
+    "# Heading", "Setext\n===", "Setext\n---", "para with *em*, `code` and [a link](https://x.y)", "two\nlines",
+    "- a\n- b", "- a\n\n- b", "1. one\n2. two", "3) three", "- item\n\n  continued", "- item\n\n      code",
+    "```\ncode\n\nstill code", "```\nclosed\n```", "~~~py\nx\n~~~", "    indented code", "  two-space indent",
+    "<!-- comment -->", "<!-- open\n\nstill open", "-->", "<pre>\nx\n\ny\n</pre>", "<pre>\nunclosed",
+    '<p align="center">\n<img src="x.svg">\n</p>', "<details>\n<summary>s</summary>\n\nbody\n</details>",
+    "> quote\nlazy", "> q\n\n> q2", "---", "***", "* * *", "| a | b |\n|---|---|\n| 1 | 2 |",
+    "[ref]: https://example.com", "see [ref]", "~~strike~~", "<script>alert(1)</script>", "+ plus", "10. ten",
+    "text\n- list after text", "<?php\n\n?>", "", "   ",
+]
+SEPARATORS = ["\n", "\n\n", "\n\n\n", "\n \n", "\r\n\r\n"]
+
+
+def _timed(fn, items) -> tuple[list, float]:
+    t0 = time.perf_counter()
+    out = [fn(x) for x in items]
+    return out, time.perf_counter() - t0
+
+
+def _compare(label: str, docs: list[str], key: str, md, failures: list[str]) -> None:
+    renderer = HtmlRenderer()
+    want, plain_s = _timed(md.render, docs)
+    got, cached_s = _timed(lambda d: renderer.render(d, key), docs)
+    bad = sum(a != b for a, b in zip(want, got))
+    stats = renderer.stats()
+    share = stats["hits"] / ((stats["hits"] + stats["misses"]) or 1)
+    print(f"  {label:34s} md.render {plain_s / len(docs) * 1e3:6.2f} ms/doc, "
+          f"chunked {cached_s / len(docs) * 1e3:6.2f} ms/doc ({plain_s / cached_s:4.1f}x); "
+          f"{share:5.1%} of chunks cached")
+    if bad:
+        failures.append(f"{label}: {bad} documents differ from md.render()")
+
+
+def _edits(n: int, seed: int) -> list[ProfileInput]:
+    rnd = random.Random(seed)
+    data = make_user_data(seed=seed, bio_words=40)
+    profiles = []
+    for i in range(n):
+        field = rnd.choice(("name", "title", "motto", "summary", "skills", "tech_stack"))
+        if field in ("skills", "tech_stack"):
+            data[field] = [*data[field], f"{field} {i}"][-20:]
+        else:
+            data[field] = f"{data[field] or ''} {i}".strip()
+        profiles.append(ProfileInput.from_mapping(data))
+    return profiles
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profiles", type=int, default=1000)
+    ap.add_argument("--edits", type=int, default=200)
+    ap.add_argument("--fuzz", type=int, default=20000)
+    ap.add_argument("--theme", default="default")
+    args = ap.parse_args()
+
+    md, failures = _markdown(), []
+    key = _load_theme(args.theme).digest
+    ctx = RenderContext(args.theme)
+    print(f"theme {args.theme}")
+    batch = [render_profile(ProfileInput.from_mapping(make_user_data(seed=i, bio_words=40)), ctx)
+             for i in range(args.profiles)]
+    _compare(f"{args.profiles} distinct profiles", batch, key, md, failures)
+    live = [render_profile(p, ctx) for p in _edits(args.edits, seed=1)]
+    _compare(f"{args.edits} single-field edits", live, key, md, failures)
+
+    rnd = random.Random(0)
+    fuzz = []
+    for _ in range(args.fuzz):
+        parts = [rnd.choice(SNIPPETS) for _ in range(rnd.randrange(1, 12))]
+        fuzz.append("".join(p + rnd.choice(SEPARATORS) for p in parts))
+    _compare(f"{args.fuzz} fuzz documents", fuzz, "fuzz", md, failures)
+
+    for f in failures:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# bench_ingest.py
+"""
+Ingest benchmark: per-record normalization (batch.iter_records) vs the columnar path.
+
+    python benchmarks/bench_ingest.py                # 100k records
+    python benchmarks/bench_ingest.py --rows 20000
+
+Writes synthetic records as CSV, JSONL and (with pyarrow) Parquet to a temp
+directory, then times, per format, everything done to a record before it is
+rendered: parsing, ProfileInput, GitHub username and output name. The columnar
+time includes resolving the badge logos of all distinct techs, which the
+per-record path repeats in every worker instead.
+"""
+import argparse
+import csv
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from profilegen import columnar  # noqa: E402
+from profilegen.batch import iter_records, record_name  # noqa: E402
+from profilegen.generate_readme import _github_username_from_url  # noqa: E402
+from profilegen.profile_input import ProfileInput  # noqa: E402
+from synthetic import make_user_data  # noqa: E402
+
+BASE_USERS = 500  # distinct synthetic users the rows cycle through (names and handles stay unique)
+
+
+def _write_inputs(root: Path, rows: int) -> list[Path]:
+    base = [make_user_data(seed=s, bio_words=40) for s in range(BASE_USERS)]
+    records = [
+        dict(base[i % BASE_USERS], github=f"https://github.com/user{i}/", name=f" User {i} ") for i in range(rows)
+    ]
+    jsonl = root / "people.jsonl"
+    with jsonl.open("w", encoding="utf-8") as f:
+        f.writelines(json.dumps(r) + "\n" for r in records)
+    csv_path = root / "people.csv"
+    with csv_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(records[0]))
+        writer.writeheader()
+        for r in records:
+            writer.writerow({k: ";".join(v) if isinstance(v, list) else v for k, v in r.items()})
+    paths = [csv_path, jsonl]
+    try:
+        import pandas as pd
+
+        parquet = root / "people.parquet"
+        pd.DataFrame(records).to_parquet(parquet)
+        paths.append(parquet)
+    except ImportError:
+        print("pyarrow not installed: skipping Parquet", file=sys.stderr)
+    return paths
+
+
+def _per_record(path: Path) -> int:
+    count = 0
+    for index, record in enumerate(iter_records(path)):
+        profile = ProfileInput.from_mapping(record)
+        profile.github_username or _github_username_from_url(profile.github)
+        record_name(record, index)
+        count += 1
+    return count
+
+
+def _columnar(path: Path) -> int:
+    count = 0
+    for index, profile in enumerate(columnar.load(path)):
+        record_name(profile, index)
+        count += 1
+    return count
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory(prefix="profilegen-ingest-") as tmp:
+        paths = _write_inputs(Path(tmp), args.rows)
+        print(f"{'input':10s} {'per-record rec/s':>17s} {'columnar rec/s':>15s} {'speed-up':>9s}")
+        for path in paths:
+            timings = {}
+            for label, fn in (("per-record", _per_record), ("columnar", _columnar)):
+                if label == "per-record" and path.suffix == ".parquet":
+                    continue
+                t0 = time.perf_counter()
+                rows = fn(path)
+                timings[label] = rows / (time.perf_counter() - t0)
+            base, fast = timings.get("per-record"), timings["columnar"]
+            print(f"{path.suffix[1:]:10s} {f'{base:,.0f}' if base else '-':>17s} {fast:15,.0f} "
+                  f"{f'{fast / base:.2f}x' if base else '-':>9s}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
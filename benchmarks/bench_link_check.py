@@ -0,0 +1,168 @@
+# bench_link_check.py
+"""
+Link checker against local stub HTTP servers: limits, pooling, caching, verdicts.
+
+    python benchmarks/bench_link_check.py
+    python benchmarks/bench_link_check.py --profiles 5000 --latency 0.02
+
+Starts STUB_HOSTS servers on 127.0.0.1 (one port each, so one "host" each) that
+answer by path (/ok, /gone, /moved, /nohead, /blocked, /slow, /close) after
+--latency seconds, plus one port nobody listens on. Checks the links of
+synthetic profiles that share many URLs, then checks them all again, and fails
+(exit 1) if a host ever saw more than PER_HOST requests at once, a URL was
+fetched more than once, the second pass made any request, connections were not
+reused, or a verdict is wrong.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+import random
+import socket
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from profilegen.link_check import BROKEN, OK, UNVERIFIED, LinkCache, LinkChecker, check_profile  # noqa: E402
+from profilegen.profile_input import ProfileInput  # noqa: E402
+
+STUB_HOSTS = 4
+PER_HOST = 4
+TIMEOUT_S = 0.5
+SLOW_SHARE = 0.01  # links that time out
+
+EXPECTED = {
+    "/ok": OK, "/gone": BROKEN, "/moved": OK, "/nohead": OK,
+    "/blocked": UNVERIFIED, "/slow": UNVERIFIED, "/close": OK,
+}
+
+
+class StubHost:
+    """A keep-alive HTTP/1.1 server that records concurrency, connections and requests per path."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.active = self.peak = self.connections = 0
+        self.requests: dict[str, int] = {}
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _serve(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode().split(" ", 2)
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass
+                path = target.split("?", 1)[0].rsplit("/", 1)
+                path = "/" + path[-1]
+                self.requests[target] = self.requests.get(target, 0) + 1
+                if path == "/slow":  # the client gives up first; not counted as in flight after that
+                    await asyncio.sleep(TIMEOUT_S * 2)
+                else:
+                    self.active += 1
+                    self.peak = max(self.peak, self.active)
+                    try:
+                        await asyncio.sleep(self.latency)
+                    finally:
+                        self.active -= 1
+                status, extra = {
+                    "/ok": (200, ""), "/landing": (200, ""), "/gone": (404, ""), "/blocked": (999, ""),
+                    "/moved": (301, f"Location: {target.rsplit('/', 1)[0]}/landing\r\n"),
+                    "/nohead": (405 if method == "HEAD" else 200, ""),
+                    "/close": (200, "Connection: close\r\n"),
+                }.get(path, (404, ""))
+                body = b"" if method == "HEAD" else b"stub"
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n{extra}\r\n".encode() + body
+                )
+                await writer.drain()
+                if "close" in extra:
+                    return
+        except (ConnectionError, asyncio.CancelledError):
+            return
+        finally:
+            writer.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _run(n_profiles: int, latency: float) -> int:
+    hosts = [StubHost(latency) for _ in range(STUB_HOSTS)]
+    ports = [await h.start() for h in hosts]
+    dead = _free_port()
+    rnd = random.Random(7)
+    paths = [p for p in EXPECTED if p != "/slow"]
+
+    def url() -> str:
+        port = rnd.choice(ports)
+        path = "/slow" if rnd.random() < SLOW_SHARE else rnd.choice(paths)
+        return f"http://127.0.0.1:{port}/u{rnd.randrange(n_profiles // 4 or 1)}{path}"
+
+    # GitHub links stay offline: only ones without a username, which fail before any request
+    profiles = [
+        ProfileInput(
+            github="https://github.com/" if i % 10 == 0 else "",
+            website=url(), linkedin=url(), youtube=url(),
+            facebook=f"http://127.0.0.1:{dead}/p{i}" if i % 50 == 0 else "",
+            instagram="instagram.com/no-scheme" if i % 25 == 0 else "",
+        )
+        for i in range(n_profiles)
+    ]
+    failures = []
+    cache = LinkCache()
+    async with LinkChecker(cache, per_host=PER_HOST, timeout=TIMEOUT_S) as checker:
+        t0 = time.perf_counter()
+        results = await checker.map(lambda p: check_profile(p, checker), profiles)
+        elapsed = time.perf_counter() - t0
+        first_requests, connections = checker.requests, checker.connections
+        await checker.map(lambda p: check_profile(p, checker), profiles)
+        if checker.requests != first_requests:
+            failures.append(f"second pass made {checker.requests - first_requests} requests")
+
+    links = sum(len(r) for r in results)
+    for p, res in zip(profiles, results):
+        for field, result in res.items():
+            want = BROKEN if field in ("github", "facebook", "instagram") else EXPECTED["/" + result.url.rsplit("/", 1)[-1]]
+            if result.verdict != want:
+                failures.append(f"{field} {result.url}: {result.verdict} ({result.detail}), expected {want}")
+    for h in hosts:
+        if h.peak > PER_HOST:
+            failures.append(f"host saw {h.peak} concurrent requests (limit {PER_HOST})")
+        # HEAD + GET for /nohead
+        repeats = {t: n for t, n in h.requests.items() if n > (2 if t.endswith("/nohead") else 1)}
+        if repeats:
+            failures.append(f"URLs fetched more than once: {list(repeats)[:3]}")
+        h.server.close()
+    unique = len({u for r in results for u in (x.url for x in r.values())})
+    print(f"{n_profiles} profiles, {links} links, {unique} unique URLs: {elapsed:.2f}s "
+          f"({links / elapsed:,.0f} links/s), {first_requests} requests over {connections} connections, "
+          f"peak per host {max(h.peak for h in hosts)}/{PER_HOST}, cache hits {cache.hits}")
+    if connections >= first_requests:
+        failures.append("no connection was reused")
+    for f in failures[:20]:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profiles", type=int, default=2000)
+    ap.add_argument("--latency", type=float, default=0.01, help="Stub response delay in seconds")
+    args = ap.parse_args()
+    return asyncio.run(_run(args.profiles, args.latency))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
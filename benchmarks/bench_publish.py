@@ -0,0 +1,101 @@
+# bench_publish.py
+"""
+Fleet publishing benchmark: a full publish, then re-runs with few or no changes.
+
+    python benchmarks/bench_publish.py                  # 400 repos, 5% changed
+    python benchmarks/bench_publish.py --repos 2000 --changed 0.01 --jobs 16
+
+Creates --repos profile repositories in a temp directory (half bare, half
+working copies with one commit), renders a batch output for them with local
+badges and publishes it. Then re-renders with a share of the profiles changed
+and publishes again, with and without the --state file. Fails (exit 1) if a
+run commits anything other than the profiles that changed.
+"""
+import argparse
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from profilegen.batch import DirectoryWriter, run_batch  # noqa: E402
+from profilegen.publish import UPDATED, PublishState, iter_outputs, publish  # noqa: E402
+from synthetic import make_user_data  # noqa: E402
+
+
+def _records(n: int, changed: set[int]) -> list[dict]:
+    records = []
+    for i in range(n):
+        record = make_user_data(seed=i % 50, bio_words=40)
+        record["id"] = f"user{i}"
+        record["motto"] = "v2" if i in changed else "v1"
+        records.append(record)
+    return records
+
+
+def _init_repos(root: Path, n: int) -> None:
+    env_args = ["-c", "user.name=bench", "-c", "user.email=bench@localhost"]
+    for i in range(n):
+        if i % 2:
+            subprocess.run(["git", "init", "-q", "--bare", str(root / f"user{i}.git")], check=True)
+        else:
+            repo = root / f"user{i}"
+            subprocess.run(["git", "init", "-q", str(repo)], check=True)
+            (repo / "LICENSE").write_text("MIT\n", encoding="utf-8")
+            subprocess.run(["git", "-C", str(repo), "add", "LICENSE"], check=True)
+            subprocess.run(["git", "-C", str(repo), *env_args, "commit", "-q", "-m", "init"], check=True)
+
+
+def _render(records: list[dict], out: Path) -> None:
+    writer = DirectoryWriter(out)
+    report = run_batch(records, "default", writer, workers=4, use_processes=False, badge_mode="local")
+    if report.failed:
+        raise SystemExit(f"render failed: {report.failures[:3]}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repos", type=int, default=400)
+    ap.add_argument("--changed", type=float, default=0.05, help="Share of profiles changed for the re-run")
+    ap.add_argument("--jobs", type=int, default=8)
+    args = ap.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="profilegen-publish-") as tmp:
+        tmp = Path(tmp)
+        repos = tmp / "repos"
+        repos.mkdir()
+        _init_repos(repos, args.repos)
+        state = PublishState(tmp / "state.sqlite")
+        changed = set(range(0, args.repos, max(1, round(1 / args.changed)))) if args.changed else set()
+
+        _render(_records(args.repos, set()), tmp / "v1")
+        _render(_records(args.repos, changed), tmp / "v2")
+        runs = [
+            ("first publish", "v1", state, args.repos),
+            ("re-run, nothing changed, --state", "v1", state, 0),
+            ("re-run, nothing changed, no state", "v1", None, 0),
+            (f"re-run, {len(changed)} changed, --state", "v2", state, len(changed)),
+        ]
+        print(f"{args.repos} repos, {args.jobs} jobs")
+        for label, out, run_state, want in runs:
+            t0 = time.perf_counter()
+            report = publish(iter_outputs(tmp / out), repos, jobs=args.jobs, state=run_state)
+            elapsed = time.perf_counter() - t0
+            updated = report.count(UPDATED)
+            print(f"  {label:40s} {elapsed:7.2f}s  {updated:5d} committed, {report.skipped:5d} skipped by state")
+            if updated != want or len(report.results) != args.repos:
+                failures.append(f"{label}: {updated} committed, expected {want}; {report.as_dict()['changes'][:2]}")
+        state.close()
+
+    for f in failures:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# bench_render_scaling.py
+"""
+Regression benchmark: rendering time must grow linearly with template size.
+
+    python benchmarks/bench_render_scaling.py
+
+Times the compiled single-pass renderer against the legacy regex pipeline on
+templates from a few KB up to ~0.5 MB, including a pathological template full
+of <div>s and an unterminated stats widget (quadratic for the old DOTALL regex).
+Exits non-zero if the per-KB cost of the largest template is more than
+MAX_GROWTH times that of the smallest.
+"""
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import legacy  # noqa: E402
+from profilegen.templates import compile_template  # noqa: E402
+
+MAX_GROWTH = 3.0
+SIZES = (1, 4, 16, 64, 256)  # copies of the base theme
+
+USER = {"name": "Ada", "title": "Engineer", "email": "ada@example.com", "summary": "x" * 200,
+        "github_username": "ada", "skills_block": "- a\n- b", "tech_stack_block": "![x](y)"}
+
+
+def _themes() -> dict[str, tuple[str, int]]:
+    """name -> (base text, max copies the legacy pipeline is timed on)"""
+    default = (ROOT / "src" / "themes" / "default.txt").read_text(encoding="utf-8")
+    pathological = (
+        "<div>{{name}} <img src=\"https://github-readme-stats.vercel.app/api?username=x\">\n" * 20
+        + "<p>{{summary}}</p>\n" * 20
+    )
+    return {"default": (default, 64), "pathological": (pathological, 4)}
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    lookup = lambda key: (USER.get(key) or "").strip() or " "  # noqa: E731
+    ok = True
+    for name, (base, legacy_max) in _themes().items():
+        legacy.render(base, USER, "ada", include_stats=False)  # warm the regex cache
+        print(f"\n{name} theme")
+        print(f"{'size KB':>10} {'compiled us/KB':>15} {'legacy us/KB':>14}")
+        per_kb = []
+        for copies in SIZES:
+            text = base * copies
+            kb = len(text.encode("utf-8")) / 1024
+            tpl = compile_template(text)
+            new = _best_of(lambda: tpl.render(lookup, handle="ada", include_stats=False))
+            per_kb.append(new / kb)
+            if copies <= legacy_max:
+                old = _best_of(lambda: legacy.render(text, USER, "ada", include_stats=False), repeat=1)
+                old_col = f"{old / kb * 1e6:14.2f}"
+            else:
+                old_col = f"{'(skipped)':>14}"
+            print(f"{kb:10.1f} {new / kb * 1e6:15.2f} {old_col}")
+        growth = per_kb[-1] / per_kb[0]
+        print(f"per-KB growth smallest -> largest: {growth:.2f}x (limit {MAX_GROWTH}x)")
+        ok &= growth <= MAX_GROWTH
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# bench_stream_memory.py
+"""
+Regression benchmark: streaming a README must use constant memory, whatever its size.
+
+    python benchmarks/bench_stream_memory.py
+
+Renders the default theme repeated up to ~20 MB of output into a discarding
+sink, once as render() + encode() (the whole document, twice) and once with
+CompiledTemplate.write() (UTF-8 chunks), and reports the tracemalloc peak of
+each. Exits non-zero if the streamed peak of the largest output is more than
+MAX_GROWTH times that of the smallest.
+"""
+from pathlib import Path
+import sys
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from profilegen.templates import compile_template  # noqa: E402
+
+MAX_GROWTH = 1.5
+SIZES = (16, 64, 256, 1024, 4096)  # copies of the base theme (~10 KB of output each)
+
+USER = {"name": "Ada", "title": "Engineer", "email": "ada@example.com", "summary": "ü" * 2000,
+        "github_username": "ada", "skills_block": "- a\n- b", "tech_stack_block": "![x](y)"}
+
+
+class _Sink:
+    """Binary file that only counts what it is given."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data: bytes) -> int:
+        self.bytes += len(data)
+        return len(data)
+
+
+def _peak(fn) -> int:
+    """Peak traced bytes allocated during one call of fn()."""
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> int:
+    lookup = lambda key: (USER.get(key) or "").strip() or " "  # noqa: E731
+    base = (ROOT / "src" / "themes" / "default.txt").read_text(encoding="utf-8")
+    print(f"{'output MB':>10} {'string peak KB':>15} {'stream peak KB':>15}")
+    stream_peaks = []
+    for copies in SIZES:
+        tpl = compile_template(base * copies)
+        tpl.write(_Sink(), lookup, handle="ada")  # warm the per-template encoded literals
+        sink = _Sink()
+        string_peak = _peak(lambda: _Sink().write(tpl.render(lookup, handle="ada").encode("utf-8")))
+        stream_peak = _peak(lambda: tpl.write(sink, lookup, handle="ada"))
+        stream_peaks.append(stream_peak)
+        print(f"{sink.bytes / 2**20:10.1f} {string_peak / 1024:15.0f} {stream_peak / 1024:15.0f}")
+    growth = stream_peaks[-1] / stream_peaks[0]
+    print(f"streamed peak growth smallest -> largest: {growth:.2f}x (limit {MAX_GROWTH}x)")
+    return 0 if growth <= MAX_GROWTH else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# check_startup.py
+"""
+Cold-start budget: import time of the core modules and latency of the first render.
+
+    python benchmarks/check_startup.py
+    python benchmarks/check_startup.py --runs 20 --scale 1.5   # slower machine: budgets x 1.5
+
+Every measurement runs in a fresh interpreter started in a temporary directory
+(so nothing depends on the working directory) and is the median of --runs:
+import times by the clock around the import statement (over budget, the
+slowest modules per `python -X importtime` are listed), the first render from
+before the import to the finished README, default theme and badge lookups
+included. Also checks that importing the core loads no Streamlit, pandas,
+asyncio or markdown-it, and no badge or theme data before the first render. Exits 1 when
+anything is over budget.
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Milliseconds (medians), about 1.3x what a small single-core VM measures
+IMPORT_BUDGET_MS = {
+    "profilegen.generate_readme": 60,  # the rendering core
+    "profilegen.render_cache": 65,     # what the app and the service render through
+    "profilegen.batch": 110,           # the batch CLI: + multiprocessing, archives
+}
+FIRST_RENDER_BUDGET_MS = 75  # import + first render_profile()
+
+FORBIDDEN = ("streamlit", "pandas", "numpy", "asyncio", "xml.sax", "markdown_it")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from profilegen.generate_readme import RenderContext, render_profile
+from profilegen.profile_input import ProfileInput
+from profilegen import badges, theme_registry
+t1 = time.perf_counter()
+loaded = [name for name, fn in (("badges", badges.get_registry), ("themes", theme_registry.registry_for))
+          if fn.cache_info().currsize]
+forbidden = [name for name in FORBIDDEN if name in sys.modules]
+profile = ProfileInput.from_mapping(USER)
+out = render_profile(profile, RenderContext("default"))
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1e3, "first_render_ms": (t2 - t0) * 1e3,
+                  "loaded_at_import": loaded, "forbidden": forbidden, "chars": len(out)}))
+"""
+
+USER = {
+    "name": "Ada Lovelace", "title": "Engineer", "github": "https://github.com/ada",
+    "skills": ["Analysis", "Engines"], "tech_stack": ["Python", "Docker", "Kubernetes", "PostgreSQL", "Node.js"],
+}
+
+
+def _env() -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    env.pop("PROFILEGEN_METRICS", None)
+    return env
+
+
+def import_ms(module: str, runs: int, cwd: str) -> tuple[float, list[str]]:
+    """Median wall-clock import time of `module` in a fresh interpreter, and the forbidden modules it loaded."""
+    times, forbidden = [], []
+    code = (
+        f"import sys, time\nt = time.perf_counter()\nimport {module}\n"
+        "print((time.perf_counter() - t) * 1e3)\nprint(*sys.modules)"
+    )
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=cwd, env=_env())
+        if proc.returncode:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        ms, modules = proc.stdout.split("\n", 1)
+        times.append(float(ms))
+        forbidden = [name for name in FORBIDDEN if name in set(modules.split())]
+    return statistics.median(times), forbidden
+
+
+def slowest_imports(module: str, cwd: str, n: int = 8) -> list[tuple[int, str]]:
+    """(self µs, name) of the modules `python -X importtime -c 'import module'` spends most time in."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=cwd, env=_env())
+    rows = []
+    for line in proc.stderr.splitlines()[1:]:
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3:
+            rows.append((int(fields[0]), fields[2].strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def first_render(runs: int, cwd: str) -> dict:
+    """The probe's result for the run with the median first-render time."""
+    results = []
+    code = f"FORBIDDEN = {FORBIDDEN!r}\nUSER = {USER!r}\n{_PROBE}"
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=cwd, env=_env())
+        if proc.returncode:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        results.append(json.loads(proc.stdout))
+    results.sort(key=lambda r: r["first_render_ms"])
+    return results[len(results) // 2]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=15)
+    ap.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow or loaded machines)")
+    args = ap.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="profilegen-startup-") as cwd:
+        for module, budget in IMPORT_BUDGET_MS.items():
+            ms, forbidden = import_ms(module, args.runs, cwd)
+            budget *= args.scale
+            print(f"import {module:29s} {ms:6.1f} ms  (budget {budget:.0f})")
+            if ms > budget:
+                slowest = ", ".join(f"{name} {us / 1e3:.1f}" for us, name in slowest_imports(module, cwd))
+                failures.append(f"import {module}: {ms:.1f} ms > {budget:.0f} ms; slowest (self ms): {slowest}")
+            if forbidden:
+                failures.append(f"import {module} loads {', '.join(forbidden)}")
+        try:
+            probe = first_render(args.runs, cwd)
+        except RuntimeError as e:
+            probe = None
+            failures.append(f"first render: {e}")
+    if probe is not None:
+        budget = FIRST_RENDER_BUDGET_MS * args.scale
+        print(f"first render           {probe['first_render_ms']:6.1f} ms  (budget {budget:.0f}; "
+              f"import {probe['import_ms']:.1f} ms, {probe['chars']} chars)")
+        if probe["first_render_ms"] > budget:
+            failures.append(f"first render: {probe['first_render_ms']:.1f} ms > {budget:.0f} ms")
+        if probe["loaded_at_import"]:
+            failures.append(f"loaded at import time: {', '.join(probe['loaded_at_import'])}")
+        if probe["forbidden"]:
+            failures.append(f"the core imports {', '.join(probe['forbidden'])}")
+
+    for f in failures:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
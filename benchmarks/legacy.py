@@ -0,0 +1,36 @@
+# legacy.py
+"""
+The original regex-based pipeline (before compiled templates), kept only as a
+reference point for the benchmarks. Not used by the app.
+"""
+import re
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*([a-zA-Z0-9_]+)\s*\}\}")
+
+
+def fill_placeholders(template_text: str, user_data: dict) -> str:
+    def repl(match):
+        return (user_data.get(match.group(1), " ") or "").strip() or " "
+    return _PLACEHOLDER_RE.sub(repl, template_text)
+
+
+def patch_github_stats_handles(text: str, gh_user: str | None) -> str:
+    if not gh_user:
+        return text
+    text = re.sub(r"(username=)[^&\"']+", r"\1" + gh_user, text)
+    text = re.sub(r"([?&]user=)[^&\"']+", r"\1" + gh_user, text)
+    return text
+
+
+def strip_stats(text: str) -> str:
+    return re.sub(
+        r"<div>.*?github-readme-stats.*?github-readme-streak-stats.*?</div>",
+        "",
+        text,
+        flags=re.DOTALL | re.IGNORECASE,
+    )
+
+
+def render(template_text: str, user_data: dict, gh_user: str, include_stats: bool) -> str:
+    out = patch_github_stats_handles(fill_placeholders(template_text, user_data), gh_user)
+    return out if include_stats else strip_stats(out)
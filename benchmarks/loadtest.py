@@ -0,0 +1,138 @@
+# loadtest.py
+"""
+Load test for the HTTP rendering service (src/profilegen/service.py).
+
+    python benchmarks/loadtest.py --serve                       # start the service in-process
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000   # or hit a running one
+
+Opens --concurrency keep-alive connections, each sending POST /render requests
+back to back for --duration seconds, and reports requests/sec and p50/p90/p99 latency.
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROFILE = {
+    "name": "Ada Lovelace",
+    "title": "Engineer",
+    "email": "ada@example.com",
+    "summary": "Analytical engines. " * 20,
+    "github": "https://github.com/ada",
+    "skills": ["Mathematics", "Programming", "Writing"],
+    "tech_stack": ["Python", "Docker", "ROS 2", "PostgreSQL", "Node.js"],
+}
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    length, chunked = 0, False
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+    if chunked:
+        while (size := int((await reader.readline()).split(b";")[0], 16)):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(length)
+    return status
+
+
+async def _client(host: str, port: int, request: bytes, deadline: float, latencies: list, errors: list) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            if status == 200:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+async def run(url: str, concurrency: int, duration: float, theme: str) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    body = json.dumps(PROFILE).encode("utf-8")
+    request = (
+        f"POST /render?theme={theme} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+    latencies: list[float] = []
+    errors: list = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        _client(host, port, request, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(_percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def _serve_in_background() -> str:
+    """Start service.app with uvicorn on a free local port; returns its base URL."""
+    import uvicorn
+
+    sys.path.insert(0, str(ROOT / "src"))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    config = uvicorn.Config("profilegen.service:app", host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Load test POST /render of the rendering service.")
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--serve", action="store_true", help="Start the service in-process on a free port")
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=10.0)
+    ap.add_argument("--theme", default="default")
+    args = ap.parse_args()
+
+    url = _serve_in_background() if args.serve else args.url
+    result = asyncio.run(run(url, args.concurrency, args.duration, args.theme))
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
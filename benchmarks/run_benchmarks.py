@@ -0,0 +1,223 @@
+# run_benchmarks.py
+"""
+Benchmark suite for the rendering pipeline.
+
+    python benchmarks/run_benchmarks.py                   # run and print
+    python benchmarks/run_benchmarks.py --save baseline   # store results/baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline
+
+Each stage (theme compilation, placeholder fill, badges, blocks, full render and
+the legacy regex passes for reference) runs over synthetic profiles and themes
+from a few KB to ~1 MB with thousands of placeholders. Reports the median time,
+throughput and tracemalloc peak per stage. --compare exits non-zero when a stage
+got slower than --threshold versus the stored baseline.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import legacy  # noqa: E402
+from profilegen.badge_svg import badge_svg  # noqa: E402
+from profilegen.badges import badge_for  # noqa: E402
+from profilegen.generate_readme import (  # noqa: E402
+    RenderContext,
+    _make_skills_block,
+    _make_tech_stack_block,
+    _placeholder_lookup,
+    _render_template,
+    _tech_stack_block,
+    generate_readme,
+)
+from profilegen.profile_input import ProfileInput  # noqa: E402
+from synthetic import make_logic_theme, make_theme, make_user_data  # noqa: E402
+from profilegen.template_lang import compile_block  # noqa: E402
+from profilegen.templates import compile_template  # noqa: E402
+from profilegen.theme_pack import ThemePack, build_pack  # noqa: E402
+
+THEMES = {
+    "small": dict(n_placeholders=20, filler_words=20),
+    "medium": dict(n_placeholders=200, filler_words=40),
+    "large": dict(n_placeholders=2000, filler_words=60),
+}
+PROFILES = {
+    "typical": dict(n_skills=5, n_techs=10, bio_words=50),
+    "heavy": dict(n_skills=50, n_techs=200, bio_words=2000, unicode=True),
+}
+
+
+def _measure(fn, repeat: int) -> tuple[float, int]:
+    """(median seconds, peak traced bytes) for fn(); one warm-up call first."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def _cold(fn, *caches):
+    def run():
+        for c in caches:
+            c.cache_clear()
+        return fn()
+    return run
+
+
+def _stages(theme_names: list[str]):
+    """Yield (stage name, callable, bytes processed or 0)."""
+    pack_dir = Path(tempfile.mkdtemp(prefix="profilegen-bench-"))
+    pack_path = pack_dir / "themes.pack"
+    for pname in PROFILES:
+        user = make_user_data(seed=1, **PROFILES[pname])
+        profile = ProfileInput.from_mapping(user)
+        techs = profile.tech_stack
+        yield f"badge_for/cold/{pname}", _cold(lambda: [badge_for(t, True) for t in techs], badge_for), 0
+        yield f"badge_for/warm/{pname}", lambda: [badge_for(t, True) for t in techs], 0
+        yield (f"tech_stack_block/cold/{pname}",
+               _cold(lambda: _make_tech_stack_block(techs, True), _tech_stack_block, badge_for), 0)
+        for mode in ("local", "strip"):
+            yield (f"tech_stack_block/{mode}/cold/{pname}",
+                   _cold(lambda mode=mode: _make_tech_stack_block(techs, True, mode), _tech_stack_block, badge_svg), 0)
+        yield (f"skills_block/cold/{pname}",
+               _cold(lambda: _make_skills_block(profile.skills), _make_skills_block), 0)
+        yield f"generate_readme/default/{pname}", lambda: generate_readme("default", user), 0
+
+    for tname in theme_names:
+        text = make_theme(seed=2, **THEMES[tname])
+        size = len(text.encode("utf-8"))
+        template = compile_template(text)
+        yield f"compile_template/{tname}", lambda: compile_template(text), size
+        (pack_dir / f"{tname}.txt").write_text(text, encoding="utf-8")
+        build_pack(pack_dir, pack_path)
+        # open + decode one theme, the per-process cost of a pack vs compile_template above
+        yield f"theme_pack_load/{tname}", lambda: ThemePack(pack_path).get(tname), size
+        for pname in PROFILES:
+            user = make_user_data(seed=1, **PROFILES[pname])
+            profile = ProfileInput.from_mapping(user)
+            values = profile.text_values()
+            values.update(skills_block="- a", tech_stack_block="![a](b)", github_username="user1")
+            lookup = _placeholder_lookup(values)
+            ctx, ctx_nostats = RenderContext(tname), RenderContext(tname, include_stats=False)
+            filled = legacy.fill_placeholders(text, values)
+
+            yield f"fill/{tname}/{pname}", lambda: template.render(lookup, handle="user1"), size
+            yield f"render/{tname}/{pname}", lambda: _render_template(template, profile, ctx), size
+            yield f"render_no_stats/{tname}/{pname}", lambda: _render_template(template, profile, ctx_nostats), size
+            yield f"legacy_fill/{tname}/{pname}", lambda: legacy.fill_placeholders(text, values), size
+            yield f"legacy_patch_handles/{tname}/{pname}", lambda: legacy.patch_github_stats_handles(filled, "user1"), size
+            yield f"legacy_strip_stats/{tname}/{pname}", lambda: legacy.strip_stats(filled), size
+
+        # {% for %} / {% if %} theme vs the same layout as block placeholders through the regex fill
+        sections = max(1, THEMES[tname]["n_placeholders"] // 10)
+        logic_text = make_logic_theme(sections, THEMES[tname]["filler_words"], seed=3)
+        block_text = make_logic_theme(sections, THEMES[tname]["filler_words"], logic=False, seed=3)
+        logic_size = len(logic_text.encode("utf-8"))
+        logic_template = compile_template(logic_text)
+        yield (f"logic_compile/{tname}",
+               _cold(lambda: compile_template(logic_text), compile_block), logic_size)
+        for pname in PROFILES:
+            profile = ProfileInput.from_mapping(make_user_data(seed=1, **PROFILES[pname]))
+            ctx = RenderContext(tname)
+
+            def legacy_blocks(profile=profile):
+                values = profile.text_values()
+                values.update(
+                    skills_block=_make_skills_block(profile.skills),
+                    tech_stack_block=_make_tech_stack_block(profile.tech_stack, profile.tech_stack_use_logos),
+                )
+                return legacy.fill_placeholders(block_text, values)
+
+            yield (f"logic_render/{tname}/{pname}",
+                   lambda profile=profile, ctx=ctx: _render_template(logic_template, profile, ctx), logic_size)
+            yield f"legacy_blocks_fill/{tname}/{pname}", legacy_blocks, logic_size
+
+
+def run(theme_names: list[str], repeat: int) -> dict:
+    results = {}
+    for name, fn, size in _stages(theme_names):
+        median, peak = _measure(fn, repeat)
+        results[name] = {
+            "median_s": median,
+            "ops_per_s": 1 / median if median else None,
+            "mb_per_s": size / median / 1e6 if size and median else None,
+            "peak_bytes": peak,
+        }
+        mbs = f"{results[name]['mb_per_s']:9.1f} MB/s" if size else " " * 14
+        print(f"{name:50s} {median * 1e6:12.1f} us {mbs} {peak / 1024:10.1f} KiB peak")
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    ok = True
+    print(f"\n{'stage':50s} {'baseline us':>12} {'now us':>12} {'change':>8}")
+    for name, now in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = now["median_s"] / before["median_s"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        ok &= not flag
+        print(f"{name:50s} {before['median_s'] * 1e6:12.1f} {now['median_s'] * 1e6:12.1f} {change:+8.1%}{flag}")
+    return ok
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the README rendering pipeline.")
+    ap.add_argument("--themes", default=",".join(THEMES), help="Comma-separated: " + ",".join(THEMES))
+    ap.add_argument("--repeat", type=int, default=15)
+    ap.add_argument("--save", metavar="NAME", help="Store results as benchmarks/results/NAME.json")
+    ap.add_argument("--compare", metavar="NAME", help="Compare with benchmarks/results/NAME.json")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown per stage (default 25%%)")
+    args = ap.parse_args()
+
+    results = run([t for t in args.themes.split(",") if t], args.repeat)
+    doc = {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{args.save}.json"
+        path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"\nSaved {path.relative_to(ROOT)}")
+    if args.compare:
+        baseline = json.loads((RESULTS_DIR / f"{args.compare}.json").read_text(encoding="utf-8"))
+        print(f"\nBaseline: commit {baseline['meta']['commit']} ({baseline['meta']['date']})")
+        if not compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
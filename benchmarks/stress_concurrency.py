@@ -0,0 +1,73 @@
+# stress_concurrency.py
+"""
+Concurrency stress check for render_profile().
+
+    python benchmarks/stress_concurrency.py [--threads 32] [--rounds 200]
+
+Renders a mix of profiles serially to get reference outputs, then renders them
+again from many threads at once (sharing the same ProfileInput objects and
+user_data dicts) and checks every result is identical and no input was mutated.
+Exits non-zero on any mismatch.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from pathlib import Path
+import random
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from profilegen.generate_readme import RenderContext, generate_readme, render_profile  # noqa: E402
+from profilegen.profile_input import ProfileInput  # noqa: E402
+
+TECHS = ["Python", "C++", "ROS 2", "Docker", "Node.js", "Postgres", "Kubernetes", "Rust", "unknown-tech"]
+
+
+def _user_data(i: int) -> dict:
+    rnd = random.Random(i)
+    return {
+        "name": f"User {i} ✨",
+        "title": rnd.choice(["Engineer", "Researcher", ""]),
+        "summary": "Bio " * rnd.randint(0, 50),
+        "github": f"https://github.com/user{i}" if i % 3 else "",
+        "github_username": "explicit" if i % 7 == 0 else "",
+        "skills": [f"Skill {j}" for j in range(rnd.randint(0, 10))],
+        "tech_stack": rnd.sample(TECHS, rnd.randint(0, len(TECHS))),
+        "tech_stack_use_logos": bool(i % 2),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=32)
+    ap.add_argument("--rounds", type=int, default=200)
+    ap.add_argument("--theme", default="default")
+    args = ap.parse_args()
+
+    raw = [_user_data(i) for i in range(64)]
+    snapshot = copy.deepcopy(raw)
+    profiles = [ProfileInput.from_mapping(d) for d in raw]
+    contexts = [RenderContext(args.theme, include_stats=s) for s in (True, False)]
+    expected = {(p, c): render_profile(p, c) for p in profiles for c in contexts}
+
+    jobs = [(i % len(raw), contexts[i % 2]) for i in range(args.rounds * len(raw))]
+
+    def check(job) -> bool:
+        i, ctx = job
+        via_pure = render_profile(profiles[i], ctx)
+        via_dict = generate_readme(args.theme, raw[i], include_stats=ctx.include_stats)
+        return via_pure == via_dict == expected[(profiles[i], ctx)]
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        mismatches = sum(not ok for ok in pool.map(check, jobs, chunksize=16))
+
+    mutated = raw != snapshot
+    print(f"{len(jobs)} concurrent renders on {args.threads} threads: "
+          f"{mismatches} mismatches, user_data mutated: {mutated}")
+    return 1 if mismatches or mutated else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# synthetic.py
+"""Synthetic user_data and themes for the benchmarks (deterministic for a given seed)."""
+import random
+
+KNOWN_TECHS = [
+    "Python", "C++", "ROS 2", "Docker", "Kubernetes", "Node.js", "Postgres", "Rust", "Go",
+    "TensorFlow", "PyTorch", "OpenCV", "React", "AWS", "Linux", "Git", "CMake", "Qt",
+]
+UNICODE_WORDS = ["naïve", "café", "Łódź", "東京", "Привет", "مرحبا", "🚀", "✨", "ß", "Ωmega"]
+PLACEHOLDERS = [
+    "name", "title", "email", "motto", "summary", "linkedin", "github", "instagram",
+    "website", "youtube", "facebook", "github_username", "skills_block", "tech_stack_block",
+]
+
+_STATS_DIV = (
+    "<div>\n"
+    '  <img src="https://github-readme-stats.vercel.app/api/top-langs?username={{github_username}}&layout=compact" />\n'
+    '  <img src="https://github-readme-streak-stats.herokuapp.com/?user={{github_username}}" />\n'
+    "</div>\n"
+)
+
+
+def _words(rnd: random.Random, n: int, unicode: bool) -> str:
+    pool = ["lorem", "ipsum", "robotics", "vision", "systems", "engineer", "data", "open-source"]
+    if unicode:
+        pool = pool + UNICODE_WORDS
+    return " ".join(rnd.choice(pool) for _ in range(n))
+
+
+def make_user_data(
+    n_skills: int = 5,
+    n_techs: int = 10,
+    bio_words: int = 50,
+    unicode: bool = False,
+    unknown_tech_ratio: float = 0.2,
+    seed: int = 0,
+) -> dict:
+    rnd = random.Random(seed)
+    techs = []
+    for i in range(n_techs):
+        if rnd.random() < unknown_tech_ratio:
+            techs.append(f"{_words(rnd, 1, unicode).title()} Tool {i}")
+        else:
+            techs.append(rnd.choice(KNOWN_TECHS))
+    return {
+        "name": _words(rnd, 2, unicode).title(),
+        "title": _words(rnd, 4, unicode),
+        "email": f"user{seed}@example.com",
+        "motto": _words(rnd, 6, unicode),
+        "summary": _words(rnd, bio_words, unicode),
+        "linkedin": f"https://www.linkedin.com/in/user{seed}",
+        "github": f"https://github.com/user{seed}",
+        "website": f"https://user{seed}.example.com",
+        "skills": [f"{_words(rnd, 2, unicode)} {i}" for i in range(n_skills)],
+        "tech_stack": techs,
+        "tech_stack_use_logos": True,
+    }
+
+
+def make_theme(n_placeholders: int = 20, filler_words: int = 20, with_stats: bool = True, seed: int = 0) -> str:
+    """
+    A theme with `n_placeholders` {{placeholders}} separated by paragraphs of
+    `filler_words` words each; size grows with both.
+    """
+    rnd = random.Random(seed)
+    parts = []
+    for i in range(n_placeholders):
+        key = PLACEHOLDERS[i % len(PLACEHOLDERS)]
+        parts.append(f"<p>{_words(rnd, filler_words, False)}</p>\n\n**{{{{{key}}}}}**\n\n")
+        if with_stats and i % 50 == 49:
+            parts.append(_STATS_DIV)
+    if with_stats:
+        parts.append(_STATS_DIV)
+    return "".join(parts)
+
+
+_LOGIC_SECTION = (
+    "{% if motto %}\n> {{ motto }}\n{% endif %}\n"
+    "{% for skill in skills %}\n- {{ skill }}\n{% endfor %}\n"
+    "{% for tech in tech_stack %}{{ tech | badge }}{% if not loop.last %} {% endif %}{% endfor %}\n"
+)
+_BLOCK_SECTION = "> {{motto}}\n\n{{skills_block}}\n\n{{tech_stack_block}}\n"
+
+
+def make_logic_theme(n_sections: int = 2, filler_words: int = 20, logic: bool = True, seed: int = 0) -> str:
+    """
+    `n_sections` paragraphs each followed by a motto / skills / tech section, written
+    with {% %} blocks, or (logic=False) with the equivalent block placeholders.
+    """
+    rnd = random.Random(seed)
+    section = _LOGIC_SECTION if logic else _BLOCK_SECTION
+    return "".join(f"<p>{_words(rnd, filler_words, False)}</p>\n\n{section}\n" for _ in range(n_sections))
@@ -0,0 +1,8 @@
+# batch.py
+"""`python src/batch.py ...` from a checkout; installed, the same CLI is `profilegen-batch` (see profilegen.batch)."""
+import sys
+
+from profilegen.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# link_check.py
+"""`python src/link_check.py ...` from a checkout; installed, the same CLI is `profilegen-link-check` (see profilegen.link_check)."""
+import sys
+
+from profilegen.link_check import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# local_stats.py
+"""`python src/local_stats.py ...` from a checkout; installed, the same CLI is `profilegen-local-stats` (see profilegen.local_stats)."""
+import sys
+
+from profilegen.local_stats import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""
+The rendering core: themes, placeholders, badges, caches and the batch / publish /
+service front ends. Standard library only; the Streamlit UI (src/run.py) and the
+`python src/<tool>.py` shims sit next to this package.
+"""
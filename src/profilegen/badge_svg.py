@@ -0,0 +1,299 @@
+# badge_svg.py
+"""
+Local shields-style badges, so a rendered tech stack needs no external requests.
+
+    remote  one img.shields.io URL per technology (the original output)
+    local   one generated SVG per technology, referenced as badges/<digest>.svg
+    strip   every technology composited into a single SVG: one asset per README
+
+Generated SVGs live in a content-addressed directory (file name = hash of the
+SVG), bounded in bytes with least-recently-used eviction. A render reports the
+SVGs it references as Assets, which know how to draw them again: a README can
+outlive its files (evicted, the directory cleared, or the README served from a
+render cache), and asset_files() redraws whatever the store no longer has.
+Badges are text-only: shields' logos come from its own icon set, which is not
+available offline.
+"""
+import base64
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+import hashlib
+import html
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Iterable, Iterator, NamedTuple
+import unicodedata
+
+from . import metrics
+
+BADGE_MODES = ("remote", "local", "strip")
+ASSET_DIR = "badges"   # relative to the README that references the badges
+DIGEST_LEN = 16        # hex characters of SHA-256 used as the file name
+
+BADGE_COLOR = "#353535"  # same look as the remote style=flat-square&color=353535
+TEXT_COLOR = "#fff"
+HEIGHT = 20
+PADDING = 6              # left/right of the label
+STRIP_GAP = 4
+STRIP_MAX_WIDTH = 720    # the strip wraps onto a new row past this width
+
+_ASSET_PATH_RE = re.compile(rf"{ASSET_DIR}/([0-9a-f]{{{DIGEST_LEN}}})\.svg")
+_MD_ASSET_RE = re.compile(rf"!\[([^\]]*)\]\({_ASSET_PATH_RE.pattern}\)")     # ![alt](badges/<digest>.svg)
+_SRC_ASSET_RE = re.compile(rf'src="{_ASSET_PATH_RE.pattern}"')                  # <img src="badges/<digest>.svg">
+
+# Verdana 11px advance widths (what shields measures with), by character
+_WIDTHS = {}
+for _chars, _width in (
+    (" ", 3.87), ("!", 4.33), ("\"", 5.05), ("'", 2.95), ("%", 11.84), ("&", 7.99), ("@", 11.0),
+    (",.", 4.0), ("()-/:;[\\]|", 4.99), ("#+<=>^~", 9.0), ("$*_`0123456789", 7.0), ("?", 6.0), ("{}", 6.98),
+    ("AVS", 7.52), ("BXZ", 7.54), ("C", 7.68), ("D", 8.48), ("E", 6.96), ("F", 6.32), ("G", 8.53), ("H", 8.27),
+    ("I", 4.61), ("J", 5.0), ("K", 7.62), ("L", 6.12), ("M", 9.27), ("N", 8.23), ("OQ", 8.66), ("P", 6.63),
+    ("R", 7.65), ("T", 6.78), ("U", 8.05), ("W", 10.87), ("Y", 6.77),
+    ("a", 6.61), ("bdgpq", 6.85), ("cs", 5.73), ("e", 6.55), ("f", 3.87), ("hnu", 6.96), ("il", 3.02),
+    ("j", 3.79), ("kvxy", 6.51), ("m", 10.7), ("o", 6.68), ("r", 4.69), ("t", 4.33), ("w", 8.98), ("z", 5.77),
+):
+    _WIDTHS.update(dict.fromkeys(_chars, _width))
+
+
+def text_width(text: str) -> float:
+    width = 0.0
+    for ch in text:
+        w = _WIDTHS.get(ch)
+        if w is None:
+            if unicodedata.combining(ch):
+                w = 0.0
+            elif unicodedata.east_asian_width(ch) in ("W", "F"):
+                w = 11.0
+            else:
+                w = 7.0
+        width += w
+    return width
+
+
+def _attr(text: str) -> str:
+    return html.escape(text, quote=False).replace('"', "&quot;")
+
+
+def _badge_width(label: str) -> int:
+    return round(text_width(label)) + 2 * PADDING
+
+
+def _badge_body(label: str, width: int) -> str:
+    return (
+        f'<rect width="{width}" height="{HEIGHT}" fill="{BADGE_COLOR}"/>'
+        f'<text x="{width / 2:g}" y="14" fill="{TEXT_COLOR}">{html.escape(label, quote=False)}</text>'
+    )
+
+
+def _svg(width: int, height: int, title: str, body: str) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img" '
+        f'aria-label="{_attr(title)}"><title>{html.escape(title, quote=False)}</title>'
+        f'<g shape-rendering="crispEdges" text-anchor="middle" '
+        f'font-family="Verdana,Geneva,DejaVu Sans,sans-serif" font-size="11">{body}</g></svg>'
+    )
+
+
+@lru_cache(maxsize=4096)
+def badge_svg(label: str) -> str:
+    width = _badge_width(label)
+    return _svg(width, HEIGHT, label, _badge_body(label, width))
+
+
+def strip_svg(labels: tuple[str, ...], max_width: int = STRIP_MAX_WIDTH) -> str:
+    """All badges in one SVG, left to right, wrapping into rows of at most `max_width`."""
+    parts, x, y, total_width = [], 0, 0, 0
+    for label in labels:
+        width = _badge_width(label)
+        if x and x + width > max_width:
+            x, y = 0, y + HEIGHT + STRIP_GAP
+        parts.append(f'<g transform="translate({x},{y})">{_badge_body(label, width)}</g>')
+        total_width = max(total_width, x + width)
+        x += width + STRIP_GAP
+    return _svg(total_width, y + HEIGHT if parts else 0, ", ".join(labels), "".join(parts))
+
+
+def svg_digest(svg: str) -> str:
+    """The store's file name for `svg`."""
+    return hashlib.sha256(svg.encode("utf-8")).hexdigest()[:DIGEST_LEN]
+
+
+# ---------------------------
+# Content-addressed store
+# ---------------------------
+class BadgeStore:
+    """
+    SVG files named by the hash of their content, capped at `max_bytes`.
+    put() is idempotent and refreshes the file's recency; the least recently used
+    files are deleted first. get() returns None for a digest that has been evicted.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 32 << 20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()  # digest -> size, oldest first
+        self.bytes = 0
+        found = []
+        for path in self.root.glob("*.svg"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((st.st_mtime_ns, path.stem, st.st_size))
+        for _, digest, size in sorted(found):
+            self._entries[digest] = size
+            self.bytes += size
+        self._evict()
+
+    def path(self, digest: str) -> Path:
+        return self.root / f"{digest}.svg"
+
+    def put(self, svg: str) -> str:
+        data = svg.encode("utf-8")
+        digest = svg_digest(svg)
+        path = self.path(digest)
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                try:
+                    os.utime(path)
+                    return digest
+                except FileNotFoundError:  # evicted by another process sharing the directory
+                    self.bytes -= self._entries.pop(digest)
+            tmp = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            self.root.mkdir(parents=True, exist_ok=True)  # the directory may have been cleared
+            tmp.write_bytes(data)
+            os.replace(tmp, path)  # readers never see a partial file
+            self._entries[digest] = len(data)
+            self.bytes += len(data)
+            self._evict()
+        return digest
+
+    def get(self, digest: str) -> bytes | None:
+        try:
+            return self.path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            digest, size = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.path(digest).unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _default_dir() -> Path:
+    configured = os.environ.get("PROFILEGEN_BADGE_DIR")
+    return Path(configured) if configured else Path.home() / ".cache" / "github-profile-generator" / "badges"
+
+
+@lru_cache(maxsize=1)
+def get_store() -> BadgeStore:
+    """The process-wide store (PROFILEGEN_BADGE_DIR, else ~/.cache/github-profile-generator/badges)."""
+    return BadgeStore(_default_dir())
+
+
+# ---------------------------
+# Assets
+# ---------------------------
+class Asset(NamedTuple):
+    """
+    A local SVG a README references, with what it is drawn from: a badge (one label),
+    a strip (all labels), or `svg` itself (stats cards, which have no recipe here).
+    """
+    digest: str
+    labels: tuple[str, ...] = ()
+    strip: bool = False
+    svg: str = ""
+
+    @property
+    def member(self) -> str:
+        return f"{ASSET_DIR}/{self.digest}.svg"
+
+    def data(self) -> bytes:
+        """The SVG bytes: carried, stored, or drawn again (and stored back)."""
+        if self.svg:
+            return self.svg.encode("utf-8")
+        store = get_store()
+        data = store.get(self.digest)
+        if data is None:
+            svg = strip_svg(self.labels) if self.strip else badge_svg(self.labels[0])
+            store.put(svg)
+            data = svg.encode("utf-8")
+        return data
+
+
+def svg_asset(svg: str) -> Asset:
+    """An Asset that carries its SVG, for files no store eviction may lose."""
+    return Asset(svg_digest(svg), svg=svg)
+
+
+_reported: ContextVar[list[Asset] | None] = ContextVar("badge_svg_assets", default=None)
+
+
+@contextmanager
+def recording_assets() -> Iterator[list[Asset]]:
+    """Collect the Assets report_assets() is given inside the block (per thread / task)."""
+    assets: list[Asset] = []
+    token = _reported.set(assets)
+    try:
+        yield assets
+    finally:
+        _reported.reset(token)
+
+
+def report_assets(assets: Iterable[Asset]) -> None:
+    """Called by the renderer for every block whose output references local SVGs."""
+    recorded = _reported.get()
+    if recorded is not None:
+        recorded.extend(assets)
+
+
+def asset_files(assets: Iterable[Asset]) -> dict[str, bytes]:
+    """{"badges/<digest>.svg": svg bytes} for the Assets of a render."""
+    return {asset.member: asset.data() for asset in dict.fromkeys(assets)}
+
+
+# ---------------------------
+# Markdown helpers
+# ---------------------------
+def local_badges(labels: tuple[str, ...], mode: str) -> tuple[str, tuple[Asset, ...]]:
+    """(Markdown, Assets) for `labels` in "local" or "strip" mode; the SVGs are stored as a side effect."""
+    store = get_store()
+    with metrics.span(f"badges.{mode}"):
+        if mode == "strip":
+            if not labels:
+                return "", ()
+            asset = Asset(store.put(strip_svg(labels)), labels, strip=True)
+            return f"![Tech stack]({asset.member})", (asset,)
+        assets = tuple(Asset(store.put(badge_svg(label)), (label,)) for label in labels)
+        return "\n".join(f"![{a.labels[0]}]({a.member})" for a in assets), assets
+
+
+def inline_assets(text: str, assets: Iterable[Asset]) -> str:
+    """Swap the references to `assets` for data: URIs, e.g. for an in-page preview (no requests at all)."""
+    uris = {
+        asset.digest: "data:image/svg+xml;base64," + base64.b64encode(asset.data()).decode("ascii")
+        for asset in dict.fromkeys(assets)
+    }
+    if not uris:
+        return text  # remote badges only: skip both regex passes
+
+    def md_repl(m: re.Match) -> str:
+        uri = uris.get(m.group(2))
+        return f'<img alt="{_attr(m.group(1))}" src="{uri}"/>' if uri else m.group(0)
+
+    def src_repl(m: re.Match) -> str:
+        uri = uris.get(m.group(1))
+        return f'src="{uri}"' if uri else m.group(0)
+
+    return _SRC_ASSET_RE.sub(src_repl, _MD_ASSET_RE.sub(md_repl, text))
@@ -0,0 +1,133 @@
+# badges.py
+from collections import Counter, defaultdict
+from functools import lru_cache
+import heapq
+from pathlib import Path
+import re
+from urllib.parse import quote
+
+from .data_files import data_path
+
+BADGES_FILE = data_path("badges.json")
+
+# Characters that never distinguish two technologies ("Node.js" == "nodejs", "ROS 2" == "ros2")
+_NOISE_RE = re.compile(r"[\s.\-_/]+")
+
+FUZZY_MIN_LEN = 4          # short names ("go", "c", "r") only match exactly
+FUZZY_MIN_SCORE = 0.75     # Dice similarity of trigram sets; only add a logo when confident
+FUZZY_MAX_CANDIDATES = 16  # bound on candidates scored per lookup
+FUZZY_MEMO_SIZE = 1 << 16  # fuzzy results kept per process (the memo is reset when full)
+
+
+def normalize(label: str) -> str:
+    return _NOISE_RE.sub("", label.casefold())
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BadgeRegistry:
+    """
+    Maps technology names to shields.io logo slugs.
+    Exact lookups go through a dict of normalized names (case, punctuation,
+    whitespace and aliases folded); misses fall back to a trigram index.
+    """
+
+    def __init__(self, names: dict[str, str]):
+        self._exact: dict[str, str] = {}
+        for name, logo in names.items():
+            key = normalize(name)
+            if self._exact.get(key, logo) != logo:
+                raise ValueError(f"Badge name {name!r} maps to both {self._exact[key]!r} and {logo!r}")
+            self._exact[key] = logo
+
+        self._resolved: dict[str, str | None] = {}  # fuzzy results by normalized name
+        self._trigram_index: tuple[dict[str, set[str]], dict[str, list[str]]] | None = None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "BadgeRegistry":
+        """Load {category: {logo: [name, ...]}} from a JSON data file."""
+        import json  # only on first use: see get_registry()
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        names = {}
+        for logos in data.values():
+            for logo, aliases in logos.items():
+                for name in aliases:
+                    if names.get(name, logo) != logo:
+                        raise ValueError(f"Badge name {name!r} maps to both {names[name]!r} and {logo!r}")
+                    names[name] = logo
+        return cls(names)
+
+    def logo_for(self, label: str) -> str | None:
+        return self.logo_for_key(normalize(label))
+
+    def logo_for_key(self, key: str) -> str | None:
+        """logo_for() of an already normalized name."""
+        if not key:
+            return None
+        logo = self._exact.get(key)
+        if logo is not None or len(key) < FUZZY_MIN_LEN:
+            return logo
+        if key in self._resolved:
+            return self._resolved[key]
+        if len(self._resolved) >= FUZZY_MEMO_SIZE:
+            self._resolved.clear()
+        logo = self._resolved[key] = self._fuzzy(key)
+        return logo
+
+    def is_exact(self, key: str) -> bool:
+        return key in self._exact
+
+    def preload(self, resolved: dict[str, str | None]) -> None:
+        """Seed fuzzy lookups resolved elsewhere (normalized name -> logo), e.g. by a batch's parent process."""
+        self._resolved.update(resolved)
+
+    def _fuzzy_index(self) -> tuple[dict[str, set[str]], dict[str, list[str]]]:
+        """(trigrams by name, names by trigram), built on the first fuzzy lookup: exact names never need it."""
+        if self._trigram_index is None:
+            by_key = {key: _trigrams(key) for key in self._exact}
+            index: dict[str, list[str]] = defaultdict(list)
+            for key, grams in by_key.items():
+                for g in grams:
+                    index[g].append(key)
+            self._trigram_index = (by_key, index)  # one assignment: a racing thread builds an equal copy
+        return self._trigram_index
+
+    def _fuzzy(self, key: str) -> str | None:
+        by_key, index = self._fuzzy_index()
+        grams = _trigrams(key)
+        shared = Counter(k for g in grams for k in index.get(g, ()))
+        best, best_score = None, FUZZY_MIN_SCORE
+        for cand, _ in heapq.nlargest(FUZZY_MAX_CANDIDATES, shared.items(), key=lambda kv: kv[1]):
+            if len(cand) < FUZZY_MIN_LEN:
+                continue
+            other = by_key[cand]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score >= best_score:
+                best, best_score = cand, score
+        return self._exact[best] if best else None
+
+
+@lru_cache(maxsize=1)
+def get_registry() -> BadgeRegistry:
+    return BadgeRegistry.from_file(BADGES_FILE)
+
+
+@lru_cache(maxsize=4096)
+def badge_for(name: str, use_logo: bool) -> str:
+    """
+    Build a shields.io badge. Add logo param only when we have a confident mapping.
+    """
+    label = name.strip()
+    if not label:
+        return ""
+    url_text = quote(label, safe="")
+    logo_param = ""
+    if use_logo:
+        logo = get_registry().logo_for(label)
+        if logo:
+            logo_param = f"&logo={logo}"
+    return f"![{label}](https://img.shields.io/badge/-{url_text}-05122A?style=flat-square{logo_param}&color=353535)"
@@ -0,0 +1,482 @@
+# batch.py
+"""
+Headless bulk README generation.
+
+    python src/batch.py people.csv --theme default --out out/
+    python src/batch.py people.jsonl --out profiles.zip --workers 8
+
+Input is CSV (list fields separated by ';') or JSONL (one user_data object per line),
+streamed record by record; --columnar (implied for .parquet) loads and normalizes
+the whole file as columns instead, see columnar.
+Each record is rendered with generate_readme() on a worker pool and written as
+<name>/README.md into a directory, .tar(.gz) or .zip as soon as it is ready.
+Members are written in chunks (see OutputWriter), never as one encoded copy.
+With --badges local|strip the badge SVGs are generated locally and written next
+to each README (<name>/badges/<digest>.svg), so the output needs no shields.io.
+--check-links validates every profile link once rendering is done (see
+link_check) and lists the broken ones in the report; they do not fail the batch.
+--html also renders each README to a standalone <name>/index.html, plus an
+index.html linking them all: a static site of previews (see html_render).
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .badge_svg import BADGE_MODES, asset_files
+from .badges import get_registry
+from .generate_readme import RenderContext, _github_username_from_url, _or_empty
+from . import metrics
+from .profile_input import ProfileInput
+from .render_cache import RenderCache
+from .templates import encode_chunks
+
+LIST_FIELDS = ("skills", "tech_stack")
+BOOL_FIELDS = ("tech_stack_use_logos",)
+
+TAR_SPOOL_BYTES = 8 << 20  # larger tar members are staged in a temporary file
+
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class RecordError(Exception):
+    """An input line that could not be parsed into a record."""
+
+
+# ---------------------------
+# Input
+# ---------------------------
+def normalize_record(raw: dict) -> dict:
+    record = dict(raw)
+    for key in LIST_FIELDS:
+        value = record.get(key)
+        if isinstance(value, str):
+            record[key] = [v.strip() for v in value.split(";") if v.strip()]
+    for key in BOOL_FIELDS:
+        value = record.get(key)
+        if isinstance(value, str):
+            record[key] = value.strip().lower() not in ("0", "false", "no", "off")
+    return record
+
+
+def iter_records(path: Path) -> Iterator[dict | RecordError]:
+    """Stream records from a .csv or .jsonl/.ndjson file without loading it whole."""
+    suffix = path.suffix.lower()
+    with path.open(encoding="utf-8", newline="") as f:
+        if suffix == ".csv":
+            for row in csv.DictReader(f):
+                yield normalize_record(row)
+        elif suffix in (".jsonl", ".ndjson"):
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    raw = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield RecordError(f"line {lineno}: {e}")
+                    continue
+                if not isinstance(raw, dict):
+                    yield RecordError(f"line {lineno}: expected a JSON object")
+                    continue
+                yield normalize_record(raw)
+        else:
+            raise ValueError(f"Unsupported input format: {path.suffix} (use .csv or .jsonl)")
+
+
+def record_name(record: dict | ProfileInput, index: int) -> str:
+    """Output name for a record: explicit id, GitHub username, or its index."""
+    if isinstance(record, ProfileInput):
+        record = dict(record.extra, github_username=record.github_username, github=record.github)
+    name = (
+        _or_empty(record.get("id"))
+        or _or_empty(record.get("github_username"))
+        or _github_username_from_url(_or_empty(record.get("github")))
+        or f"record-{index:06d}"
+    )
+    return _UNSAFE_NAME_RE.sub("_", name).strip("._") or f"record-{index:06d}"
+
+
+# ---------------------------
+# Output
+# ---------------------------
+class OutputWriter(ABC):
+    """
+    Writes <name>/README.md (plus its assets and HTML page) under a name from reserve(),
+    which de-duplicates names with the record index. `text` is a str or an iterable of
+    UTF-8 chunks (e.g. generate_readme.stream_profile()).
+    """
+
+    def __init__(self):
+        self._seen: set[str] = set()
+
+    def reserve(self, name: str, index: int) -> str:
+        """The unique name record `index` is written under; call in input order so reruns agree."""
+        if name in self._seen:
+            name = f"{name}-{index}"
+        self._seen.add(name)
+        return name
+
+    def write(
+        self,
+        name: str,
+        text: str | Iterable[bytes],
+        assets: dict[str, bytes] | None = None,
+        page: str | None = None,
+    ) -> None:
+        """Write one record under `name`, as returned by reserve()."""
+        self._write(f"{name}/README.md", encode_chunks(text) if isinstance(text, str) else text)
+        for member, data in (assets or {}).items():
+            self._write(f"{name}/{member}", (data,))
+        if page is not None:
+            self._write(f"{name}/index.html", encode_chunks(page))
+
+    def write_page(self, member: str, page: str) -> None:
+        """A page outside the record directories (the site's index.html)."""
+        self._write(member, encode_chunks(page))
+
+    @abstractmethod
+    def _write(self, member: str, chunks: Iterable[bytes]) -> None:
+        """Store one member from its chunks, in order."""
+
+    def close(self) -> None:
+        pass
+
+
+class DirectoryWriter(OutputWriter):
+    def __init__(self, root: Path):
+        super().__init__()
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, member: str, chunks: Iterable[bytes]) -> None:
+        path = self.root / member
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.writelines(chunks)
+
+
+class TarWriter(OutputWriter):
+    def __init__(self, path: Path):
+        super().__init__()
+        mode = "w:gz" if path.name.endswith((".tar.gz", ".tgz")) else "w"
+        self._tar = tarfile.open(path, mode)
+
+    def _write(self, member: str, chunks: Iterable[bytes]) -> None:
+        # Tar headers need the size up front: spool, in memory up to a limit, then on disk
+        with tempfile.SpooledTemporaryFile(max_size=TAR_SPOOL_BYTES) as spool:
+            spool.writelines(chunks)
+            info = tarfile.TarInfo(member)
+            info.size = spool.tell()
+            info.mtime = int(time.time())
+            spool.seek(0)
+            self._tar.addfile(info, spool)
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+class ZipWriter(OutputWriter):
+    def __init__(self, path: Path):
+        super().__init__()
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def _write(self, member: str, chunks: Iterable[bytes]) -> None:
+        with self._zip.open(member, "w") as f:
+            f.writelines(chunks)
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+def open_writer(out: Path) -> OutputWriter:
+    name = out.name.lower()
+    if name.endswith(".zip"):
+        return ZipWriter(out)
+    if name.endswith((".tar", ".tar.gz", ".tgz")):
+        return TarWriter(out)
+    return DirectoryWriter(out)
+
+
+# ---------------------------
+# Engine
+# ---------------------------
+@dataclass
+class BatchReport:
+    total: int = 0
+    ok: int = 0
+    failures: list[tuple[int, str, str]] = field(default_factory=list)  # (index, name, error)
+    elapsed: float = 0.0
+    cache: dict | None = None  # RenderCache.stats(), thread pools only
+    metrics: dict | None = None  # metrics.snapshot() when metrics are enabled
+    links: dict | None = None  # link check summary, see _check_links()
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "ok": self.ok,
+            "failed": self.failed,
+            "elapsed_s": round(self.elapsed, 3),
+            "records_per_s": round(self.throughput, 1),
+            "failures": [{"index": i, "name": n, "error": e} for i, n, e in self.failures],
+            "cache": self.cache,
+            "metrics": self.metrics,
+            "links": self.links,
+        }
+
+
+_cache: RenderCache | None = None
+_ship_metrics = False  # worker processes return their measurements with each result
+
+
+def _init_cache(cache_db: Path | None, worker_metrics: bool = False, logos: dict | None = None) -> None:
+    # Runs once per worker process (or once in-process for thread pools)
+    global _cache, _ship_metrics
+    _cache = RenderCache(disk_path=cache_db)
+    if logos:
+        get_registry().preload(logos)
+    if worker_metrics:
+        metrics.enable()
+        _ship_metrics = True
+
+
+def _render_record(
+    theme: str, badge_mode: str, record: dict | ProfileInput, html: bool = False
+) -> tuple[str, dict[str, bytes], tuple[str, str] | None, dict | None]:
+    # Top-level so it can be pickled into process-pool workers
+    with metrics.span("batch.record"):
+        profile = record if isinstance(record, ProfileInput) else ProfileInput.from_mapping(record)
+        text, rendered_assets = _cache.render_with_assets(profile, RenderContext(theme, badge_mode=badge_mode))
+        assets = asset_files(rendered_assets)
+        page = None
+        if html:
+            from . import html_render  # markdown-it: only for --html
+
+            title = _page_title(profile)
+            page = title, html_render.html_page(html_render.readme_html(text, theme), title)
+    return text, assets, page, metrics.drain() if _ship_metrics else None
+
+
+def _page_title(profile: ProfileInput) -> str:
+    return _or_empty(profile.name) or _github_username_from_url(_or_empty(profile.github)) or "Profile"
+
+
+def run_batch(
+    records: Iterable[dict | ProfileInput | Exception],
+    theme: str,
+    writer: OutputWriter,
+    workers: int = 4,
+    use_processes: bool = True,
+    queue_size: int | None = None,
+    progress_every: int = 0,
+    cache_db: Path | None = None,
+    badge_mode: str = "remote",
+    logos: dict[str, str | None] | None = None,
+    check_links: bool = False,
+    link_timeout: float | None = None,
+    html: bool = False,
+) -> BatchReport:
+    """
+    Render `records` on a worker pool and hand each result to `writer` as it completes.
+    At most `queue_size` records are in flight, so rendered output held in memory stays
+    bounded for any input size; `check_links` and `html` also keep a small entry per
+    record until the end (its links; its name and page title).
+    A failing record is recorded in the report and never aborts the batch; so is an
+    exception in `records` (e.g. RecordError), standing for a record that could not be read.
+    Identical records are rendered once per worker; `cache_db` adds a sqlite tier
+    shared by all workers and later runs. `logos` (see columnar.resolve_logos)
+    is preloaded into each worker's badge registry. With `check_links`, the links
+    of all records are validated after rendering, each URL and host once
+    (`link_timeout` defaults to link_check.TIMEOUT_S). With `html`, each record also
+    gets an index.html page and the output a top-level index.html listing them.
+    """
+    RenderContext(theme, badge_mode=badge_mode)  # reject an unknown mode before starting the pool
+    report = BatchReport()
+    queue_size = queue_size or workers * 4
+    if use_processes:
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_cache, initargs=(cache_db, metrics.enabled(), logos)
+        )
+    else:
+        _init_cache(cache_db, logos=logos)
+        pool = ThreadPoolExecutor(max_workers=workers)
+    if check_links:
+        from . import link_check  # asyncio + ssl: only paid for when asked
+    if html:
+        from . import html_render
+
+        writer.reserve("index.html", -1)  # the site index; no record directory may take its name
+    start = time.perf_counter()
+    links: list[tuple[int, str, list[tuple[str, str]]]] = []  # (index, name, profile_links())
+    pages: list[tuple[int, str, str]] = []  # (index, name, title) for the site index
+
+    def _drain(pending: dict) -> None:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            index, name = pending.pop(fut)
+            try:
+                text, assets, page, worker_metrics = fut.result()
+                metrics.merge(worker_metrics)
+                with metrics.span("batch.write"):
+                    writer.write(name, text, assets, page[1] if page else None)
+                if page:
+                    pages.append((index, name, page[0]))
+                report.ok += 1
+            except Exception as e:
+                report.failures.append((index, name, f"{type(e).__name__}: {e}"))
+            if progress_every and (report.ok + report.failed) % progress_every == 0:
+                rate = (report.ok + report.failed) / (time.perf_counter() - start)
+                print(f"{report.ok + report.failed} records, {rate:.1f} rec/s", file=sys.stderr)
+
+    with pool:
+        pending: dict = {}
+        for index, record in enumerate(records):
+            report.total += 1
+            if isinstance(record, Exception):
+                report.failures.append((index, f"record-{index:06d}", str(record)))
+                continue
+            # Reserved here, in input order: which duplicate finishes first must not decide the names
+            name = writer.reserve(record_name(record, index), index)
+            pending[pool.submit(_render_record, theme, badge_mode, record, html)] = (index, name)
+            if check_links:
+                try:
+                    profile = record if isinstance(record, ProfileInput) else ProfileInput.from_mapping(record)
+                    links.append((index, name, link_check.profile_links(profile)))
+                except Exception:
+                    pass  # the render of this record fails and is reported
+            while len(pending) >= queue_size:
+                _drain(pending)
+        while pending:
+            _drain(pending)
+
+    if html:
+        pages.sort()
+        writer.write_page("index.html", html_render.site_index((name, title) for _, name, title in pages))
+    if check_links:
+        with metrics.span("batch.links"):
+            report.links = _check_links(links, link_timeout)
+    report.elapsed = time.perf_counter() - start
+    if not use_processes:
+        report.cache = _cache.stats()
+    if metrics.enabled():
+        report.metrics = metrics.snapshot()
+    return report
+
+
+def _check_links(links: list[tuple[int, str, list[tuple[str, str]]]], timeout: float | None) -> dict:
+    """Link check summary: counts by verdict, plus every link that is not OK."""
+    from . import link_check
+
+    options = {"timeout": timeout} if timeout is not None else {}
+    results = link_check.check_link_lists([pairs for _, _, pairs in links], **options)
+    summary = {"checked": 0, link_check.OK: 0, link_check.BROKEN: 0, link_check.UNVERIFIED: 0, "problems": []}
+    for (index, name, _), checked in zip(links, results):
+        for link_field, result in checked.items():
+            summary["checked"] += 1
+            summary[result.verdict] += 1
+            if not result.ok:
+                summary["problems"].append({
+                    "index": index, "name": name, "field": link_field, "url": result.url,
+                    "verdict": result.verdict, "status": result.status, "detail": result.detail,
+                })
+    summary["problems"].sort(key=lambda p: (p["index"], link_check.LINK_FIELDS.index(p["field"])))
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Generate README.md files for many users at once.")
+    ap.add_argument("input", type=Path, help="CSV, JSONL or Parquet file of user records")
+    ap.add_argument("--theme", default="default", help="Theme name in src/themes (default: default)")
+    ap.add_argument("--out", type=Path, required=True, help="Output directory, .zip, .tar or .tar.gz")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--threads", action="store_true", help="Use a thread pool instead of processes")
+    ap.add_argument("--queue-size", type=int, default=None, help="Max records in flight (default: 4 x workers)")
+    ap.add_argument("--report", type=Path, default=None, help="Write the JSON report here")
+    ap.add_argument("--cache-db", type=Path, default=None, help="sqlite file caching renders across runs")
+    ap.add_argument("--badges", choices=BADGE_MODES, default="remote",
+                    help="shields.io URLs (remote), local SVG per tech (local) or one SVG strip (strip)")
+    ap.add_argument("--columnar", action="store_true",
+                    help="Load and normalize the whole input as columns (faster for large inputs; implied for .parquet)")
+    ap.add_argument("--check-links", action="store_true",
+                    help="Validate every profile link after rendering; problems go to the report")
+    ap.add_argument("--link-timeout", type=float, default=None,
+                    help="Seconds to connect, and again for a response (default: 8)")
+    ap.add_argument("--html", action="store_true",
+                    help="Also write <name>/index.html for each README and an index.html linking them")
+    ap.add_argument("--metrics", type=Path, default=None,
+                    help="Record per-stage timings; write them here (.prom: Prometheus text, else JSON)")
+    args = ap.parse_args(argv)
+
+    if args.metrics:
+        metrics.enable()
+    logos = None
+    if args.columnar or args.input.suffix.lower() == ".parquet":
+        from . import columnar  # pandas is only needed here
+
+        with metrics.span("batch.ingest"):
+            records = columnar.load(args.input, logos=args.badges == "remote")
+        logos = records.logos
+    else:
+        records = iter_records(args.input)
+    writer = open_writer(args.out)
+    try:
+        report = run_batch(
+            records,
+            args.theme,
+            writer,
+            workers=args.workers,
+            use_processes=not args.threads,
+            queue_size=args.queue_size,
+            progress_every=1000,
+            cache_db=args.cache_db,
+            badge_mode=args.badges,
+            logos=logos,
+            check_links=args.check_links,
+            link_timeout=args.link_timeout,
+            html=args.html,
+        )
+    finally:
+        writer.close()
+
+    summary = report.as_dict()
+    if args.metrics:
+        dump = metrics.to_prometheus() if args.metrics.suffix == ".prom" else metrics.to_json()
+        args.metrics.write_text(dump, encoding="utf-8")
+    if args.report:
+        args.report.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(
+        f"{report.ok}/{report.total} rendered, {report.failed} failed "
+        f"in {report.elapsed:.2f}s ({report.throughput:.1f} records/s)",
+        file=sys.stderr,
+    )
+    for index, name, error in report.failures[:20]:
+        print(f"  #{index} {name}: {error}", file=sys.stderr)
+    if report.links is not None:
+        links = report.links
+        print(f"links: {links['checked']} checked, {links['broken']} broken, {links['unverified']} unverified",
+              file=sys.stderr)
+        for p in links["problems"][:20]:
+            print(f"  #{p['index']} {p['name']} {p['field']}: {p['verdict']} {p['url']} ({p['detail']})",
+                  file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
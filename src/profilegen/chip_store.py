@@ -0,0 +1,56 @@
+# chip_store.py
+import re
+
+_SPLIT_RE = re.compile(r"[,;\n\r]+")
+
+
+class ChipStore:
+    """
+    Ordered set of chip labels for the Skills / Tech Stack inputs.
+    Duplicates are detected case-insensitively through a maintained case-folded
+    index (O(1) per add/remove), and every item keeps a stable id for widget keys,
+    so removing one chip does not re-key the others.
+    """
+
+    def __init__(self, values=()):
+        self._items: dict[int, str] = {}   # id -> label, in insertion order
+        self._index: dict[str, int] = {}   # casefolded label -> id
+        self._next_id = 0
+        for v in values:
+            self.add(v)
+
+    def add(self, value: str) -> bool:
+        """Add a label; returns False if it is blank or already present (any case)."""
+        label = (value or "").strip()
+        key = label.casefold()
+        if not label or key in self._index:
+            return False
+        self._items[self._next_id] = label
+        self._index[key] = self._next_id
+        self._next_id += 1
+        return True
+
+    def add_many(self, text: str) -> int:
+        """Import a comma/semicolon/newline-separated list in one pass; returns how many were added."""
+        return sum(self.add(part) for part in _SPLIT_RE.split(text or ""))
+
+    def remove(self, item_id: int) -> None:
+        label = self._items.pop(item_id, None)
+        if label is not None:
+            del self._index[label.casefold()]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._index.clear()
+
+    def items(self) -> list[tuple[int, str]]:
+        return list(self._items.items())
+
+    def values(self) -> tuple[str, ...]:
+        return tuple(self._items.values())
+
+    def __contains__(self, value: str) -> bool:
+        return (value or "").strip().casefold() in self._index
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,267 @@
+# columnar.py
+"""
+Columnar ingestion for large batches (python src/batch.py ... --columnar).
+
+The whole input (CSV, JSONL or Parquet) is loaded into one DataFrame and
+normalized column by column: text trimming, GitHub usernames parsed out of
+the profile URLs, ';'-separated lists split and de-blanked, and the
+"use logos" flags. Technologies are factorized, so every distinct name is
+one shared string and its badge logo is resolved once for the whole input;
+the fuzzy matches are handed to the workers (BadgeRegistry.preload).
+The result is a list of ready ProfileInputs, rendered without re-normalizing.
+
+Unlike batch.iter_records(), this holds the input in memory; it pays off
+from tens of thousands of records up.
+"""
+from dataclasses import dataclass, field, fields
+import json
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .badges import FUZZY_MIN_LEN, _NOISE_RE, get_registry
+from .profile_input import ProfileInput
+
+_FIELDS = {f.name: f.default for f in fields(ProfileInput) if f.name != "extra"}
+TEXT_FIELDS = tuple(name for name, default in _FIELDS.items() if isinstance(default, str))
+LIST_FIELDS = tuple(name for name, default in _FIELDS.items() if isinstance(default, tuple))
+BOOL_FIELDS = tuple(name for name, default in _FIELDS.items() if isinstance(default, bool))
+
+_FALSE_WORDS = ("0", "false", "no", "off")
+
+# What urllib.parse.urlparse() makes of a URL, as far as generate_readme._github_username_from_url()
+# looks: netloc, the first path segment, and the rest of the path (';params' only split off the last one)
+_URL_RE = r"^(?:[A-Za-z][A-Za-z0-9+.\-]*:)?//([^/?#]*)/*([^/?#]*)([^?#]*)"
+
+
+@dataclass
+class ColumnarInput:
+    """
+    A whole input file, normalized. Iterating yields, in input order, a ProfileInput
+    per record and a ValueError for each line that could not be read.
+    """
+    profiles: list[ProfileInput]
+    positions: list[int]  # record index of each profile
+    errors: dict[int, str] = field(default_factory=dict)  # record index -> parse error
+    logos: dict[str, str | None] = field(default_factory=dict)  # fuzzy logo matches, see BadgeRegistry.preload
+
+    def __len__(self) -> int:
+        return len(self.profiles) + len(self.errors)
+
+    def __iter__(self) -> Iterator[ProfileInput | ValueError]:
+        profiles = iter(self.profiles)
+        positions = iter(self.positions)
+        next_pos = next(positions, None)
+        for index in range(len(self)):
+            if index == next_pos:
+                yield next(profiles)
+                next_pos = next(positions, None)
+            else:
+                yield ValueError(self.errors[index])
+
+
+# ---------------------------
+# Loading
+# ---------------------------
+def read_frame(path: Path) -> tuple[pd.DataFrame, dict[int, str]]:
+    """
+    Load a .csv, .jsonl/.ndjson or .parquet file; the frame is indexed by record
+    position, and JSONL lines that do not parse are returned as errors instead.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8"), {}
+    if suffix in (".jsonl", ".ndjson"):
+        return _read_jsonl(path)
+    if suffix == ".parquet":
+        try:
+            return pd.read_parquet(path), {}
+        except ImportError as e:
+            raise ValueError(f"Reading .parquet needs pyarrow ({e})") from None
+    raise ValueError(f"Unsupported input format: {path.suffix} (use .csv, .jsonl or .parquet)")
+
+
+def _read_jsonl(path: Path) -> tuple[pd.DataFrame, dict[int, str]]:
+    with path.open(encoding="utf-8") as f:
+        lines = [line for line in f]
+    try:
+        # One decoder call for the whole file; line by line only to pin down a bad line
+        records = json.loads(f"[{','.join(line for line in lines if line.strip())}]")
+        if all(isinstance(raw, dict) for raw in records):
+            return pd.DataFrame(records, dtype=object), {}
+    except json.JSONDecodeError:
+        pass
+    records, positions, errors = [], [], {}
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        index = len(records) + len(errors)
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as e:
+            errors[index] = f"line {lineno}: {e}"
+            continue
+        if not isinstance(raw, dict):
+            errors[index] = f"line {lineno}: expected a JSON object"
+            continue
+        records.append(raw)
+        positions.append(index)
+    # object columns: values keep their JSON types; an absent key is NaN, null stays None
+    return pd.DataFrame(records, index=positions, dtype=object), errors
+
+
+# ---------------------------
+# Column operations
+# ---------------------------
+def _absent(col: pd.Series) -> np.ndarray:
+    """Cells the record has no value for (None is a value: JSON null)."""
+    return (col.isna() & ~(col.to_numpy(dtype=object) == None)).to_numpy()  # noqa: E711
+
+
+def _text(col: pd.Series) -> pd.Series:
+    """Stripped text of every cell ("" when missing), as pandas' string dtype."""
+    if not isinstance(col.dtype, pd.StringDtype):
+        col = col.astype(object)
+        col = col.where(col.notna(), "").astype(str)
+    return col.fillna("").str.strip()
+
+
+def _str_cells(col: pd.Series, fn) -> pd.Series:
+    """fn(col.str) on the str cells, NaN elsewhere (lists, numbers, missing)."""
+    col = col.astype(object)
+    try:
+        return fn(col.str)
+    except AttributeError:  # no str cells at all
+        return pd.Series(np.nan, index=col.index, dtype=object)
+
+
+def _items(col: pd.Series) -> pd.Series:
+    """One row per list item (index = record), stripped and de-blanked; str cells are split on ';'."""
+    if isinstance(col.dtype, pd.StringDtype):
+        items = col.fillna("").str.split(";").explode()
+    else:
+        split = _str_cells(col, lambda s: s.split(";"))
+        items = split.where(split.notna(), col.astype(object)).explode()
+    items = items[items.notna()].astype(str).str.strip()
+    return items[items != ""]
+
+
+def _tuples(items: pd.Series, n: int) -> list[tuple[str, ...]]:
+    """Regroup _items() output (index 0..n-1, ascending) into one tuple per record."""
+    values = items.tolist()
+    rows = np.arange(n)
+    pos = items.index.to_numpy()
+    starts = np.searchsorted(pos, rows).tolist()
+    ends = np.searchsorted(pos, rows, side="right").tolist()
+    return [tuple(values[a:b]) for a, b in zip(starts, ends)]
+
+
+def _factorized(items: pd.Series) -> pd.Series:
+    """The same items, with every occurrence of a name sharing one string object."""
+    codes, uniques = pd.factorize(items)
+    return pd.Series(np.asarray(uniques, dtype=object).take(codes), index=items.index, dtype=object)
+
+
+def _flags(col: pd.Series) -> pd.Series:
+    """batch.normalize_record() for a bool field: 'no'/'off'/'false'/'0' are False, absent is True."""
+    words = _str_cells(col, lambda s: s.strip().str.lower())
+    col = col.astype(object)
+    flags = col.where(words.isna(), ~words.isin(_FALSE_WORDS)).astype(bool)
+    return flags.where(~_absent(col), True)
+
+
+def github_usernames(github: pd.Series) -> pd.Series:
+    """generate_readme._github_username_from_url() over a column of stripped URLs ("" when none)."""
+    parts = github.str.extract(_URL_RE)
+    netloc, first, rest = (parts[i].fillna("") for i in range(3))
+    # ';params' belong to the last path segment only
+    first = first.where(rest.str.contains("/", regex=False), first.str.replace(r";.*", "", regex=True))
+    return first.where(netloc.str.contains("github.com", regex=False), "").fillna("")
+
+
+def resolve_logos(techs: pd.Series) -> dict[str, str | None]:
+    """
+    Fuzzy logo matches for the distinct techs, by normalized name. Exact names
+    cost a dict lookup in the workers and are left out.
+    """
+    names = pd.Series(pd.unique(techs), dtype=object)
+    keys = pd.unique(names.str.casefold().str.replace(_NOISE_RE.pattern, "", regex=True))
+    registry = get_registry()
+    return {
+        key: registry.logo_for_key(key)
+        for key in keys
+        if len(key) >= FUZZY_MIN_LEN and not registry.is_exact(key)
+    }
+
+
+def normalize_frame(frame: pd.DataFrame, logos: bool = True) -> ColumnarInput:
+    """
+    ProfileInput.from_mapping() / batch.normalize_record() for every row at once.
+    The frame's index gives each row's record position; with `logos`, the badge
+    logos of its techs are resolved up front.
+    """
+    positions = frame.index.tolist()
+    frame = frame.reset_index(drop=True)
+    if "Facebook" in frame.columns:  # key used by older run.py versions
+        old = frame.pop("Facebook").astype(object)
+        if "facebook" in frame.columns:
+            take = _absent(frame["facebook"])
+            frame["facebook"] = frame["facebook"].astype(object).where(~take, old)
+            frame["Facebook"] = old.where(~take, np.nan)  # still an extra value where facebook is set
+        else:
+            frame["facebook"] = old
+    n = len(frame)
+    text = {name: _text(frame[name]) for name in TEXT_FIELDS if name in frame.columns}
+    if "github" in text:
+        parsed = github_usernames(text["github"])
+        username = text.get("github_username")
+        text["github_username"] = parsed if username is None else username.where(username != "", parsed)
+    columns: dict[str, list] = {
+        name: text[name].tolist() if name in text else [""] * n for name in TEXT_FIELDS
+    }
+
+    flags = {name: _flags(frame[name]).to_numpy() for name in BOOL_FIELDS if name in frame.columns}
+    for name in BOOL_FIELDS:
+        columns[name] = flags[name].tolist() if name in flags else [_FIELDS[name]] * n
+    resolved: dict[str, str | None] = {}
+    for name in LIST_FIELDS:
+        if name not in frame.columns:
+            columns[name] = [()] * n
+            continue
+        items = _factorized(_items(frame[name]))
+        columns[name] = _tuples(items, n)
+        if name == "tech_stack" and logos:
+            use_logos = flags.get("tech_stack_use_logos")
+            resolved = resolve_logos(items if use_logos is None else items[use_logos[items.index]])
+
+    columns["extra"] = _extras(frame, n)
+    names = list(columns)
+    profiles = [
+        ProfileInput.from_normalized(**dict(zip(names, row)))
+        for row in zip(*columns.values())
+    ]
+    return ColumnarInput(profiles, positions, logos=resolved)
+
+
+def _extras(frame: pd.DataFrame, n: int) -> list[tuple[tuple[str, str], ...]]:
+    """Placeholder values of the unknown columns, per row: (key, text) pairs sorted by key."""
+    extra_cols = sorted((str(c), c) for c in frame.columns if c not in _FIELDS)
+    if not extra_cols:
+        return [()] * n
+    per_col = []
+    for key, c in extra_cols:
+        col = frame[c].astype(object)
+        scalar = ~_absent(col) & ~col.map(lambda v: isinstance(v, (list, tuple, dict, bool, np.ndarray))).to_numpy()
+        texts = _text(col).tolist()
+        per_col.append([(key, t) if keep else None for t, keep in zip(texts, scalar.tolist())])
+    return [tuple(pair for pair in row if pair is not None) for row in zip(*per_col)]
+
+
+def load(path: Path, logos: bool = True) -> ColumnarInput:
+    """read_frame() + normalize_frame(), with the unreadable JSONL lines kept in place as errors."""
+    frame, errors = read_frame(path)
+    batch = normalize_frame(frame, logos=logos)
+    batch.errors = errors
+    return batch
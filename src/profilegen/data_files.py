@@ -0,0 +1,18 @@
+# data_files.py
+"""
+Where the bundled data (themes/, badges.json) lives, whatever the working directory:
+next to the profilegen package (src/) in a checkout or editable install, under
+<prefix>/share/github-profile-generator/ when installed from a wheel.
+"""
+from pathlib import Path
+import sys
+
+_HERE = Path(__file__).resolve().parent.parent
+_SHARE = Path(sys.prefix) / "share" / "github-profile-generator"
+
+
+def data_path(name: str) -> Path:
+    here = _HERE / name
+    if here.exists() or not (_SHARE / name).exists():
+        return here
+    return _SHARE / name
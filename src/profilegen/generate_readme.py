@@ -0,0 +1,215 @@
+# generate_readme.py
+from dataclasses import dataclass
+from functools import lru_cache
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, NamedTuple
+from urllib.parse import urlparse
+
+from .badge_svg import BADGE_MODES, Asset, local_badges, recording_assets, report_assets
+from .badges import badge_for
+from .data_files import data_path
+from . import metrics
+from .profile_input import ProfileInput
+from .template_lang import FILTERS, Scope
+from .templates import CHUNK_SIZE, CompiledTemplate, compile_template
+from .theme_registry import registry_for
+
+# Bundled themes, found from this file rather than the working directory; PROFILEGEN_THEMES_DIR overrides
+TEMPLATES_DIR = Path(os.environ.get("PROFILEGEN_THEMES_DIR") or data_path("themes"))
+# Optional precompiled pack (see theme_pack); loose files in TEMPLATES_DIR take precedence
+THEME_PACK = Path(os.environ["PROFILEGEN_THEME_PACK"]) if os.environ.get("PROFILEGEN_THEME_PACK") else None
+
+def _or_empty(s: str | None) -> str:
+    return (s or "").strip()
+
+def _github_username_from_url(url: str | None) -> str | None:
+    """
+    Extracts a GitHub username from a URL like:
+      https://github.com/mkazemie/   -> mkazemie
+      https://github.com/mkazemie     -> mkazemie
+    Returns None if not parseable.
+    """
+    if not url:
+        return None
+    try:
+        p = urlparse(url)
+        if "github.com" not in (p.netloc or ""):
+            return None
+        parts = [seg for seg in (p.path or "").split("/") if seg]
+        return parts[0] if parts else None
+    except Exception:
+        return None
+
+def _fill_placeholders(template_text: str, user_data: dict) -> str:
+    """
+    Replace {{var}} placeholders in the template with user-provided values.
+    If a variable is missing/empty, replace with a single space (as requested).
+    Unknown placeholders are also replaced with a space.
+    """
+    return compile_template(template_text).render(_placeholder_lookup(user_data))
+
+def _placeholder_lookup(user_data: dict):
+    def lookup(key: str) -> str:
+        return _or_empty(user_data.get(key, " ")) or " "
+    return lookup
+
+@lru_cache(maxsize=1024)
+def _make_skills_block(skills: tuple[str, ...]) -> str:
+    lines = [f"- {s.strip()}" for s in skills if _or_empty(s)]
+    return "\n".join(lines) if lines else "- "  # keep a single bullet if empty
+
+@lru_cache(maxsize=1024)
+def _tech_stack_block(
+    techs: tuple[str, ...], use_logos: bool, badge_mode: str = "remote"
+) -> tuple[str, tuple[Asset, ...]]:
+    """(Markdown, the local SVGs it references)."""
+    if badge_mode != "remote":
+        # Generated locally (text-only); see badge_svg
+        return local_badges(tuple(t.strip() for t in techs if _or_empty(t)), badge_mode)
+    badges = [badge_for(t, use_logos) for t in techs if _or_empty(t)]
+    badges = [b for b in badges if b]
+    return ("\n".join(badges) if badges else ""), ()
+
+def _make_tech_stack_block(techs: tuple[str, ...], use_logos: bool, badge_mode: str = "remote") -> str:
+    return _tech_stack_block(techs, use_logos, badge_mode)[0]
+
+@dataclass(frozen=True, slots=True)
+class RenderContext:
+    """How to render a profile: which theme, whether to keep the GitHub stats region, and how to draw badges."""
+    theme: str
+    include_stats: bool = True
+    badge_mode: str = "remote"  # see badge_svg.BADGE_MODES
+    stats_cards: str = ""       # replaces each stats region when set (see local_stats.stats_cards)
+    stats_assets: tuple[Asset, ...] = ()  # the SVGs stats_cards references
+
+    def __post_init__(self):
+        if self.badge_mode not in BADGE_MODES:
+            raise ValueError(f"Unknown badge mode {self.badge_mode!r} (use one of: {', '.join(BADGE_MODES)})")
+
+def _load_theme(theme: str) -> CompiledTemplate:
+    # Indexed, compiled once and re-checked only on the registry's poll interval
+    return registry_for(TEMPLATES_DIR, THEME_PACK).get(theme).template
+
+def render_profile(profile: ProfileInput, ctx: RenderContext) -> str:
+    """
+    Render one README. Pure and reentrant: reads only its (immutable) arguments and
+    the shared compiled theme, so it is safe to call from many threads at once and
+    its result can be memoized on (profile, ctx).
+    Supports:
+      - {{skills_block}}: rendered bullet list of skills
+      - {{tech_stack_block}}: rendered badges for tech stack (logos only if mapped),
+        shields.io URLs or locally generated SVGs depending on ctx.badge_mode
+      - {{github_username}}: explicit username, else parsed from the GitHub URL
+      - {% for skill in skills %} / {% if motto %} blocks and {{ tech | badge }}
+        filters (see template_lang), over the same values plus the skills and
+        tech_stack lists
+    The GitHub stats region ({{#stats}}...{{/stats}} or the widget <div>) is dropped
+    when ctx.include_stats is False, replaced by ctx.stats_cards when set, and
+    hard-coded handles inside widget URLs are pointed at the user, all in the same
+    rendering pass.
+    """
+    laps = metrics.laps()
+    template = _load_theme(ctx.theme)
+    if laps:
+        laps.mark("theme.load")
+    return _render_template(template, profile, ctx)
+
+class Rendered(NamedTuple):
+    text: str
+    assets: tuple[Asset, ...]  # the local SVGs (badges, stats cards) the text references; see badge_svg.asset_files
+
+def render_with_assets(profile: ProfileInput, ctx: RenderContext) -> Rendered:
+    """render_profile() plus the local SVGs it references, as reported by the blocks that drew them."""
+    with recording_assets() as assets:
+        text = render_profile(profile, ctx)
+    return Rendered(text, tuple(dict.fromkeys(assets)))
+
+def _render_template(template: CompiledTemplate, profile: ProfileInput, ctx: RenderContext) -> str:
+    laps = metrics.laps()
+    lookup, gh_user, scope = _render_inputs(template, profile, ctx, laps)
+    output = template.render(
+        lookup, handle=gh_user, include_stats=ctx.include_stats, stats_html=ctx.stats_cards, scope=scope
+    )
+    if laps:
+        laps.mark("template.fill")
+    return output
+
+def _render_inputs(
+    template: CompiledTemplate, profile: ProfileInput, ctx: RenderContext, laps: metrics.Laps | None
+) -> tuple[Callable[[str], str], str, Scope | None]:
+    """(placeholder lookup, GitHub username, block scope) for one render, with the dynamic blocks built."""
+    gh_user = profile.github_username or _github_username_from_url(profile.github) or ""
+    values = profile.text_values()
+    values["github_username"] = gh_user
+    if laps:
+        laps.mark("values")
+    values["skills_block"] = _make_skills_block(profile.skills)
+    if laps:
+        laps.mark("blocks.skills")
+    values["tech_stack_block"], assets = _tech_stack_block(
+        profile.tech_stack, profile.tech_stack_use_logos, ctx.badge_mode
+    )
+    if "tech_stack_block" in template.slots:
+        report_assets(assets)
+    if ctx.stats_cards and ctx.include_stats and template.has_stats:
+        report_assets(ctx.stats_assets)
+    if laps:
+        laps.mark("blocks.tech_stack")
+    return _placeholder_lookup(values), gh_user, _template_scope(profile, values, ctx) if template.has_logic else None
+
+def _template_scope(profile: ProfileInput, values: dict[str, str], ctx: RenderContext) -> Scope:
+    """Variables for {% %} blocks: the placeholder values plus the skill / tech lists, and a bound badge filter."""
+    data = dict(values, skills=profile.skills, tech_stack=profile.tech_stack)
+    use_logos, badge_mode = profile.tech_stack_use_logos, ctx.badge_mode
+    seen: dict[str, tuple[str, tuple[Asset, ...]]] = {}  # one tech at a time is the common case: skip the lru key hashing
+
+    def badge(value) -> str:
+        if isinstance(value, str):
+            out = seen.get(value)
+            if out is None:
+                out = seen[value] = _tech_stack_block((value,), use_logos, badge_mode)
+        else:
+            out = _tech_stack_block(tuple(t for t in value if isinstance(t, str)), use_logos, badge_mode)
+        report_assets(out[1])
+        return out[0]
+
+    return Scope(data.get, {**FILTERS, "badge": badge})
+
+def stream_profile(profile: ProfileInput, ctx: RenderContext, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    render_profile() as UTF-8 chunks of about `chunk_size` bytes, for files, archive
+    members and HTTP responses; the document is never built as one string. The theme
+    and blocks are resolved before returning, so errors surface before the first chunk.
+    """
+    laps = metrics.laps()
+    template = _load_theme(ctx.theme)
+    if laps:
+        laps.mark("theme.load")
+    lookup, gh_user, scope = _render_inputs(template, profile, ctx, laps)
+    return template.iter_render(
+        lookup, handle=gh_user, include_stats=ctx.include_stats, stats_html=ctx.stats_cards,
+        scope=scope, chunk_size=chunk_size,
+    )
+
+def write_profile(fp: BinaryIO, profile: ProfileInput, ctx: RenderContext) -> int:
+    """Render one README into the binary file `fp`; returns the number of bytes written."""
+    written = 0
+    for chunk in stream_profile(profile, ctx):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
+
+def generate_readme(
+    theme: str,
+    user_data: dict,
+    include_stats: bool = True,
+    badge_mode: str = "remote",
+    stats_cards: str = "",
+) -> str:
+    """
+    Read <theme>.txt from TEMPLATES_DIR, fill placeholders, and return the README.
+    `user_data` is not modified; see render_profile() for the supported placeholders.
+    """
+    ctx = RenderContext(theme, include_stats, badge_mode, stats_cards)
+    return render_profile(ProfileInput.from_mapping(user_data), ctx)
@@ -0,0 +1,208 @@
+# html_render.py
+"""
+Server-side Markdown -> HTML for the app preview and the static-site export.
+
+    python src/batch.py people.csv --out site/ --html   # adds <name>/index.html and index.html
+
+Rendered with markdown-it-py: CommonMark with raw HTML, plus GitHub's tables and
+strikethrough. A README is cut into chunks at the blank lines before unindented
+lines, and the parse of each chunk (as the HTML of its tokens) is cached per
+compiled theme: chunks of the theme's own text are parsed once for all
+profiles, and when one profile is edited only the chunks holding changed
+placeholder values are parsed again. A cut only counts where a parse of the
+whole document starts a new top-level block as well: never inside an unclosed
+fence or HTML block, nor before a list item (which may continue the list above).
+Link reference definitions reach across chunks, so documents with one are
+parsed whole. Either way the HTML is the same as from one md.render().
+
+Pages are standalone (inline CSS, relative badges/ paths) and carry a
+Content-Security-Policy that runs no scripts, whatever HTML the fields hold.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+import html
+import re
+import threading
+from typing import Iterable
+from urllib.parse import quote
+
+from markdown_it import MarkdownIt
+
+from .generate_readme import RenderContext, _load_theme, render_profile
+from . import metrics
+from .profile_input import ProfileInput
+
+CHUNKS_PER_THEME = 512   # cached chunk parses per theme (LRU)
+THEMES = 32              # themes with a chunk cache (LRU)
+MAX_MERGES = 8           # chunks an unclosed block may swallow one by one before the rest is parsed whole
+
+# A cut: blank line(s), then a line starting in column 0 that is not a list item
+_CUT_RE = re.compile(r"\n(?:[ \t]*\n)+(?=\S)(?!(?:[*+-]|\d{1,9}[.)])(?:[ \t\n]|$))")
+_NEWLINES_RE = re.compile(r"\r\n?")
+
+PAGE_CSP = "default-src 'none'; img-src * 'self' data:; style-src 'unsafe-inline'"
+
+PAGE_CSS = """
+body { margin: 0; background: #fff; color: #1f2328;
+  font: 16px/1.5 -apple-system, BlinkMacSystemFont, "Segoe UI", "Noto Sans", Helvetica, Arial, sans-serif; }
+.markdown-body { max-width: 880px; margin: 0 auto; padding: 32px; word-wrap: break-word; }
+.markdown-body h1, .markdown-body h2 { padding-bottom: .3em; border-bottom: 1px solid #d1d9e0; }
+.markdown-body h1, .markdown-body h2, .markdown-body h3 { margin: 24px 0 16px; font-weight: 600; line-height: 1.25; }
+.markdown-body img { max-width: 100%; box-sizing: content-box; }
+.markdown-body a { color: #0969da; text-decoration: none; }
+.markdown-body a:hover { text-decoration: underline; }
+.markdown-body hr { height: .25em; margin: 24px 0; border: 0; background: #d1d9e0; }
+.markdown-body code { padding: .2em .4em; border-radius: 6px; background: #eff1f3; font-size: 85%; }
+.markdown-body pre { padding: 16px; overflow: auto; border-radius: 6px; background: #f6f8fa; }
+.markdown-body pre code { padding: 0; background: none; }
+.markdown-body table { border-collapse: collapse; }
+.markdown-body th, .markdown-body td { padding: 6px 13px; border: 1px solid #d1d9e0; }
+.markdown-body blockquote { margin: 0; padding: 0 1em; color: #59636e; border-left: .25em solid #d1d9e0; }
+""".strip()
+
+
+def _markdown() -> MarkdownIt:
+    return MarkdownIt("commonmark", {"html": True}).enable(["table", "strikethrough"])
+
+
+class HtmlRenderer:
+    """
+    Markdown -> HTML with chunk parses cached per theme (see the module docstring).
+    `key` names the cache: the digest of the compiled theme the README came from.
+    Thread-safe; parsing runs outside the lock.
+    """
+
+    def __init__(self, chunks_per_theme: int = CHUNKS_PER_THEME, themes: int = THEMES):
+        self.chunks_per_theme = chunks_per_theme
+        self.themes = themes
+        self._md = _markdown()
+        self._caches: OrderedDict[str, OrderedDict[str, tuple[str, bool, bool]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.whole = 0
+
+    def render(self, markdown: str, key: str = "") -> str:
+        with metrics.span("html.render"):
+            return self._render(_NEWLINES_RE.sub("\n", markdown), key)
+
+    def _render(self, text: str, key: str) -> str:
+        cache = self._cache(key)
+        cuts = [m.end() for m in _CUT_RE.finditer(text)]
+        pieces = [text[i:j] for i, j in zip([0, *cuts], [*cuts, len(text)])]
+        out = []
+        chunk, merged = pieces[0], 0
+        for i in range(1, len(pieces) + 1):
+            body, open_end, refs = self._chunk(cache, chunk)
+            if refs:
+                return self._whole(text)
+            if i == len(pieces):
+                out.append(body)
+            elif not open_end:
+                out.append(body)
+                chunk, merged = pieces[i], 0
+            elif merged < MAX_MERGES:
+                chunk, merged = chunk + pieces[i], merged + 1
+            else:
+                # A block left open this long (e.g. a fence never closed): the rest is one chunk
+                body, _, refs = self._chunk(cache, chunk + "".join(pieces[i:]))
+                if refs:
+                    return self._whole(text)
+                out.append(body)
+                break
+        return "".join(out)
+
+    def _whole(self, text: str) -> str:
+        with self._lock:
+            self.whole += 1
+        return self._md.render(text)
+
+    def _cache(self, key: str) -> OrderedDict:
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is None:
+                cache = self._caches[key] = OrderedDict()
+                while len(self._caches) > self.themes:
+                    self._caches.popitem(last=False)
+            else:
+                self._caches.move_to_end(key)
+            return cache
+
+    def _chunk(self, cache: OrderedDict, text: str) -> tuple[str, bool, bool]:
+        """(HTML, whether the last block is still open at the end, whether it defines link references)."""
+        with self._lock:
+            entry = cache.get(text)
+            if entry is not None:
+                cache.move_to_end(text)
+                self.hits += 1
+                return entry
+        entry = self._parse(text)
+        with self._lock:
+            self.misses += 1
+            cache[text] = entry
+            while len(cache) > self.chunks_per_theme:
+                cache.popitem(last=False)
+        return entry
+
+    def _parse(self, text: str) -> tuple[str, bool, bool]:
+        env: dict = {}
+        tokens = self._md.parse(text, env)
+        # An unclosed fence or <pre>/<!--/... block runs on into the trailing blank lines
+        # (closed blocks end on a non-blank line); the next chunk would continue it.
+        # Lists take the blank lines too, but end anyway: no cut is followed by a list item.
+        open_end = False
+        for token in reversed(tokens):
+            if token.level == 0 and token.nesting >= 0:
+                open_end = (
+                    token.type not in ("bullet_list_open", "ordered_list_open")
+                    and token.map is not None
+                    and token.map[1] > text.rstrip().count("\n") + 1
+                )
+                break
+        return self._md.renderer.render(tokens, self._md.options, env), open_end, bool(env.get("references"))
+
+    def stats(self) -> dict:
+        """Chunk cache counters; `whole` counts documents parsed in one piece (link references)."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "whole": self.whole,
+                "themes": len(self._caches),
+                "chunks": sum(len(c) for c in self._caches.values()),
+            }
+
+
+@lru_cache(maxsize=1)
+def get_renderer() -> HtmlRenderer:
+    """The process-wide renderer."""
+    return HtmlRenderer()
+
+
+# ---------------------------
+# Profiles and pages
+# ---------------------------
+def readme_html(markdown: str, theme: str) -> str:
+    """HTML fragment of a README rendered from `theme`."""
+    return get_renderer().render(markdown, _load_theme(theme).digest)
+
+
+def render_html(profile: ProfileInput, ctx: RenderContext) -> str:
+    return readme_html(render_profile(profile, ctx), ctx.theme)
+
+
+def html_page(body: str, title: str) -> str:
+    """A standalone HTML document around a rendered fragment."""
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<meta http-equiv="Content-Security-Policy" content="{PAGE_CSP}">\n'
+        f"<title>{html.escape(title)}</title>\n<style>\n{PAGE_CSS}\n</style>\n</head>\n"
+        f'<body>\n<article class="markdown-body">\n{body}</article>\n</body>\n</html>\n'
+    )
+
+
+def site_index(entries: Iterable[tuple[str, str]], title: str = "Profiles") -> str:
+    """index.html of a static-site export: one link per (directory, title), in the given order."""
+    items = "".join(
+        f'<li><a href="{quote(name)}/index.html">{html.escape(label or name)}</a></li>\n' for name, label in entries
+    )
+    return html_page(f"<h1>{html.escape(title)}</h1>\n<ul>\n{items}</ul>\n", title)
@@ -0,0 +1,444 @@
+# link_check.py
+"""
+Validate the links of a profile (GitHub, LinkedIn, website, ...) before they ship.
+
+    python src/link_check.py https://github.com/mkazemie https://example.com/gone
+
+A small asyncio HTTP/1.1 client: keep-alive connections are pooled per host,
+at most PER_HOST requests run against one host and MAX_CONNECTIONS in total,
+and each request has a deadline. HEAD is tried first (GET when a server
+refuses it) and redirects are followed. Results are kept in a LinkCache for
+LINK_TTL_S, by URL and, for hosts that cannot be reached at all, by host: in
+a batch each URL and each dead domain is contacted once.
+
+Verdicts: "ok"; "broken" (404/410 and other client errors, unknown host,
+refused connection, bad certificate, malformed or non-GitHub URL); or
+"unverified" (timeouts, server errors, and sites that turn away automated
+requests, e.g. LinkedIn's 999).
+
+With public_only (the app, where the URLs come from visitors), every host,
+redirects included, is resolved first and connected to by address only if all
+of them are public: loopback, private, link-local (cloud metadata) and reserved
+addresses are refused, so the checker cannot be pointed at the server's network.
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+import ipaddress
+import socket
+import ssl
+import sys
+import threading
+import time
+from typing import Iterable
+from urllib.parse import quote, urljoin, urlsplit
+
+from .generate_readme import _github_username_from_url
+from .profile_input import ProfileInput
+
+# Profile fields holding links, in the order results are shown
+LINK_FIELDS = ("github", "linkedin", "website", "youtube", "instagram", "facebook")
+
+PER_HOST = 4             # concurrent requests per host
+MAX_CONNECTIONS = 64     # concurrent requests overall
+TIMEOUT_S = 8.0          # to connect, and again for the response headers
+MAX_REDIRECTS = 5
+HOST_TIMEOUTS = 3        # consecutive connect timeouts before a host counts as down (for this checker)
+LINK_TTL_S = 6 * 3600    # how long a result is reused
+CACHE_ENTRIES = 50_000
+USER_AGENT = "Mozilla/5.0 (compatible; github-profile-generator link check)"
+
+OK = "ok"
+BROKEN = "broken"
+UNVERIFIED = "unverified"
+
+_BLOCKED = (401, 403, 429, 999)   # the site refuses automated requests; says nothing about the link
+_RETRY_WITH_GET = (403, 405, 501)  # servers that mishandle HEAD
+_MAX_HEADERS = 100
+
+
+@dataclass(frozen=True, slots=True)
+class LinkResult:
+    url: str
+    verdict: str            # OK, BROKEN or UNVERIFIED
+    status: int | None = None  # final HTTP status, if a response arrived
+    detail: str = ""        # why it is not OK, or where it redirected
+    final_url: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.verdict == OK
+
+
+class _HostError(Exception):
+    """The host could not be reached at all; remembered for every URL on it (in the shared cache if `lasting`)."""
+
+    def __init__(self, result: LinkResult, lasting: bool = True):
+        super().__init__(result.detail)
+        self.result = result
+        self.lasting = lasting
+
+
+# ---------------------------
+# Cache
+# ---------------------------
+class LinkCache:
+    """Thread-safe TTL cache of results by URL and of unreachable hosts; shared across checkers."""
+
+    def __init__(self, ttl: float = LINK_TTL_S, max_entries: int = CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, str], tuple[float, LinkResult]] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, kind: str, key: str) -> LinkResult | None:
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, kind: str, key: str, result: LinkResult) -> None:
+        with self._lock:
+            self._entries.pop((kind, key), None)
+            self._entries[(kind, key)] = (time.monotonic() + self.ttl, result)
+            while len(self._entries) > self.max_entries:  # oldest first
+                del self._entries[next(iter(self._entries))]
+
+
+# ---------------------------
+# Client
+# ---------------------------
+@dataclass
+class _Conn:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    reused: bool = False
+
+
+class LinkChecker:
+    """
+    Pooled async link checker; use `async with LinkChecker() as checker:` and
+    `await checker.check(url)`. Concurrent checks of the same URL share one request.
+    """
+
+    def __init__(
+        self,
+        cache: LinkCache | None = None,
+        per_host: int = PER_HOST,
+        max_connections: int = MAX_CONNECTIONS,
+        timeout: float = TIMEOUT_S,
+        max_redirects: int = MAX_REDIRECTS,
+        public_only: bool = False,
+    ):
+        self.cache = cache if cache is not None else LinkCache()
+        self.public_only = public_only
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.max_connections = max_connections
+        self._total = asyncio.Semaphore(max_connections)
+        self._hosts: dict[tuple[str, str, int], asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self._idle: dict[tuple[str, str, int], list[_Conn]] = defaultdict(list)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._timeouts: dict[str, int] = defaultdict(int)  # consecutive connect timeouts by origin
+        self._down: dict[str, LinkResult] = {}  # origins given up on by this checker
+        self._ssl = ssl.create_default_context()
+        self.requests = self.connections = 0
+
+    async def __aenter__(self) -> "LinkChecker":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.writer.close()
+        self._idle.clear()
+
+    async def check(self, url: str) -> LinkResult:
+        cached = self.cache.get("url", url)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(url)
+        if task is None:
+            task = self._inflight[url] = asyncio.ensure_future(self._check(url))
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def check_many(self, urls: Iterable[str]) -> dict[str, LinkResult]:
+        urls = list(dict.fromkeys(urls))
+        return dict(zip(urls, await self.map(self.check, urls)))
+
+    async def map(self, fn, items: list) -> list:
+        """
+        [await fn(item) for item in items], a bounded number at a time: a task per
+        item for a whole batch would keep the loop too busy to meet connect deadlines.
+        """
+        results = [None] * len(items)
+        todo = iter(enumerate(items))
+
+        async def worker() -> None:
+            for i, item in todo:  # shared iterator: each item is taken by one worker
+                results[i] = await fn(item)
+
+        await asyncio.gather(*(worker() for _ in range(min(len(items), 2 * self.max_connections))))
+        return results
+
+    async def _check(self, url: str) -> LinkResult:
+        result = syntax_error(url)
+        if result is None:
+            result = await self._follow(url)
+        self.cache.put("url", url, result)
+        return result
+
+    async def _follow(self, url: str) -> LinkResult:
+        current = url
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(current)
+            if not parts.hostname:
+                return LinkResult(url, BROKEN, detail=f"no host name in {current}")
+            try:
+                host = parts.hostname.encode("idna").decode("ascii")
+                port = parts.port or (443 if parts.scheme == "https" else 80)
+            except (UnicodeError, ValueError) as e:
+                return LinkResult(url, BROKEN, detail=f"invalid host ({e})")
+            key = (parts.scheme, host, port)
+            origin = f"{parts.scheme}://{host}:{port}"
+            down = self._down.get(origin) or self.cache.get("host", origin)
+            if down is not None:
+                return LinkResult(url, down.verdict, detail=down.detail)
+            target = request_target(current)
+            try:
+                status, headers = await self._request("HEAD", key, target)
+                if status in _RETRY_WITH_GET:
+                    status, headers = await self._request("GET", key, target)
+            except _HostError as e:
+                if e.lasting:
+                    self.cache.put("host", origin, e.result)
+                else:
+                    self._timeouts[origin] += 1
+                    if self._timeouts[origin] >= HOST_TIMEOUTS:
+                        self._down[origin] = e.result
+                return LinkResult(url, e.result.verdict, detail=e.result.detail)
+            except TimeoutError:
+                return LinkResult(url, UNVERIFIED, detail=f"no response within {self.timeout:g}s")
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                return LinkResult(url, UNVERIFIED, detail=f"request failed ({type(e).__name__}: {e})")
+            location = headers.get("location")
+            if 300 <= status < 400 and location:
+                nxt = urljoin(current, location)
+                if urlsplit(nxt).scheme not in ("http", "https"):
+                    return LinkResult(url, OK, status, detail=f"redirects to {nxt}", final_url=nxt)
+                current = nxt
+                continue
+            final = current if current != url else ""
+            if status < 400:
+                return LinkResult(url, OK, status, detail=f"redirects to {final}" if final else "", final_url=final)
+            if status in _BLOCKED or status >= 500:
+                return LinkResult(url, UNVERIFIED, status, detail=f"HTTP {status}", final_url=final)
+            return LinkResult(url, BROKEN, status, detail=f"HTTP {status}", final_url=final)
+        return LinkResult(url, UNVERIFIED, detail=f"more than {self.max_redirects} redirects", final_url=current)
+
+    async def _request(self, method: str, key: tuple[str, str, int], target: str) -> tuple[int, dict[str, str]]:
+        """Send one request; returns (status, lower-cased headers). The body is never read."""
+        scheme, host, port = key
+        default_port = 443 if scheme == "https" else 80
+        head = (
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host if port == default_port else f'{host}:{port}'}\r\n"
+            f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\nConnection: keep-alive\r\n\r\n"
+        ).encode("ascii")
+        async with self._hosts[key], self._total:
+            conn = await self._acquire(key)
+            try:
+                try:
+                    status, headers, reusable = await self._exchange(conn, head)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not conn.reused:
+                        raise
+                    # The server dropped a pooled connection while it sat idle: once more on a new one
+                    conn.writer.close()
+                    conn = await self._acquire(key, fresh=True)
+                    status, headers, reusable = await self._exchange(conn, head)
+            except BaseException:
+                conn.writer.close()
+                raise
+            if reusable and method == "HEAD":
+                conn.reused = True
+                self._idle[key].append(conn)
+            else:
+                conn.writer.close()
+            return status, headers
+
+    async def _acquire(self, key: tuple[str, str, int], fresh: bool = False) -> _Conn:
+        idle = self._idle[key]
+        while idle and not fresh:
+            conn = idle.pop()
+            if not conn.writer.is_closing() and not conn.reader.at_eof():
+                return conn
+            conn.writer.close()
+        scheme, host, port = key
+        try:
+            async with asyncio.timeout(self.timeout):
+                addresses = await self._public_addresses(host, port) if self.public_only else [host]
+                for i, address in enumerate(addresses):
+                    try:
+                        reader, writer = await asyncio.open_connection(
+                            address, port, ssl=self._ssl if scheme == "https" else None,
+                            server_hostname=host if scheme == "https" else None,
+                        )
+                        break
+                    except OSError:
+                        if i == len(addresses) - 1:
+                            raise
+        except TimeoutError:
+            detail = f"no connection to {host} within {self.timeout:g}s"
+            raise _HostError(LinkResult("", UNVERIFIED, detail=detail), lasting=False) from None
+        except socket.gaierror:
+            raise _HostError(LinkResult("", BROKEN, detail=f"unknown host {host}")) from None
+        except ConnectionRefusedError:
+            raise _HostError(LinkResult("", BROKEN, detail=f"connection refused by {host}:{port}")) from None
+        except ssl.SSLCertVerificationError as e:
+            raise _HostError(LinkResult("", BROKEN, detail=f"bad TLS certificate ({e.verify_message})")) from None
+        self.connections += 1
+        self._timeouts.pop(f"{scheme}://{host}:{port}", None)
+        return _Conn(reader, writer)
+
+    async def _public_addresses(self, host: str, port: int) -> list[str]:
+        """The addresses of `host`, to connect to instead of its name (no second lookup to rebind)."""
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not addresses or not all(map(_is_public, addresses)):
+            raise _HostError(LinkResult("", BROKEN, detail=f"{host} is not a public address"))
+        return addresses
+
+    async def _exchange(self, conn: _Conn, head: bytes) -> tuple[int, dict[str, str], bool]:
+        self.requests += 1
+        async with asyncio.timeout(self.timeout):
+            conn.writer.write(head)
+            await conn.writer.drain()
+            line = await conn.reader.readline()
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            version, _, rest = line.decode("latin-1").partition(" ")
+            status = int(rest[:3])
+            headers = {}
+            for _ in range(_MAX_HEADERS):
+                line = await conn.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                raise ValueError("too many response headers")
+        reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        return status, headers, reusable
+
+
+def request_target(url: str) -> str:
+    """The path and query of `url` as sent on the request line: ASCII, with spaces and non-ASCII percent-encoded."""
+    parts = urlsplit(url)
+    target = quote(parts.path or "/", safe="/%:@!$&'()*+,;=-._~")
+    if parts.query:
+        target += "?" + quote(parts.query, safe="=&+%/:;,@!$'()*~?")
+    return target
+
+
+def _is_public(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def syntax_error(url: str) -> LinkResult | None:
+    """The result for a URL that cannot be requested as written, else None."""
+    parts = urlsplit(url)
+    if not parts.scheme:
+        return LinkResult(url, BROKEN, detail="missing http:// or https://")
+    if parts.scheme not in ("http", "https"):
+        return LinkResult(url, BROKEN, detail=f"not a web link ({parts.scheme}:)")
+    if not parts.hostname:
+        return LinkResult(url, BROKEN, detail="no host name")
+    return None
+
+
+# ---------------------------
+# Profiles
+# ---------------------------
+def profile_links(profile: ProfileInput) -> list[tuple[str, str]]:
+    """(field, url) for every link the profile sets."""
+    return [(name, getattr(profile, name)) for name in LINK_FIELDS if getattr(profile, name)]
+
+
+def static_check(field: str, url: str) -> LinkResult | None:
+    """Problems found without a request: malformed URLs, and GitHub links with no username in them."""
+    result = syntax_error(url)
+    if result is None and field == "github" and not _github_username_from_url(url):
+        result = LinkResult(url, BROKEN, detail="not a GitHub profile URL (expected https://github.com/<username>)")
+    return result
+
+
+async def check_links(links: list[tuple[str, str]], checker: LinkChecker) -> dict[str, LinkResult]:
+    """Result per field for (field, url) pairs, e.g. profile_links()."""
+    results = {}
+    for name, url in links:
+        results[name] = static_check(name, url) or await checker.check(url)
+    return results
+
+
+async def check_profile(profile: ProfileInput, checker: LinkChecker) -> dict[str, LinkResult]:
+    return await check_links(profile_links(profile), checker)
+
+
+def check_link_lists(
+    link_lists: list[list[tuple[str, str]]], cache: LinkCache | None = None, **options
+) -> list[dict[str, LinkResult]]:
+    """check_links() for many profiles from synchronous code, e.g. a batch; `options` go to LinkChecker."""
+
+    async def run() -> list[dict[str, LinkResult]]:
+        async with LinkChecker(cache, **options) as checker:
+            return await checker.map(lambda links: check_links(links, checker), link_lists)
+
+    return asyncio.run(run())
+
+
+def check_urls(urls: Iterable[str], cache: LinkCache | None = None, **options) -> dict[str, LinkResult]:
+    """checker.check_many() from synchronous code."""
+
+    async def run() -> dict[str, LinkResult]:
+        async with LinkChecker(cache, **options) as checker:
+            return await checker.check_many(urls)
+
+    return asyncio.run(run())
+
+
+def check_profile_links(profile: ProfileInput, cache: LinkCache | None = None, **options) -> dict[str, LinkResult]:
+    """check_profile() from synchronous code, e.g. the Streamlit app."""
+    return check_link_lists([profile_links(profile)], cache, **options)[0]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Check that links resolve.")
+    ap.add_argument("urls", nargs="+")
+    ap.add_argument("--timeout", type=float, default=TIMEOUT_S)
+    args = ap.parse_args(argv)
+    results = check_urls(args.urls, timeout=args.timeout)
+    for url, result in results.items():
+        status = result.status if result.status is not None else "-"
+        print(f"{result.verdict:10s} {status!s:>4} {url}  {result.detail}")
+    return 0 if all(r.verdict != BROKEN for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# live_preview.py
+from dataclasses import fields
+import time
+
+from .badge_svg import Asset, recording_assets
+from .generate_readme import (
+    RenderContext,
+    _github_username_from_url,
+    _make_skills_block,
+    _placeholder_lookup,
+    _tech_stack_block,
+    _template_scope,
+)
+from . import metrics
+from .profile_input import ALIASES, ProfileInput
+from .template_lang import Scope
+from .templates import HANDLE, LITERAL, LOGIC, SLOT, STATS, CompiledTemplate
+
+# Derived placeholders and the ProfileInput fields they are computed from
+DERIVED_SLOTS = {
+    "github_username": ("github_username", "github"),
+    "skills_block": ("skills",),
+    "tech_stack_block": ("tech_stack", "tech_stack_use_logos"),
+    **{alias: (name,) for alias, name in ALIASES.items()},
+}
+
+
+def changed_fields(old: ProfileInput, new: ProfileInput) -> set[str]:
+    changed = {f.name for f in fields(ProfileInput) if getattr(old, f.name) != getattr(new, f.name)}
+    if "extra" in changed:
+        old_extra, new_extra = dict(old.extra), dict(new.extra)
+        changed |= {k for k in old_extra.keys() | new_extra.keys() if old_extra.get(k) != new_extra.get(k)}
+    return changed
+
+
+def affected_slots(changed: set[str]) -> set[str]:
+    slots = set(changed)
+    for slot, deps in DERIVED_SLOTS.items():
+        if changed.intersection(deps):
+            slots.add(slot)
+    return slots
+
+
+class LivePreview:
+    """
+    Keeps the last render as one output chunk per template segment and, when the
+    input changes, recomputes only the placeholders (and blocks) that depend on the
+    changed fields and splices them in at their segment offsets.
+    Callers debounce with pending()/wait_s(): wait out the rest of the interval
+    since the last render before calling update().
+    """
+
+    def __init__(self, debounce: float = 0.5):
+        self.debounce = debounce
+        self.output = ""
+        self.last_render_s = 0.0
+        self._template: CompiledTemplate | None = None
+        self._ctx: RenderContext | None = None
+        self._profile: ProfileInput | None = None
+        self._values: dict[str, str] = {}
+        self._segments: tuple = ()
+        self._parts: list[str] = []                 # output chunk per segment
+        self._offsets: dict[str, list[int]] = {}    # placeholder / block variable -> indexes into _parts
+        self._scope: Scope | None = None            # for {% %} blocks
+        self._handle_offsets: list[int] = []        # stats handles follow github_username
+        self._block_assets: tuple[Asset, ...] = ()  # of the tech_stack_block value
+        self._logic_assets: dict[int, tuple[Asset, ...]] = {}  # segment -> local SVGs it draws
+        self._rendered_at = float("-inf")
+
+    def pending(self, template: CompiledTemplate, profile: ProfileInput, ctx: RenderContext) -> bool:
+        return template is not self._template or profile != self._profile or ctx != self._ctx
+
+    @property
+    def assets(self) -> tuple[Asset, ...]:
+        """The local SVGs `output` references (see badge_svg.Asset)."""
+        assets = list(self._block_assets) if "tech_stack_block" in self._offsets else []
+        for segment_assets in self._logic_assets.values():
+            assets.extend(segment_assets)
+        if self._ctx is not None and any(kind == STATS for kind, _, _ in self._segments):
+            assets.extend(self._ctx.stats_assets)
+        return tuple(dict.fromkeys(assets))
+
+    def wait_s(self) -> float:
+        """Seconds left before the next update is due."""
+        return max(0.0, self.debounce - (time.monotonic() - self._rendered_at))
+
+    def update(self, template: CompiledTemplate, profile: ProfileInput, ctx: RenderContext) -> str:
+        with metrics.span("live_preview.update"):
+            return self._update(template, profile, ctx)
+
+    def _update(self, template: CompiledTemplate, profile: ProfileInput, ctx: RenderContext) -> str:
+        t0 = time.perf_counter()
+        if template is not self._template or ctx != self._ctx or self._profile is None:
+            self._full_render(template, profile, ctx)
+        else:
+            slots = affected_slots(changed_fields(self._profile, profile))
+            self._profile = profile
+            self._refresh_values(slots)
+            lookup = _placeholder_lookup(self._values)
+            positions = set()
+            for key in slots:
+                positions.update(self._offsets.get(key, ()))
+                if key == "github_username":
+                    positions.update(self._handle_offsets)
+            for i in positions:
+                self._parts[i] = self._segment_output(i, lookup)
+            self.output = "".join(self._parts)
+        self._rendered_at = time.monotonic()
+        self.last_render_s = time.perf_counter() - t0
+        return self.output
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+    def _full_render(self, template: CompiledTemplate, profile: ProfileInput, ctx: RenderContext) -> None:
+        self._template, self._ctx, self._profile = template, ctx, profile
+        self._values = {}
+        self._refresh_values(None)
+        self._segments = template.select(ctx.include_stats, bool(ctx.stats_cards))
+        self._offsets, self._handle_offsets, self._logic_assets = {}, [], {}
+        lookup = _placeholder_lookup(self._values)
+        self._parts = []
+        for i, (kind, text, _) in enumerate(self._segments):
+            if kind == SLOT:
+                self._offsets.setdefault(text, []).append(i)
+            elif kind == HANDLE:
+                self._handle_offsets.append(i)
+            elif kind == LOGIC:
+                block = template.block(text)
+                deps = block.names + (("tech_stack_use_logos",) if "badge" in block.filters else ())
+                for name in deps:
+                    self._offsets.setdefault(name, []).append(i)
+            self._parts.append(self._segment_output(i, lookup))
+        self.output = "".join(self._parts)
+
+    def _segment_output(self, i: int, lookup) -> str:
+        kind, text, _ = self._segments[i]
+        if kind == LITERAL:
+            return text
+        if kind == SLOT:
+            return lookup(text)
+        if kind == STATS:
+            return self._ctx.stats_cards
+        if kind == LOGIC:
+            with recording_assets() as assets:  # badges drawn by a | badge filter
+                out = self._template.block(text).fn(*self._scope)
+            self._logic_assets[i] = tuple(assets)
+            return out
+        return self._values["github_username"] or text
+
+    def _refresh_values(self, slots: set[str] | None) -> None:
+        """Recompute placeholder values; all of them when `slots` is None."""
+        p = self._profile
+        if slots is None:
+            self._values = p.text_values()
+            slots = set(DERIVED_SLOTS)
+        else:
+            extra = dict(p.extra)
+            for key in slots:
+                if key not in DERIVED_SLOTS:
+                    value = getattr(p, key, None) if key in ProfileInput.__dataclass_fields__ else extra.get(key)
+                    self._values[key] = value if isinstance(value, str) else ""
+        for alias, name in ALIASES.items():
+            if alias in slots:
+                self._values[alias] = dict(p.extra).get(alias, getattr(p, name))
+        if "github_username" in slots:
+            self._values["github_username"] = p.github_username or _github_username_from_url(p.github) or ""
+        if "skills_block" in slots:
+            self._values["skills_block"] = _make_skills_block(p.skills)
+        if "tech_stack_block" in slots:
+            self._values["tech_stack_block"], self._block_assets = _tech_stack_block(
+                p.tech_stack, p.tech_stack_use_logos, self._ctx.badge_mode
+            )
+        if self._template.has_logic:
+            self._scope = _template_scope(p, self._values, self._ctx)
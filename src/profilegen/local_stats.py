@@ -0,0 +1,421 @@
+# local_stats.py
+"""
+Self-hosted replacement for the github-readme-stats / streak-stats widgets.
+
+    python src/local_stats.py ~/code --author me@example.com --out-dir stats/
+
+Finds the git clones under the given directories, scans them on a process pool
+(bytes per language from the tracked files, classified by extension/file name
+like linguist does, plus commit dates from `git log` for streaks) and renders a
+top-languages and a streak card as static SVGs. Per-repo results are cached in
+sqlite keyed by the repo's HEAD commit, so a re-run only rescans repos that moved.
+stats_cards() returns the HTML that replaces a theme's stats region
+(RenderContext.stats_cards) and the two SVGs as Assets (RenderContext.stats_assets).
+The Assets carry the SVGs: unlike badges they cannot be redrawn from the README,
+so they are not put in the evicting badge store.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+import html
+import json
+import os
+from pathlib import Path
+import sqlite3
+import subprocess
+import sys
+from typing import Iterable, Iterator
+
+from .badge_svg import Asset, svg_asset
+from . import metrics
+
+# (language, color, extensions / file names); colors follow GitHub's linguist
+_LANGUAGES = (
+    ("Python", "#3572A5", (".py", ".pyi", ".pyx")),
+    ("Jupyter Notebook", "#DA5B0B", (".ipynb",)),
+    ("JavaScript", "#f1e05a", (".js", ".mjs", ".cjs", ".jsx")),
+    ("TypeScript", "#3178c6", (".ts", ".tsx", ".mts", ".cts")),
+    ("C", "#555555", (".c", ".h")),
+    ("C++", "#f34b7d", (".cpp", ".cc", ".cxx", ".hpp", ".hh", ".hxx", ".ino")),
+    ("C#", "#178600", (".cs",)),
+    ("Cuda", "#3A4E3A", (".cu", ".cuh")),
+    ("Java", "#b07219", (".java",)),
+    ("Kotlin", "#A97BFF", (".kt", ".kts")),
+    ("Scala", "#c22d40", (".scala",)),
+    ("Go", "#00ADD8", (".go",)),
+    ("Rust", "#dea584", (".rs",)),
+    ("Zig", "#ec915c", (".zig",)),
+    ("Ruby", "#701516", (".rb",)),
+    ("PHP", "#4F5D95", (".php",)),
+    ("Perl", "#0298c3", (".pl", ".pm")),
+    ("Swift", "#F05138", (".swift",)),
+    ("Objective-C", "#438eff", (".m", ".mm")),
+    ("Dart", "#00B4AB", (".dart",)),
+    ("Lua", "#000080", (".lua",)),
+    ("R", "#198CE7", (".r",)),
+    ("Julia", "#a270ba", (".jl",)),
+    ("Haskell", "#5e5086", (".hs",)),
+    ("OCaml", "#ef7a08", (".ml", ".mli")),
+    ("Elixir", "#6e4a7e", (".ex", ".exs")),
+    ("Erlang", "#B83998", (".erl",)),
+    ("Clojure", "#db5855", (".clj", ".cljs")),
+    ("Fortran", "#4d41b1", (".f90", ".f95", ".f03")),
+    ("Assembly", "#6E4C13", (".asm", ".s")),
+    ("GLSL", "#5686a5", (".glsl", ".vert", ".frag")),
+    ("Shell", "#89e051", (".sh", ".bash", ".zsh")),
+    ("PowerShell", "#012456", (".ps1",)),
+    ("HTML", "#e34c26", (".html", ".htm")),
+    ("CSS", "#563d7c", (".css",)),
+    ("SCSS", "#c6538c", (".scss",)),
+    ("Vue", "#41b883", (".vue",)),
+    ("Svelte", "#ff3e00", (".svelte",)),
+    ("TeX", "#3D6117", (".tex",)),
+    ("HCL", "#844FBA", (".tf",)),
+    ("Nix", "#7e7eff", (".nix",)),
+    ("Solidity", "#AA6746", (".sol",)),
+    ("CMake", "#DA3434", (".cmake", "CMakeLists.txt")),
+    ("Makefile", "#427819", (".mk", "Makefile", "GNUmakefile")),
+    ("Dockerfile", "#384d54", ("Dockerfile",)),
+)
+LANGUAGE_COLORS = {name: color for name, color, _ in _LANGUAGES}
+_BY_EXTENSION = {ext: name for name, _, exts in _LANGUAGES for ext in exts if ext.startswith(".")}
+_BY_FILENAME = {ext: name for name, _, exts in _LANGUAGES for ext in exts if not ext.startswith(".")}
+
+# Path parts that are vendored or generated code, not the user's own (as linguist excludes them)
+_EXCLUDED_DIRS = {"node_modules", "vendor", "third_party", "third-party", "external", "dist", "build",
+                  "site-packages", ".venv", "venv", "__pycache__", ".git"}
+_EXCLUDED_SUFFIXES = (".min.js", ".min.css", ".bundle.js", ".pb.go", "_pb2.py")
+
+DEFAULT_CACHE = Path.home() / ".cache" / "github-profile-generator" / "repo-stats.sqlite"
+
+
+def classify(rel_path: str) -> str | None:
+    """Language of a repo-relative path, or None for data, docs, vendored or generated files."""
+    parts = rel_path.split("/")
+    name = parts[-1]
+    if _EXCLUDED_DIRS.intersection(parts[:-1]) or name.lower().endswith(_EXCLUDED_SUFFIXES):
+        return None
+    if name in _BY_FILENAME:
+        return _BY_FILENAME[name]
+    if name.startswith("Dockerfile."):
+        return "Dockerfile"
+    _, dot, ext = name.rpartition(".")
+    return _BY_EXTENSION.get("." + ext.lower()) if dot else None
+
+
+# ---------------------------
+# Scanning one repo (runs in worker processes)
+# ---------------------------
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, encoding="utf-8", check=True
+    ).stdout
+
+
+def repo_head(repo: Path) -> str | None:
+    """HEAD commit of a clone, or None if it has no commits or is not a repo."""
+    try:
+        return _git(repo, "rev-parse", "--verify", "-q", "HEAD").strip() or None
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+def scan_repo(repo: Path, authors: tuple[str, ...] = ()) -> dict:
+    """{"languages": {language: bytes}, "days": {iso date: commits}} for the checked-out tree and HEAD history."""
+    languages: dict[str, int] = {}
+    has_cpp = False
+    headers = 0
+    for rel in _git(repo, "ls-files", "-z").split("\0"):
+        language = classify(rel) if rel else None
+        if language is None:
+            continue
+        try:
+            st = os.lstat(repo / rel)
+        except OSError:  # deleted in the working tree
+            continue
+        if rel.endswith(".h"):
+            headers += st.st_size
+            continue
+        has_cpp |= language == "C++"
+        languages[language] = languages.get(language, 0) + st.st_size
+    if headers:  # .h is C++ in a repo with C++ sources, else C
+        key = "C++" if has_cpp else "C"
+        languages[key] = languages.get(key, 0) + headers
+
+    author_args = [f"--author={a}" for a in authors]
+    if author_args:
+        author_args += ["--fixed-strings", "--regexp-ignore-case"]
+    days: dict[str, int] = {}
+    for day in _git(repo, "log", "--format=%ad", "--date=short", *author_args).split():
+        days[day] = days.get(day, 0) + 1
+    return {"languages": languages, "days": days}
+
+
+def find_repos(roots: Iterable[Path]) -> Iterator[Path]:
+    """Git working copies at or below each root (not descending into a repo once found)."""
+    for root in roots:
+        root = Path(root).expanduser()
+        if (root / ".git").exists():
+            yield root
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            if ".git" in dirnames or ".git" in filenames:
+                dirnames[:] = []
+                yield Path(dirpath)
+            else:
+                dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in _EXCLUDED_DIRS]
+
+
+# ---------------------------
+# Per-repo cache
+# ---------------------------
+class RepoStatsCache:
+    """sqlite cache of scan_repo() results keyed by (repo, HEAD, authors); errors count as misses."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS repo_stats (repo TEXT NOT NULL, authors TEXT NOT NULL, "
+            "head TEXT NOT NULL, result TEXT NOT NULL, PRIMARY KEY (repo, authors))"
+        )
+        self._conn.commit()
+
+    def get(self, repo: Path, authors: tuple[str, ...], head: str) -> dict | None:
+        try:
+            row = self._conn.execute(
+                "SELECT result FROM repo_stats WHERE repo = ? AND authors = ? AND head = ?",
+                (str(repo), json.dumps(authors), head),
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, repo: Path, authors: tuple[str, ...], head: str, result: dict) -> None:
+        # One row per (repo, authors): a new HEAD replaces the stale result
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repo_stats (repo, authors, head, result) VALUES (?, ?, ?, ?)",
+                (str(repo), json.dumps(authors), head, json.dumps(result)),
+            )
+            self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ---------------------------
+# Aggregation
+# ---------------------------
+@dataclass(frozen=True)
+class UserStats:
+    languages: tuple[tuple[str, int], ...]  # (language, bytes), largest first
+    days: tuple[tuple[str, int], ...]       # (iso date, commits), oldest first
+    repos: int
+    scanned: int                            # repos rescanned (cache misses) to produce this
+
+    @property
+    def commits(self) -> int:
+        return sum(n for _, n in self.days)
+
+    def top_languages(self, n: int = 6) -> list[tuple[str, float]]:
+        """(language, share of bytes) for the n largest languages."""
+        total = sum(b for _, b in self.languages)
+        return [(lang, b / total) for lang, b in self.languages[:n]] if total else []
+
+    def streaks(self, today: date | None = None) -> dict:
+        """Current and longest run of consecutive days with commits, with their date ranges."""
+        today = today or date.today()
+        current = longest = (0, None, None)
+        run, start, prev = 0, None, None
+        for iso, _ in self.days:
+            day = date.fromisoformat(iso)
+            if day > today:
+                break
+            if prev is not None and day - prev == timedelta(days=1):
+                run += 1
+            else:
+                run, start = 1, day
+            if run > longest[0]:
+                longest = (run, start, day)
+            prev = day
+        if prev is not None and (today - prev).days <= 1:  # a streak survives until today's commits are due
+            current = (run, start, prev)
+        return {
+            "current": current[0], "current_range": current[1:],
+            "longest": longest[0], "longest_range": longest[1:],
+            "first_day": date.fromisoformat(self.days[0][0]) if self.days else None,
+        }
+
+
+def collect_stats(
+    roots: Iterable[Path],
+    authors: Iterable[str] = (),
+    cache_path: Path | None = DEFAULT_CACHE,
+    workers: int | None = None,
+) -> UserStats:
+    """Scan every clone under `roots` (only repos whose HEAD moved since the cached result)."""
+    authors = tuple(sorted({a.strip().lower() for a in authors if a.strip()}))  # matched case-insensitively
+    with metrics.span("stats.find_repos"):
+        repos = sorted({p.resolve() for p in find_repos(roots)})
+    with metrics.span("stats.heads"), ThreadPoolExecutor(max_workers=min(16, len(repos) or 1)) as pool:
+        heads = dict(zip(repos, pool.map(repo_head, repos)))
+    repos = [r for r in repos if heads[r]]
+
+    cache = RepoStatsCache(cache_path) if cache_path else None
+    results, stale = {}, []
+    for repo in repos:
+        cached = cache.get(repo, authors, heads[repo]) if cache else None
+        if cached is None:
+            stale.append(repo)
+        else:
+            results[repo] = cached
+    metrics.count("stats.repo_cache_hit", len(repos) - len(stale))
+    metrics.count("stats.repo_rescanned", len(stale))
+    try:
+        if len(stale) > 1:
+            with metrics.span("stats.scan"), ProcessPoolExecutor(max_workers=workers) as pool:
+                scanned = list(pool.map(scan_repo, stale, [authors] * len(stale)))
+        else:
+            with metrics.span("stats.scan"):
+                scanned = [scan_repo(repo, authors) for repo in stale]
+        for repo, result in zip(stale, scanned):
+            results[repo] = result
+            if cache:
+                cache.put(repo, authors, heads[repo], result)
+    finally:
+        if cache:
+            cache.close()
+
+    languages: dict[str, int] = {}
+    days: dict[str, int] = {}
+    for result in results.values():
+        for lang, size in result["languages"].items():
+            languages[lang] = languages.get(lang, 0) + size
+        for day, n in result["days"].items():
+            days[day] = days.get(day, 0) + n
+    return UserStats(
+        languages=tuple(sorted(languages.items(), key=lambda kv: (-kv[1], kv[0]))),
+        days=tuple(sorted(days.items())),
+        repos=len(repos),
+        scanned=len(stale),
+    )
+
+
+# ---------------------------
+# Cards
+# ---------------------------
+_CARD_STYLE = (
+    "<style>text{font-family:'Segoe UI',Ubuntu,Sans-Serif;fill:#434d58}"
+    ".title{font-size:18px;font-weight:600;fill:#2f80ed}.value{font-size:28px;font-weight:700}"
+    ".label{font-size:14px}.lang{font-size:12px}.muted{font-size:12px;fill:#9e9e9e}</style>"
+)
+
+
+def _card(width: int, height: int, title: str, body: str) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" role="img" aria-label="{html.escape(title, quote=False)}">'
+        f"<title>{html.escape(title, quote=False)}</title>{_CARD_STYLE}"
+        f'<rect x="0.5" y="0.5" rx="4.5" width="{width - 1}" height="{height - 1}" fill="#fffefe" stroke="#e4e2e2"/>'
+        f"{body}</svg>"
+    )
+
+
+def top_languages_svg(stats: UserStats, n: int = 6) -> str:
+    langs = stats.top_languages(n)
+    rows = (len(langs) + 1) // 2
+    width, height = 300, 95 + rows * 25 if langs else 110
+    parts = ['<text x="25" y="35" class="title">Most Used Languages</text>']
+    if not langs:
+        parts.append('<text x="25" y="75" class="muted">No code found</text>')
+        return _card(width, height, "Most Used Languages", "".join(parts))
+
+    parts.append('<mask id="bar"><rect x="25" y="55" width="250" height="8" rx="5" fill="#fff"/></mask>')
+    x, shown = 25.0, sum(share for _, share in langs)
+    for lang, share in langs:
+        w = 250 * share / shown
+        parts.append(f'<rect mask="url(#bar)" x="{x:.2f}" y="55" width="{w:.2f}" height="8" '
+                     f'fill="{LANGUAGE_COLORS.get(lang, "#858585")}"/>')
+        x += w
+    for i, (lang, share) in enumerate(langs):
+        cx, cy = 25 + (i % 2) * 135, 90 + (i // 2) * 25
+        parts.append(f'<circle cx="{cx + 5}" cy="{cy - 4}" r="5" fill="{LANGUAGE_COLORS.get(lang, "#858585")}"/>')
+        parts.append(f'<text x="{cx + 15}" y="{cy}" class="lang">{html.escape(lang, quote=False)} {share * 100:.1f}%</text>')
+    return _card(width, height, "Most Used Languages", "".join(parts))
+
+
+def _day(d: date) -> str:
+    return f"{d:%b} {d.day}, {d.year}"
+
+
+def _range(start: date | None, end: date | None) -> str:
+    if start is None:
+        return ""
+    return _day(start) if start == end else f"{_day(start)} - {_day(end)}"
+
+
+def streak_svg(stats: UserStats, today: date | None = None) -> str:
+    today = today or date.today()
+    s = stats.streaks(today)
+    columns = (
+        (str(stats.commits), "Total Contributions", _range(s["first_day"], today)),
+        (str(s["current"]), "Current Streak", _range(*s["current_range"])),
+        (str(s["longest"]), "Longest Streak", _range(*s["longest_range"])),
+    )
+    parts = ['<line x1="165" y1="28" x2="165" y2="170" stroke="#e4e2e2"/>',
+             '<line x1="330" y1="28" x2="330" y2="170" stroke="#e4e2e2"/>']
+    for i, (value, label, dates) in enumerate(columns):
+        cx = 82.5 + i * 165
+        parts.append(f'<text x="{cx}" y="80" text-anchor="middle" class="value">{value}</text>')
+        parts.append(f'<text x="{cx}" y="120" text-anchor="middle" class="label">{label}</text>')
+        parts.append(f'<text x="{cx}" y="145" text-anchor="middle" class="muted">{html.escape(dates, quote=False)}</text>')
+    return _card(495, 195, "Contribution streak", "".join(parts))
+
+
+def stats_cards(stats: UserStats, today: date | None = None) -> tuple[str, tuple[Asset, Asset]]:
+    """(HTML, Assets) for a theme's stats region, laid out like the default theme's widgets."""
+    langs = svg_asset(top_languages_svg(stats))
+    streak = svg_asset(streak_svg(stats, today))
+    cards = (
+        "<div>\n"
+        f'  <img width="45%" align="left" src="{langs.member}" alt="Top languages" />\n'
+        f'  <img width="50%" src="{streak.member}" alt="Contribution streak" />\n'
+        "</div>"
+    )
+    return cards, (langs, streak)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Compute GitHub-style stats cards from local clones.")
+    ap.add_argument("roots", nargs="+", type=Path, help="Clones, or directories containing clones")
+    ap.add_argument("--author", action="append", default=[], help="Count only commits by this name/email (repeatable)")
+    ap.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help=f"Per-repo cache (default: {DEFAULT_CACHE})")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out-dir", type=Path, default=None, help="Write top-langs.svg and streak.svg here")
+    args = ap.parse_args(argv)
+
+    stats = collect_stats(args.roots, args.author, None if args.no_cache else args.cache, args.workers)
+    if args.out_dir:
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+        (args.out_dir / "top-langs.svg").write_text(top_languages_svg(stats), encoding="utf-8")
+        (args.out_dir / "streak.svg").write_text(streak_svg(stats), encoding="utf-8")
+    streaks = stats.streaks()
+    print(json.dumps({
+        "repos": stats.repos,
+        "rescanned": stats.scanned,
+        "commits": stats.commits,
+        "current_streak": streaks["current"],
+        "longest_streak": streaks["longest"],
+        "top_languages": {lang: round(share * 100, 1) for lang, share in stats.top_languages()},
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
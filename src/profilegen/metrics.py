@@ -0,0 +1,300 @@
+# metrics.py
+"""
+Stage timings and counters for the generation pipeline.
+
+    with metrics.span("batch.write"):
+        ...
+    laps = metrics.laps()          # hot paths: consecutive stages, no `with` overhead
+    ...
+    if laps:
+        laps.mark("template.fill")
+    metrics.count("render_cache.miss")
+
+Off by default: span() then hands back one shared no-op context manager, laps()
+returns None and count() returns immediately, so instrumented code pays a flag
+check and nothing else. Turn on with PROFILEGEN_METRICS=1 or enable(). Timings
+aggregate per stage into fixed-bucket histograms; export with snapshot(),
+to_json() or to_prometheus(). Worker processes ship theirs back with drain() /
+merge(). `with metrics.recording(Registry()):` measures just the code in the
+block (this thread / task), e.g. one app session, without turning on the rest.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import threading
+import time
+from typing import Iterator
+
+# Histogram upper bounds in seconds (the last bucket is +Inf)
+BUCKETS = (
+    5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def raw(self) -> list:
+        return [list(self.counts), self.count, self.sum, self.max]
+
+    def merge_raw(self, raw: list) -> None:
+        counts, count, total, peak = raw
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.count += count
+        self.sum += total
+        self.max = max(self.max, peak)
+
+
+class Registry:
+    """Histograms and counters by name; the module functions record into the process-wide one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, Histogram] = {}
+        self._counters: dict[str, int] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """{"stages": {stage: summary}, "counters": {name: value}}; times in seconds."""
+        with self._lock:
+            stages = {
+                name: {
+                    "count": h.count,
+                    "sum_s": h.sum,
+                    "mean_s": h.sum / h.count if h.count else 0.0,
+                    "p50_s": h.quantile(0.5),
+                    "p95_s": h.quantile(0.95),
+                    "p99_s": h.quantile(0.99),
+                    "max_s": h.max,
+                }
+                for name, h in sorted(self._histograms.items())
+            }
+            return {"stages": stages, "counters": dict(sorted(self._counters.items()))}
+
+    def to_prometheus(self, prefix: str = "profilegen") -> str:
+        """Prometheus text exposition: one histogram over all stages, one counter family."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                stage = _label(name)
+                cumulative = 0
+                for bound, n in zip((*BUCKETS, "+Inf"), h.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {h.sum!r}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            lines += [f"# HELP {prefix}_events_total Pipeline event counters.", f"# TYPE {prefix}_events_total counter"]
+            for name, value in sorted(self._counters.items()):
+                lines.append(f'{prefix}_events_total{{event="{_label(name)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> dict:
+        with self._lock:
+            raw = {"histograms": {n: h.raw() for n, h in self._histograms.items()}, "counters": dict(self._counters)}
+            self._histograms.clear()
+            self._counters.clear()
+        return raw
+
+    def merge(self, raw: dict) -> None:
+        with self._lock:
+            for name, data in raw["histograms"].items():
+                hist = self._histograms.get(name)
+                if hist is None:
+                    hist = self._histograms[name] = Histogram()
+                hist.merge_raw(data)
+            for name, value in raw["counters"].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_enabled = os.environ.get("PROFILEGEN_METRICS", "").lower() in ("1", "true", "yes", "on")
+_process = Registry()
+# recording(): a Registry for the current thread / task only, e.g. one app session's debug panel
+_scoped: ContextVar[Registry | None] = ContextVar("metrics_registry", default=None)
+_recording = 0  # active recording() blocks; lets disabled hooks skip the ContextVar lookup
+_recording_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    _process.reset()
+
+
+@contextmanager
+def recording(registry: Registry) -> Iterator[Registry]:
+    """
+    Record what runs inside the block (this thread / task only) into `registry`, whether
+    or not process-wide metrics are enabled; when they are, they still get everything.
+    """
+    global _recording
+    token = _scoped.set(registry)
+    with _recording_lock:
+        _recording += 1
+    try:
+        yield registry
+    finally:
+        with _recording_lock:
+            _recording -= 1
+        _scoped.reset(token)
+
+
+# ---------------------------
+# Recording
+# ---------------------------
+class _Span:
+    __slots__ = ("name", "_t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self._t0)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str):
+    """Context manager timing one execution of stage `name`."""
+    return _Span(name) if _enabled or (_recording and _scoped.get()) else _NOOP
+
+
+class Laps:
+    """Times consecutive stages: each mark() records the time since the previous mark."""
+    __slots__ = ("_t",)
+
+    def __init__(self):
+        self._t = time.perf_counter()
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        observe(name, now - self._t)
+        self._t = now
+
+
+def laps() -> Laps | None:
+    """A Laps timer when enabled, else None; guard marks with `if laps:`."""
+    return Laps() if _enabled or (_recording and _scoped.get()) else None
+
+
+def observe(name: str, seconds: float) -> None:
+    scoped = _scoped.get() if _recording else None
+    if scoped is not None:
+        scoped.observe(name, seconds)
+        if not _enabled:
+            return
+    _process.observe(name, seconds)
+
+
+def count(name: str, n: int = 1) -> None:
+    scoped = _scoped.get() if _recording else None
+    if scoped is not None:
+        scoped.count(name, n)
+    if _enabled:
+        _process.count(name, n)
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def snapshot() -> dict:
+    """{"stages": {stage: summary}, "counters": {name: value}}; times in seconds."""
+    return _process.snapshot()
+
+
+def to_json() -> str:
+    import json
+
+    return json.dumps(snapshot(), indent=2)
+
+
+def to_prometheus(prefix: str = "profilegen") -> str:
+    """Prometheus text exposition: one histogram over all stages, one counter family."""
+    return _process.to_prometheus(prefix)
+
+
+def drain() -> dict | None:
+    """Take (and reset) this process's raw measurements, for merge() in another process."""
+    if not _enabled:
+        return None
+    return _process.drain()
+
+
+def merge(raw: dict | None) -> None:
+    if not raw:
+        return
+    _process.merge(raw)
@@ -0,0 +1,93 @@
+# profile_input.py
+from dataclasses import dataclass, fields
+from typing import Any, Mapping
+
+# Placeholder names used by older run.py versions -> the field they stand for; themes may still use them
+ALIASES = {"Facebook": "facebook"}
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _items(values: Any) -> tuple[str, ...]:
+    return tuple(t for t in (_text(v) for v in (values or ())) if t)
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileInput:
+    """
+    Immutable, hashable user input for one README.
+    Strings are stripped and list items stripped/de-blanked on construction, so two
+    inputs that render the same README compare (and hash) equal.
+    `extra` holds any other {{placeholder}} values as sorted (key, value) pairs.
+    """
+    name: str = ""
+    title: str = ""
+    email: str = ""
+    motto: str = ""
+    summary: str = ""
+    linkedin: str = ""
+    github: str = ""
+    instagram: str = ""
+    website: str = ""
+    youtube: str = ""
+    facebook: str = ""
+    github_username: str = ""
+    skills: tuple[str, ...] = ()
+    tech_stack: tuple[str, ...] = ()
+    tech_stack_use_logos: bool = True
+    extra: tuple[tuple[str, str], ...] = ()
+
+    def __post_init__(self):
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name in ("skills", "tech_stack"):
+                object.__setattr__(self, f.name, _items(value))
+            elif f.name == "tech_stack_use_logos":
+                object.__setattr__(self, f.name, bool(value))
+            elif f.name == "extra":
+                object.__setattr__(self, f.name, tuple(sorted((str(k), _text(v)) for k, v in value)))
+            else:
+                object.__setattr__(self, f.name, _text(value))
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "ProfileInput":
+        """Build from a user_data dict; unknown keys become `extra` placeholder values."""
+        known = {f.name for f in fields(cls)} - {"extra"}
+        data = dict(data)
+        for alias, name in ALIASES.items():
+            if alias in data and name not in data:
+                data[name] = data.pop(alias)
+        kwargs = {k: v for k, v in data.items() if k in known}
+        extra = [
+            (k, v) for k, v in data.items()
+            if k not in known and not isinstance(v, (list, tuple, dict, bool))
+        ]
+        return cls(**kwargs, extra=tuple(extra))
+
+    @classmethod
+    def from_normalized(cls, **values: Any) -> "ProfileInput":
+        """
+        Build from values already in canonical form (stripped str, tuples of non-blank
+        str, sorted `extra`), skipping the per-field normalization; see columnar.
+        """
+        profile = object.__new__(cls)
+        for set_slot, name, default in _SLOTS:
+            set_slot(profile, values.get(name, default))
+        return profile
+
+    def text_values(self) -> dict[str, str]:
+        """All plain-text placeholder values by name, the ALIASES included."""
+        values = dict(self.extra)
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, str):
+                values[f.name] = value
+        for alias, name in ALIASES.items():
+            values.setdefault(alias, values[name])
+        return values
+
+
+# (slot setter, name, default) per field; setting the slots directly skips the frozen __setattr__
+_SLOTS = tuple((getattr(ProfileInput, f.name).__set__, f.name, f.default) for f in fields(ProfileInput))
@@ -0,0 +1,465 @@
+# publish.py
+"""
+Publish batch output to the users' profile repositories.
+
+    python src/publish.py out/ --repos /srv/profiles --state publish.sqlite
+    python src/publish.py profiles.zip --repos /srv/profiles --dry-run > changes.diff
+
+For every <name>/ of a batch output (directory, .zip or .tar[.gz]) the profile
+repository is <repos>/<name> (a working copy) or <repos>/<name>.git (bare).
+README.md and the generated badges/<digest>.svg are compared with the
+repository's HEAD by git blob hash, and only repositories whose content
+differs get a commit on their current branch; repositories are handled in
+parallel. --dry-run writes nothing and prints a unified diff per change.
+
+With --state, a sqlite file remembers the HEAD and content digest last seen
+for each repository: a profile whose output and HEAD are both unchanged is
+skipped without running git, so a re-run costs time in proportion to the
+profiles that changed.
+"""
+import argparse
+import difflib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from email.utils import parseaddr
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import sqlite3
+import subprocess
+import sys
+import tarfile
+import time
+from typing import Iterator
+import zipfile
+
+from .badge_svg import ASSET_DIR, DIGEST_LEN
+from . import metrics
+
+README = "README.md"
+DEFAULT_MESSAGE = "Update profile README"
+DEFAULT_AUTHOR = "Profile Generator <profile-generator@localhost>"
+
+# Results
+UNCHANGED = "unchanged"
+UPDATED = "updated"
+WOULD_UPDATE = "would update"  # --dry-run
+NO_REPO = "no repo"
+FAILED = "failed"
+
+# Repository files owned by the publisher; a badge the new output no longer references is deleted
+_GENERATED_RE = re.compile(rf"{ASSET_DIR}/[0-9a-f]{{{DIGEST_LEN}}}\.svg")
+
+
+class PublishError(Exception):
+    """A repository that cannot be published to as it is (detached HEAD, local edits, git failure)."""
+
+
+# ---------------------------
+# Batch output
+# ---------------------------
+def _published(rel: str) -> bool:
+    # README.md and badges/<digest>.svg; anything else (e.g. --html's index.html) stays out of the repository
+    return rel == README or _GENERATED_RE.fullmatch(rel) is not None
+
+
+def iter_outputs(path: Path) -> Iterator[tuple[str, dict[str, bytes]]]:
+    """
+    (name, {relative path: content}) per profile of a batch output, by name: only
+    README.md and the generated badges/ are published. Directories and zips are
+    read one profile at a time; a tar is read whole.
+    """
+    name = path.name.lower()
+    if path.is_dir():
+        for profile_dir in sorted(p for p in path.iterdir() if (p / README).is_file()):
+            files = (f for f in sorted(profile_dir.rglob("*")) if f.is_file())
+            yield profile_dir.name, {
+                rel: f.read_bytes() for f in files if _published(rel := f.relative_to(profile_dir).as_posix())
+            }
+    elif name.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            members: dict[str, list[str]] = {}
+            for member in zf.namelist():
+                profile, _, rel = member.partition("/")
+                if _published(rel):
+                    members.setdefault(profile, []).append(member)
+            for profile in sorted(members):
+                yield profile, {m.partition("/")[2]: zf.read(m) for m in members[profile]}
+    elif name.endswith((".tar", ".tar.gz", ".tgz")):
+        profiles: dict[str, dict[str, bytes]] = {}
+        with tarfile.open(path) as tar:
+            for info in tar:
+                profile, _, rel = info.name.partition("/")
+                if _published(rel) and info.isfile():
+                    profiles.setdefault(profile, {})[rel] = tar.extractfile(info).read()
+        yield from sorted(profiles.items())
+    else:
+        raise ValueError(f"Unsupported batch output: {path} (use a directory, .zip, .tar or .tar.gz)")
+
+
+def content_digest(files: dict[str, bytes]) -> str:
+    h = hashlib.sha256()
+    for rel in sorted(files):
+        data = files[rel]
+        h.update(f"{rel}\0{len(data)}\0".encode("utf-8"))
+        h.update(data)
+    return h.hexdigest()
+
+
+# ---------------------------
+# Git
+# ---------------------------
+def _git(repo: Path, *args: str, input: bytes | None = None, env: dict | None = None) -> bytes:
+    try:
+        return subprocess.run(
+            ["git", "-C", str(repo), *args], input=input, capture_output=True, check=True,
+            env={**os.environ, **env} if env else None,
+        ).stdout
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise PublishError(f"git {args[0]}: {message[-1] if message else f'exit status {e.returncode}'}") from None
+
+
+def find_repo(repos: Path, name: str) -> tuple[Path, bool] | None:
+    """(path, bare) of the profile repository for `name`, or None."""
+    if (repos / name / ".git").exists():
+        return repos / name, False
+    for bare in (repos / f"{name}.git", repos / name):
+        if (bare / "HEAD").is_file() and (bare / "objects").is_dir():
+            return bare, True
+    return None
+
+
+def _git_dir(repo: Path, bare: bool) -> Path:
+    if bare:
+        return repo
+    dot_git = repo / ".git"
+    if dot_git.is_file():  # a linked worktree or submodule: "gitdir: <path>"
+        return (repo / dot_git.read_text(encoding="utf-8").partition(":")[2].strip()).resolve()
+    return dot_git
+
+
+def read_head(git_dir: Path) -> tuple[str | None, str | None]:
+    """
+    (branch ref, commit) of HEAD from the ref files alone, without running git;
+    the commit is None on an unborn branch, the ref None when HEAD is detached.
+    """
+    head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    if not head.startswith("ref:"):
+        return None, head
+    ref = head[4:].strip()
+    common = git_dir
+    if (git_dir / "commondir").is_file():  # linked worktree: refs live in the main repository
+        common = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    loose = common / ref
+    if loose.is_file():
+        return ref, loose.read_text(encoding="utf-8").strip() or None
+    packed = common / "packed-refs"
+    if packed.is_file():
+        for line in packed.read_text(encoding="utf-8").splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return ref, sha
+    return ref, None
+
+
+def blob_id(data: bytes, sha256: bool = False) -> str:
+    """The object id git gives `data` as a blob."""
+    h = hashlib.sha256() if sha256 else hashlib.sha1()
+    h.update(b"blob %d\0" % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+def _tree_blobs(repo: Path, commit: str, paths: list[str]) -> dict[str, str]:
+    """{path: blob id} at `commit` of `paths` and everything under badges/."""
+    out = _git(repo, "ls-tree", "-r", "-z", commit, "--", ASSET_DIR, *paths)
+    blobs = {}
+    for entry in out.split(b"\0"):
+        if entry:
+            meta, _, path = entry.partition(b"\t")
+            blobs[path.decode("utf-8")] = meta.split()[2].decode("ascii")
+    return blobs
+
+
+def _changes(files: dict[str, bytes], current: dict[str, str]) -> tuple[list[str], list[str]]:
+    """(paths to write, paths to delete) to turn `current` into `files`."""
+    sha256 = any(len(blob) == 64 for blob in current.values())
+    writes = [rel for rel, data in files.items() if current.get(rel) != blob_id(data, sha256)]
+    deletes = sorted(rel for rel in current if rel not in files and _GENERATED_RE.fullmatch(rel))
+    return sorted(writes), deletes
+
+
+def _identity_env(author: str) -> dict[str, str]:
+    name, email = parseaddr(author)
+    if not email:
+        raise ValueError(f"Author must look like 'Name <email>': {author!r}")
+    name = name or email
+    return {
+        "GIT_AUTHOR_NAME": name, "GIT_AUTHOR_EMAIL": email,
+        "GIT_COMMITTER_NAME": name, "GIT_COMMITTER_EMAIL": email,
+    }
+
+
+def _commit_bare(
+    repo: Path, ref: str, parent: str | None, files: dict[str, bytes],
+    writes: list[str], deletes: list[str], message: str, author: str,
+) -> None:
+    # One fast-import stream per commit: blobs, tree and ref update in a single process.
+    # The ref only moves if it still points at `parent` (fast-import refuses non-fast-forwards).
+    env = _identity_env(author)
+    committer = f"{env['GIT_COMMITTER_NAME']} <{env['GIT_COMMITTER_EMAIL']}>"
+    msg = message.encode("utf-8")
+    stream = [
+        f"commit {ref}\ncommitter {committer} {int(time.time())} +0000\ndata {len(msg)}\n".encode("utf-8"), msg, b"\n",
+    ]
+    if parent:
+        stream.append(f"from {parent}\n".encode("ascii"))
+    for rel in writes:
+        stream.append(f"M 100644 inline {rel}\ndata {len(files[rel])}\n".encode("utf-8"))
+        stream += [files[rel], b"\n"]
+    stream += [f"D {rel}\n".encode("utf-8") for rel in deletes]
+    _git(repo, "fast-import", "--quiet", "--date-format=raw", input=b"".join(stream))
+
+
+def _commit_worktree(
+    repo: Path, files: dict[str, bytes], writes: list[str], deletes: list[str], message: str, author: str,
+) -> None:
+    # Never mix with someone's work: nothing staged, and no local edits to the files we own
+    for entry in _git(repo, "status", "--porcelain", "-z", "--untracked-files=no").decode("utf-8").split("\0"):
+        if not entry:
+            continue
+        staged, modified, path = entry[0], entry[1], entry[3:]
+        if staged not in (" ", "?") or (modified != " " and (path in files or path.startswith(f"{ASSET_DIR}/"))):
+            raise PublishError(f"uncommitted changes in the working copy ({path})")
+    for rel in writes:
+        target = repo / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(files[rel])
+    if writes:
+        _git(repo, "add", "--", *writes)
+    if deletes:
+        _git(repo, "rm", "-q", "--ignore-unmatch", "--", *deletes)
+    _git(repo, "commit", "-q", "--no-verify", "-m", message, env=_identity_env(author))
+
+
+def _diff(repo: Path, name: str, files: dict[str, bytes], current: dict[str, str],
+          writes: list[str], deletes: list[str]) -> str:
+    """Unified diff of README.md, one line per other changed file."""
+    lines = []
+    if README in writes:
+        old = _git(repo, "cat-file", "blob", current[README]).decode("utf-8", "replace") if README in current else ""
+        lines += difflib.unified_diff(
+            old.splitlines(keepends=True), files[README].decode("utf-8", "replace").splitlines(keepends=True),
+            f"a/{name}/{README}" if README in current else "/dev/null", f"b/{name}/{README}",
+        )
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+    for rel in writes:
+        if rel != README:
+            lines.append(f"{'changed' if rel in current else 'added'}: {name}/{rel}\n")
+    lines += [f"deleted: {name}/{rel}\n" for rel in deletes]
+    return "".join(lines)
+
+
+# ---------------------------
+# Publishing
+# ---------------------------
+@dataclass
+class PublishResult:
+    name: str
+    status: str  # UNCHANGED, UPDATED, WOULD_UPDATE, NO_REPO or FAILED
+    repo: str = ""
+    detail: str = ""
+    paths: list[str] = field(default_factory=list)  # files written or deleted
+    diff: str = ""  # --dry-run only
+    head: str | None = None  # HEAD afterwards, for the state
+    digest: str = ""
+
+
+def publish_one(
+    name: str, files: dict[str, bytes], repo: Path, bare: bool,
+    dry_run: bool = False, message: str = DEFAULT_MESSAGE, author: str = DEFAULT_AUTHOR,
+) -> PublishResult:
+    """Bring one repository's README.md and badges/ up to date with `files`."""
+    result = PublishResult(name, FAILED, str(repo), digest=content_digest(files))
+    try:
+        with metrics.span("publish.compare"):
+            git_dir = _git_dir(repo, bare)
+            ref, head = read_head(git_dir)
+            if ref is None:
+                raise PublishError("HEAD is detached; check out a branch")
+            current = _tree_blobs(repo, head, sorted(files)) if head else {}
+            writes, deletes = _changes(files, current)
+        result.head = head
+        if not writes and not deletes:
+            result.status = UNCHANGED
+            return result
+        result.paths = writes + deletes
+        if dry_run:
+            result.status = WOULD_UPDATE
+            result.diff = _diff(repo, name, files, current, writes, deletes)
+            return result
+        with metrics.span("publish.commit"):
+            if bare:
+                _commit_bare(repo, ref, head, files, writes, deletes, message, author)
+            else:
+                _commit_worktree(repo, files, writes, deletes, message, author)
+        result.status = UPDATED
+        result.head = read_head(git_dir)[1]
+    except (PublishError, OSError) as e:
+        result.detail = str(e)
+    return result
+
+
+class PublishState:
+    """sqlite record of the (HEAD, content digest) each repository was last seen at."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS published (repo TEXT PRIMARY KEY, head TEXT NOT NULL, digest TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, repo: Path) -> tuple[str, str] | None:
+        try:
+            return self._conn.execute("SELECT head, digest FROM published WHERE repo = ?", (str(repo),)).fetchone()
+        except sqlite3.Error:
+            return None
+
+    def put(self, repo: Path, head: str, digest: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO published (repo, head, digest) VALUES (?, ?, ?)",
+                           (str(repo), head, digest))
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+@dataclass
+class PublishReport:
+    results: list[PublishResult] = field(default_factory=list)
+    skipped: int = 0  # unchanged per --state, git not run
+    elapsed: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(r.status == status for r in self.results)
+
+    def as_dict(self) -> dict:
+        return {
+            "profiles": len(self.results),
+            **{status: self.count(status) for status in (UPDATED, WOULD_UPDATE, UNCHANGED, NO_REPO, FAILED)},
+            "skipped_by_state": self.skipped,
+            "elapsed_s": round(self.elapsed, 3),
+            "changes": [
+                {"name": r.name, "repo": r.repo, "status": r.status, "detail": r.detail, "paths": r.paths}
+                for r in self.results if r.status != UNCHANGED
+            ],
+        }
+
+
+def publish(
+    outputs: Iterator[tuple[str, dict[str, bytes]]],
+    repos: Path,
+    jobs: int = 8,
+    dry_run: bool = False,
+    state: PublishState | None = None,
+    message: str = DEFAULT_MESSAGE,
+    author: str = DEFAULT_AUTHOR,
+) -> PublishReport:
+    """
+    publish_one() for every profile of `outputs` on `jobs` threads (git does the
+    work in subprocesses). Results come back in input order.
+    """
+    _identity_env(author)  # reject a bad author before touching any repository
+    report = PublishReport()
+    start = time.perf_counter()
+    slots: list[PublishResult | None] = []
+    pending: dict = {}
+
+    def _drain() -> None:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            i, repo = pending.pop(fut)
+            result = slots[i] = fut.result()
+            if state is not None and not dry_run and result.head and result.status in (UNCHANGED, UPDATED):
+                state.put(repo, result.head, result.digest)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for name, files in outputs:
+            found = find_repo(repos, name)
+            if found is None:
+                slots.append(PublishResult(name, NO_REPO, detail=f"no {repos / name} or {repos / name}.git"))
+                continue
+            repo, bare = found
+            if state is not None:
+                seen = state.get(repo)
+                if seen is not None:
+                    try:
+                        _, head = read_head(_git_dir(repo, bare))
+                    except OSError:
+                        head = None
+                    if head and seen == (head, content_digest(files)):
+                        slots.append(PublishResult(name, UNCHANGED, str(repo), head=head))
+                        report.skipped += 1
+                        continue
+            slots.append(None)
+            pending[pool.submit(publish_one, name, files, repo, bare, dry_run, message, author)] = (len(slots) - 1, repo)
+            while len(pending) >= jobs * 4:
+                _drain()
+        while pending:
+            _drain()
+
+    report.results = slots
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Commit batch-generated READMEs to local profile repositories.")
+    ap.add_argument("output", type=Path, help="batch.py output: directory, .zip, .tar or .tar.gz")
+    ap.add_argument("--repos", type=Path, required=True,
+                    help="Directory holding <name>/ working copies or <name>.git bare repositories")
+    ap.add_argument("--jobs", type=int, default=8, help="Repositories handled in parallel (default: 8)")
+    ap.add_argument("--dry-run", action="store_true", help="Change nothing; print a diff of what would be committed")
+    ap.add_argument("--state", type=Path, default=None,
+                    help="sqlite file of the last published HEAD/content per repository (skips unchanged ones)")
+    ap.add_argument("--message", default=DEFAULT_MESSAGE, help="Commit message")
+    ap.add_argument("--author", default=DEFAULT_AUTHOR, help=f"Commit author (default: {DEFAULT_AUTHOR})")
+    ap.add_argument("--report", type=Path, default=None, help="Write the JSON report here")
+    args = ap.parse_args(argv)
+
+    state = PublishState(args.state) if args.state else None
+    try:
+        report = publish(
+            iter_outputs(args.output), args.repos, jobs=args.jobs, dry_run=args.dry_run,
+            state=state, message=args.message, author=args.author,
+        )
+    finally:
+        if state is not None:
+            state.close()
+
+    if args.dry_run:
+        sys.stdout.writelines(r.diff for r in report.results if r.diff)
+    if args.report:
+        args.report.write_text(json.dumps(report.as_dict(), indent=2), encoding="utf-8")
+    changed = report.count(WOULD_UPDATE if args.dry_run else UPDATED)
+    print(
+        f"{len(report.results)} profiles: {changed} {'to update' if args.dry_run else 'updated'}, "
+        f"{report.count(UNCHANGED)} unchanged ({report.skipped} by state), {report.count(NO_REPO)} without repo, "
+        f"{report.count(FAILED)} failed in {report.elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    problems = [r for r in report.results if r.status in (FAILED, NO_REPO)]
+    for r in problems[:20]:
+        print(f"  {r.name}: {r.status}: {r.detail}", file=sys.stderr)
+    return 1 if report.count(FAILED) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
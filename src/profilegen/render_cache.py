@@ -0,0 +1,246 @@
+# render_cache.py
+"""
+Content-addressed cache of rendered READMEs.
+
+The key is a SHA-256 over the theme's content hash, the normalized ProfileInput,
+the RenderContext options and the badge data, so an unchanged form (or two
+batch records with identical input) is never rendered twice. Results live in an
+in-memory LRU bounded by entry count and bytes, optionally backed by a sqlite
+file so they survive restarts.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import astuple
+from functools import lru_cache
+import hashlib
+import itertools
+import json
+from pathlib import Path
+import threading
+import time
+
+from .badge_svg import Asset, recording_assets
+from .badges import BADGES_FILE
+from . import metrics
+from .generate_readme import (
+    Rendered,
+    RenderContext,
+    _load_theme,
+    _make_skills_block,
+    _render_template,
+    _tech_stack_block,
+)
+from .profile_input import ProfileInput
+
+# Bump when the rendering of an unchanged (theme, input) pair changes
+CACHE_VERSION = 4
+
+
+@lru_cache(maxsize=1)
+def _badges_digest() -> str:
+    return hashlib.sha256(BADGES_FILE.read_bytes()).hexdigest()
+
+
+def cache_key(theme_digest: str, profile: ProfileInput, ctx: RenderContext) -> str:
+    payload = json.dumps(
+        [CACHE_VERSION, theme_digest, _badges_digest(), ctx.include_stats, ctx.badge_mode, ctx.stats_cards,
+         astuple(profile)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _MemoryTier:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data: OrderedDict[str, tuple[Rendered, int]] = OrderedDict()
+
+    def get(self, key: str) -> Rendered | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, value: Rendered) -> None:
+        size = len(value.text.encode("utf-8")) + sum(len(a.svg) for a in value.assets)
+        if size > self.max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._data[key] = (value, size)
+        self.bytes += size
+        while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.bytes -= evicted
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _DiskTier:
+    """
+    sqlite-backed store; any sqlite error is treated as a miss, never as a render failure.
+    Each call borrows a connection from a small pool (one per concurrent caller), so
+    lookups run in parallel (WAL readers do not block each other) and sqlite's busy
+    timeout serializes the writes.
+    """
+
+    def __init__(self, path: Path, max_entries: int):
+        import sqlite3  # only for a disk tier: memory-only caches never load it
+
+        self.path = path
+        self.max_entries = max_entries
+        self._sqlite = sqlite3
+        self._errors = sqlite3.Error
+        self._idle: list = []
+        self._idle_lock = threading.Lock()
+        self._closed = False
+        self._writes = itertools.count(1)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS renders (key TEXT PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL, "
+                "assets TEXT NOT NULL DEFAULT '[]')"
+            )
+            if "assets" not in {row[1] for row in conn.execute("PRAGMA table_info(renders)")}:
+                # A file from before assets were kept; its rows have older CACHE_VERSION keys and are never hit
+                conn.execute("ALTER TABLE renders ADD COLUMN assets TEXT NOT NULL DEFAULT '[]'")
+            conn.commit()
+
+    @contextmanager
+    def _connection(self):
+        with self._idle_lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            # Pooled connections move between threads, but only one uses a connection at a time
+            conn = self._sqlite.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL keeps this crash-safe; no fsync per put
+        try:
+            yield conn
+        finally:
+            with self._idle_lock:
+                if not self._closed:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def get(self, key: str) -> Rendered | None:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT value, assets FROM renders WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE renders SET used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+            assets = tuple(Asset(digest, tuple(labels), strip, svg) for digest, labels, strip, svg in json.loads(row[1]))
+            return Rendered(row[0], assets)
+        except (self._errors, ValueError, TypeError):
+            return None
+
+    def put(self, key: str, value: Rendered) -> None:
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO renders (key, value, used, assets) VALUES (?, ?, ?, ?)",
+                    (key, value.text, time.time(), json.dumps(value.assets, ensure_ascii=False)),
+                )
+                if next(self._writes) % 256 == 0:  # prune least recently used rows now and then
+                    conn.execute(
+                        "DELETE FROM renders WHERE key NOT IN (SELECT key FROM renders ORDER BY used DESC LIMIT ?)",
+                        (self.max_entries,),
+                    )
+                conn.commit()
+        except self._errors:
+            pass
+
+    def close(self) -> None:
+        with self._idle_lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class RenderCache:
+    """Thread-safe two-tier cache in front of render_profile()."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 << 20,
+        disk_path: Path | None = None,
+        max_disk_entries: int = 100_000,
+    ):
+        self._memory = _MemoryTier(max_entries, max_bytes)
+        self._disk = _DiskTier(disk_path, max_disk_entries) if disk_path else None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def render(self, profile: ProfileInput, ctx: RenderContext) -> str:
+        return self.render_with_assets(profile, ctx).text
+
+    def render_with_assets(self, profile: ProfileInput, ctx: RenderContext) -> Rendered:
+        """The README and the local SVGs it references (see generate_readme.render_with_assets)."""
+        laps = metrics.laps()
+        template = _load_theme(ctx.theme)
+        if laps:
+            laps.mark("theme.load")
+        key = cache_key(template.digest, profile, ctx)
+        if laps:
+            laps.mark("render_cache.key")
+
+        # self._lock guards the memory tier and the counters only; sqlite I/O runs outside it
+        with self._lock:
+            output = self._memory.get(key)
+            if output is not None:
+                self.memory_hits += 1
+        if output is not None:
+            metrics.count("render_cache.memory_hit")
+            return output
+        if self._disk is not None:
+            with metrics.span("render_cache.disk_get"):
+                output = self._disk.get(key)
+            if output is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._memory.put(key, output)
+                metrics.count("render_cache.disk_hit")
+                return output
+        with self._lock:
+            self.misses += 1
+        metrics.count("render_cache.miss")
+
+        with recording_assets() as assets:
+            text = _render_template(template, profile, ctx)
+        output = Rendered(text, tuple(dict.fromkeys(assets)))
+        with self._lock:
+            self._memory.put(key, output)
+        if self._disk is not None:
+            with metrics.span("render_cache.disk_put"):
+                self._disk.put(key, output)
+        return output
+
+    def stats(self) -> dict:
+        """Hit/miss counters for the render tiers and the block-level caches."""
+        skills, techs = _make_skills_block.cache_info(), _tech_stack_block.cache_info()
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory.bytes,
+            "skills_block": {"hits": skills.hits, "misses": skills.misses},
+            "tech_stack_block": {"hits": techs.hits, "misses": techs.misses},
+        }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
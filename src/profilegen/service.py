@@ -0,0 +1,295 @@
+# service.py
+"""
+Lightweight HTTP rendering service (plain ASGI, no framework).
+
+    uvicorn profilegen.service:app --app-dir src --port 8000
+
+    POST /render?theme=default&include_stats=1   body: user_data JSON   -> text/markdown, streamed
+    POST /batch?theme=default&include_stats=1    body: NDJSON of user_data -> NDJSON, streamed
+    GET  /badges/<digest>.svg                    locally generated badge (badges=local|strip)
+    GET  /metrics                                stage timings, Prometheus text (?format=json for JSON)
+    GET  /healthz
+
+Both POST endpoints take badges=remote|local|strip. Local badges are referenced as
+relative badges/<digest>.svg URLs, which resolve against this service.
+/metrics is served when PROFILEGEN_METRICS=1; process workers send their
+measurements back with each result, so it covers the whole pool.
+
+Rendering runs on a worker pool (threads by default, so every request shares the
+compiled-template and badge caches; set PROFILEGEN_EXECUTOR=process to use
+processes, each keeping its own warm caches). PROFILEGEN_WORKERS sets the size.
+On threads, /render sends the README in chunks as the template is filled
+(see generate_readme.stream_profile); a README of one chunk gets a plain
+Content-Length response.
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import os
+from itertools import islice
+import re
+from typing import Iterator
+from urllib.parse import parse_qs
+
+from .badge_svg import BADGE_MODES, get_store
+from .batch import normalize_record
+from .generate_readme import RenderContext, generate_readme, stream_profile
+from . import metrics
+from .profile_input import ProfileInput
+
+MAX_RENDER_BODY = 1 << 20   # 1 MiB per profile
+MAX_BATCH_BODY = 64 << 20   # 64 MiB per batch request
+BATCH_IN_FLIGHT = 64        # records of one batch request rendering at once
+
+_MARKDOWN = "text/markdown; charset=utf-8"
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _make_executor() -> Executor:
+    workers = int(os.environ.get("PROFILEGEN_WORKERS", "0")) or min(32, (os.cpu_count() or 1) + 4)
+    if os.environ.get("PROFILEGEN_EXECUTOR", "thread") == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+
+
+_executor: Executor | None = None
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        _executor = _make_executor()
+    return _executor
+
+
+def _render(theme: str, include_stats: bool, badge_mode: str, raw: dict) -> str:
+    return generate_readme(theme, normalize_record(raw), include_stats=include_stats, badge_mode=badge_mode)
+
+
+def _render_in_process(theme: str, include_stats: bool, badge_mode: str, raw: dict) -> tuple[str, dict | None]:
+    return _render(theme, include_stats, badge_mode, raw), metrics.drain()
+
+
+def _start_stream(theme: str, include_stats: bool, badge_mode: str, raw: dict) -> tuple[Iterator[bytes], list[bytes]]:
+    """The README's chunk iterator plus its first two chunks (fewer: the README is complete)."""
+    chunks = stream_profile(
+        ProfileInput.from_mapping(normalize_record(raw)), RenderContext(theme, include_stats, badge_mode)
+    )
+    return chunks, list(islice(chunks, 2))
+
+
+async def _render_async(theme: str, include_stats: bool, badge_mode: str, raw: dict) -> str:
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    with metrics.span("service.render"):
+        if isinstance(executor, ProcessPoolExecutor):
+            output, worker_metrics = await loop.run_in_executor(
+                executor, _render_in_process, theme, include_stats, badge_mode, raw
+            )
+            metrics.merge(worker_metrics)
+            return output
+        return await loop.run_in_executor(executor, _render, theme, include_stats, badge_mode, raw)
+
+
+# ---------------------------
+# ASGI plumbing
+# ---------------------------
+async def _read_body(receive, limit: int) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise HTTPError(413, f"request body larger than {limit} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_response(send, status: int, body: bytes, content_type: str) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _params(scope) -> tuple[str, bool, str]:
+    qs = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    theme = qs.get("theme", ["default"])[0]
+    include_stats = qs.get("include_stats", ["1"])[0].lower() not in ("0", "false", "no", "off")
+    badge_mode = qs.get("badges", ["remote"])[0]
+    if badge_mode not in BADGE_MODES:
+        raise HTTPError(400, f"badges: expected one of {', '.join(BADGE_MODES)}")
+    return theme, include_stats, badge_mode
+
+
+def _parse_object(data: bytes, what: str) -> dict:
+    try:
+        obj = json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise HTTPError(400, f"{what}: invalid JSON ({e})") from None
+    if not isinstance(obj, dict):
+        raise HTTPError(400, f"{what}: expected a JSON object")
+    return obj
+
+
+# ---------------------------
+# Endpoints
+# ---------------------------
+async def _handle_render(scope, receive, send) -> None:
+    theme, include_stats, badge_mode = _params(scope)
+    raw = _parse_object(await _read_body(receive, MAX_RENDER_BODY), "body")
+    executor = _get_executor()
+    if isinstance(executor, ProcessPoolExecutor):
+        # Generators cannot cross the process boundary: the worker renders the whole README
+        try:
+            output = await _render_async(theme, include_stats, badge_mode, raw)
+        except FileNotFoundError as e:
+            raise HTTPError(404, str(e)) from None
+        await _send_response(send, 200, output.encode("utf-8"), _MARKDOWN)
+        return
+
+    loop = asyncio.get_running_loop()
+    try:
+        with metrics.span("service.render"):
+            chunks, head = await loop.run_in_executor(
+                executor, _start_stream, theme, include_stats, badge_mode, raw
+            )
+    except FileNotFoundError as e:
+        raise HTTPError(404, str(e)) from None
+    if len(head) < 2:
+        await _send_response(send, 200, head[0] if head else b"", _MARKDOWN)
+        return
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", _MARKDOWN.encode())],
+    })
+    for chunk in head:
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    # The rest is rendered a chunk at a time on the pool, at the pace the client reads
+    while (chunk := await loop.run_in_executor(executor, next, chunks, None)) is not None:
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _handle_batch(scope, receive, send) -> None:
+    """Render every NDJSON line; stream one result line per record as it completes."""
+    theme, include_stats, badge_mode = _params(scope)
+    lines = [line for line in (await _read_body(receive, MAX_BATCH_BODY)).splitlines() if line.strip()]
+    records = iter(enumerate(lines))
+    results: asyncio.Queue = asyncio.Queue(maxsize=BATCH_IN_FLIGHT)
+
+    async def worker() -> None:
+        for index, line in records:  # shared iterator: each record is taken by one worker
+            try:
+                readme = await _render_async(
+                    theme, include_stats, badge_mode, _parse_object(line, f"line {index + 1}")
+                )
+                await results.put({"index": index, "ok": True, "readme": readme})
+            except Exception as e:
+                await results.put({"index": index, "ok": False, "error": f"{type(e).__name__}: {e}"})
+
+    async def produce() -> None:
+        await asyncio.gather(*(worker() for _ in range(BATCH_IN_FLIGHT)))
+        await results.put(None)
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/x-ndjson")],
+    })
+    producer = asyncio.create_task(produce())
+    try:
+        while (result := await results.get()) is not None:
+            await send({
+                "type": "http.response.body",
+                "body": json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n",
+                "more_body": True,
+            })
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        producer.cancel()
+
+
+_BADGE_PATH_RE = re.compile(r"/badges/([0-9a-f]+)\.svg")
+
+
+async def _handle_badge(digest: str, send) -> None:
+    data = get_store().get(digest)
+    if data is None:
+        await _send_response(send, 404, b'{"error": "unknown badge"}', "application/json")
+        return
+    await _send_response(send, 200, data, "image/svg+xml")
+
+
+async def _handle_metrics(scope, send) -> None:
+    if not metrics.enabled():
+        await _send_response(send, 404, b'{"error": "metrics disabled (set PROFILEGEN_METRICS=1)"}', "application/json")
+        return
+    qs = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if qs.get("format", [""])[0] == "json":
+        await _send_response(send, 200, metrics.to_json().encode("utf-8"), "application/json")
+    else:
+        await _send_response(send, 200, metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+
+
+ROUTES = {
+    ("POST", "/render"): _handle_render,
+    ("POST", "/batch"): _handle_batch,
+}
+
+
+async def _lifespan(receive, send) -> None:
+    global _executor
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            _get_executor()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _executor is not None:
+                _executor.shutdown(wait=True)
+                _executor = None
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    if scope["method"] == "GET" and scope["path"] == "/healthz":
+        await _send_response(send, 200, b"ok", "text/plain")
+        return
+    if scope["method"] == "GET" and scope["path"] == "/metrics":
+        await _handle_metrics(scope, send)
+        return
+    if scope["method"] == "GET" and (m := _BADGE_PATH_RE.fullmatch(scope["path"])):
+        await _handle_badge(m.group(1), send)
+        return
+    handler = ROUTES.get((scope["method"], scope["path"]))
+    if handler is None:
+        await _send_response(send, 404, b'{"error": "not found"}', "application/json")
+        return
+    try:
+        await handler(scope, receive, send)
+    except HTTPError as e:
+        body = json.dumps({"error": str(e)}).encode("utf-8")
+        await _send_response(send, e.status, body, "application/json")
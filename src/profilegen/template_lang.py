@@ -0,0 +1,433 @@
+# template_lang.py
+"""
+Loops, conditionals and filters for themes, compiled to Python functions.
+
+    {% if motto %}> {{ motto }}{% endif %}
+    {% for skill in skills %}
+    - {{ skill }}
+    {% else %}
+    - Learning new things
+    {% endfor %}
+    {% for tech in tech_stack %}{{ tech | badge }}{% if not loop.last %} {% endif %}{% endfor %}
+    <a href="https://example.com/?q={{ name | urlencode }}">
+
+Tags: for / else / endfor (the else part renders for an empty list) and
+if / elif / else / endif. Conditions combine values with not, and, or; blank
+strings and empty lists are false. Inside a loop, loop.index, loop.first,
+loop.last and loop.length describe the current item. Filters: badge, urlencode,
+lower, upper, trim, escape. A {% %} tag alone on its line takes the whole line
+with it (indentation and newline), so block tags can sit on lines of their own.
+
+compile_template() cuts every top-level block (and every filtered {{ x | f }}
+outside one) into a LOGIC segment, and compile_block() turns its source into a
+Python function once per distinct source. Plain {{name}} placeholders outside
+blocks keep their meaning (a missing value is one space); inside blocks a
+missing value renders as nothing.
+"""
+from functools import lru_cache
+import html
+import re
+from typing import Callable, Mapping, NamedTuple
+from urllib.parse import quote
+
+_BLOCK_KEYWORDS = ("for", "if", "elif", "else", "endfor", "endif")
+_KEYWORDS = {"and", "or", "not", "in", "loop"}
+_LOOP_ATTRS = {"index", "first", "last", "length"}
+
+_BLOCK_TAG = r"\{%\s*(?P<kw>" + "|".join(_BLOCK_KEYWORDS) + r")\b(?P<args>[^%]*?)\s*%\}"
+# {{ name | filter ... }}: outside blocks only filtered expressions are code, {{name}} stays a placeholder
+_FILTERED_TAG = r"\{\{\s*[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)?(?:\s*\|\s*[A-Za-z_]\w*)+\s*\}\}"
+
+_SCAN_RE = re.compile(rf"{_BLOCK_TAG}|(?P<expr>{_FILTERED_TAG})")
+_TOKEN_RE = re.compile(rf"{_BLOCK_TAG}|\{{\{{\s*(?P<sigil>[#/]?)(?P<body>[^{{}}]*?)\s*\}}\}}")
+_NAME = r"[A-Za-z_][A-Za-z0-9_]*"  # ASCII only: names become Python identifiers in the compiled block
+_WORD_RE = re.compile(rf"\s*(\||{_NAME}(?:\.{_NAME})?)\s*")
+_LINE_END_RE = re.compile(r"[ \t]*(?:\r?\n|\Z)")
+
+
+class TemplateSyntaxError(ValueError):
+    """A malformed {% %} or {{ }} construct; `line` is 1-based."""
+
+    def __init__(self, message: str, line: int = 1):
+        super().__init__(f"line {line}: {message}")
+        self.message = message
+        self.line = line
+
+
+def _line(text: str, pos: int) -> int:
+    return text.count("\n", 0, pos) + 1
+
+
+def _standalone(text: str, start: int, end: int) -> tuple[int, int] | None:
+    """(line start, next line start) when the tag at text[start:end] is alone on its line."""
+    line_start = text.rfind("\n", 0, start) + 1
+    if text[line_start:start].strip(" \t"):
+        return None
+    m = _LINE_END_RE.match(text, end)
+    return (line_start, m.end()) if m else None
+
+
+# ---------------------------
+# Values and filters
+# ---------------------------
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return ", ".join(t for t in map(_text, value) if t)
+    return str(value)
+
+
+def _truthy(value) -> bool:
+    return bool(value.strip()) if isinstance(value, str) else bool(value)
+
+
+def _items(value) -> tuple:
+    """What a for loop iterates: the non-blank entries of a list, or a single non-blank value."""
+    if isinstance(value, (list, tuple)):
+        return tuple(v for v in value if (v.strip() if isinstance(v, str) else v))
+    return (value,) if _truthy(value) else ()
+
+
+def _urlencode(value) -> str:
+    return quote(_text(value), safe="")
+
+
+def _lower(value) -> str:
+    return _text(value).lower()
+
+
+def _upper(value) -> str:
+    return _text(value).upper()
+
+
+def _escape(value) -> str:
+    return html.escape(_text(value))
+
+
+FILTERS: dict[str, Callable[[object], str]] = {
+    "badge": _text,  # replaced per render by one bound to the profile's badge settings (generate_readme)
+    "urlencode": _urlencode,
+    "lower": _lower,
+    "upper": _upper,
+    "trim": _text,
+    "escape": _escape,
+}
+
+
+class Scope(NamedTuple):
+    """What LOGIC segments read: get(name) for a variable (str or list of str), and the filters."""
+    get: Callable[[str], object]
+    filters: Mapping[str, Callable[[object], str]] = FILTERS
+
+
+# ---------------------------
+# Parsing
+# ---------------------------
+def find_spans(text: str) -> list[tuple[int, int]]:
+    """(start, end) of every top-level block and filtered expression of a theme, in order."""
+    spans, stack, start = [], [], 0
+    for m in _SCAN_RE.finditer(text):
+        if m.group("expr") is not None:
+            if not stack:
+                spans.append((m.start(), m.end()))
+            continue
+        kw = m.group("kw")
+        line = _standalone(text, m.start(), m.end())
+        if kw in ("for", "if"):
+            if not stack:
+                start = line[0] if line else m.start()
+            stack.append((kw, m.start()))
+        elif kw in ("elif", "else"):
+            if not stack:
+                raise TemplateSyntaxError(f"{{% {kw} %}} outside a block", _line(text, m.start()))
+        else:
+            opener = kw[3:]
+            if not stack or stack[-1][0] != opener:
+                raise TemplateSyntaxError(f"unexpected {{% {kw} %}}", _line(text, m.start()))
+            stack.pop()
+            if not stack:
+                spans.append((start, line[1] if line else m.end()))
+    if stack:
+        kw, pos = stack[-1]
+        raise TemplateSyntaxError(f"{{% {kw} %}} is never closed", _line(text, pos))
+    return spans
+
+
+def _tokens(source: str) -> list[tuple]:
+    """("text", s) / ("tag", keyword, args, line) / ("expr", body, line)."""
+    tokens, pos = [], 0
+    for m in _TOKEN_RE.finditer(source):
+        start, end = m.start(), m.end()
+        if m.group("kw") and (line := _standalone(source, start, end)):
+            start, end = max(line[0], pos), line[1]
+        if start > pos:
+            tokens.append(("text", source[pos:start]))
+        pos = end
+        line = _line(source, m.start())
+        if m.group("kw"):
+            tokens.append(("tag", m.group("kw"), m.group("args").strip(), line))
+        elif not m.group("sigil"):  # {{#stats}} / {{/stats}} markers mean nothing inside a block
+            tokens.append(("expr", m.group("body"), line))
+    if pos < len(source):
+        tokens.append(("text", source[pos:]))
+    return tokens
+
+
+def _words(args: str, line: int) -> list[str]:
+    words, pos = [], 0
+    while pos < len(args):
+        m = _WORD_RE.match(args, pos)
+        if m is None:
+            raise TemplateSyntaxError(f"cannot parse {args[pos:]!r}", line)
+        words.append(m.group(1))
+        pos = m.end()
+    return words
+
+
+class _Parser:
+    """Tokens -> nodes: ("text", s), ("expr", expr), ("if", [(cond, body)], else_body), ("for", var, expr, body, else_body)."""
+
+    def __init__(self, tokens: list[tuple]):
+        self.tokens = tokens
+        self.pos = 0
+        self.loop_depth = 0
+
+    def parse(self) -> list:
+        nodes, end = self._nodes(())
+        if end is not None:
+            raise TemplateSyntaxError(f"unexpected {{% {end[1]} %}}", end[3])
+        return nodes
+
+    def _nodes(self, stop: tuple[str, ...]) -> tuple[list, tuple | None]:
+        nodes = []
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if token[0] == "text":
+                nodes.append(token)
+            elif token[0] == "expr":
+                expr, rest = _expr(_words(token[1], token[2]), token[2])
+                if rest:
+                    raise TemplateSyntaxError(f"unexpected {rest[0]!r} in {{{{ {token[1]} }}}}", token[2])
+                nodes.append(("expr", self._check(expr, token[2])))
+            elif token[1] in stop:
+                return nodes, token
+            elif token[1] == "if":
+                nodes.append(self._if(token))
+            elif token[1] == "for":
+                nodes.append(self._for(token))
+            else:
+                raise TemplateSyntaxError(f"unexpected {{% {token[1]} %}}", token[3])
+        return nodes, None
+
+    def _check(self, expr: tuple, line: int) -> tuple:
+        head, _, attr = expr[0].partition(".")
+        if head == "loop":
+            if not self.loop_depth:
+                raise TemplateSyntaxError(f"{expr[0]} outside a {{% for %}} loop", line)
+            if attr not in _LOOP_ATTRS:
+                raise TemplateSyntaxError(
+                    f"unknown loop attribute {expr[0]!r} (use one of: {', '.join(sorted(_LOOP_ATTRS))})", line
+                )
+        elif attr:
+            raise TemplateSyntaxError(f"{expr[0]!r}: only loop.* has attributes", line)
+        return expr
+
+    def _condition(self, token: tuple) -> tuple:
+        cond = _condition(_words(token[2], token[3]), token[3])
+        stack = [cond]
+        while stack:
+            node = stack.pop()
+            if node[0] == "value":
+                self._check(node[1], token[3])
+            else:
+                stack.extend(node[1:])
+        return cond
+
+    def _close(self, opener: tuple, end: tuple | None) -> tuple:
+        if end is None:
+            raise TemplateSyntaxError(f"{{% {opener[1]} %}} is never closed", opener[3])
+        return end
+
+    def _if(self, token: tuple) -> tuple:
+        branches, else_body = [], None
+        cond = self._condition(token)
+        while True:
+            body, end = self._nodes(("elif", "else", "endif"))
+            end = self._close(token, end)
+            branches.append((cond, body))
+            if end[1] == "elif":
+                cond = self._condition(end)
+                continue
+            if end[1] == "else":
+                else_body, end = self._nodes(("endif",))
+                self._close(token, end)
+            return ("if", branches, else_body)
+
+    def _for(self, token: tuple) -> tuple:
+        words = _words(token[2], token[3])
+        if len(words) < 3 or words[1] != "in" or not _is_name(words[0]):
+            raise TemplateSyntaxError("expected {% for NAME in VALUE %}", token[3])
+        expr, rest = _expr(words[2:], token[3])
+        if rest:
+            raise TemplateSyntaxError(f"unexpected {rest[0]!r} in {{% for %}}", token[3])
+        self._check(expr, token[3])
+        self.loop_depth += 1
+        body, end = self._nodes(("else", "endfor"))
+        self.loop_depth -= 1
+        end = self._close(token, end)
+        else_body = None
+        if end[1] == "else":
+            else_body, end = self._nodes(("endfor",))
+            self._close(token, end)
+        return ("for", words[0], expr, body, else_body)
+
+
+def _is_name(word: str) -> bool:
+    return word != "|" and "." not in word and word not in _KEYWORDS
+
+
+def _expr(words: list[str], line: int) -> tuple[tuple, list[str]]:
+    """VALUE ( | FILTER )* -> ((value, filters), remaining words)."""
+    if not words or words[0] == "|" or words[0] in _KEYWORDS - {"loop"}:
+        raise TemplateSyntaxError("expected a value", line)
+    value, filters, i = words[0], [], 1
+    while i < len(words) and words[i] == "|":
+        if i + 1 >= len(words) or words[i + 1] not in FILTERS:
+            name = words[i + 1] if i + 1 < len(words) else ""
+            raise TemplateSyntaxError(f"unknown filter {name!r} (use one of: {', '.join(FILTERS)})", line)
+        filters.append(words[i + 1])
+        i += 2
+    return (value, tuple(filters)), words[i:]
+
+
+def _condition(words: list[str], line: int) -> tuple:
+    cond, rest = _or(words, line)
+    if rest:
+        raise TemplateSyntaxError(f"unexpected {rest[0]!r} in condition", line)
+    return cond
+
+
+def _or(words: list[str], line: int) -> tuple[tuple, list[str]]:
+    left, words = _and(words, line)
+    while words and words[0] == "or":
+        right, words = _and(words[1:], line)
+        left = ("or", left, right)
+    return left, words
+
+
+def _and(words: list[str], line: int) -> tuple[tuple, list[str]]:
+    left, words = _not(words, line)
+    while words and words[0] == "and":
+        right, words = _not(words[1:], line)
+        left = ("and", left, right)
+    return left, words
+
+
+def _not(words: list[str], line: int) -> tuple[tuple, list[str]]:
+    if words and words[0] == "not":
+        inner, words = _not(words[1:], line)
+        return ("not", inner), words
+    expr, words = _expr(words, line)
+    return ("value", expr), words
+
+
+# ---------------------------
+# Code generation
+# ---------------------------
+class LogicBlock(NamedTuple):
+    fn: Callable[[Callable[[str], object], Mapping[str, Callable]], str]
+    names: tuple[str, ...]     # variables read through Scope.get, in order of first use
+    filters: tuple[str, ...]
+    code: str                  # the generated Python source, for debugging
+
+
+class _Codegen:
+    def __init__(self):
+        self.lines: list[str] = []
+        self.names: dict[str, str] = {}    # variable -> local holding get(variable)
+        self.filters: dict[str, str] = {}  # filter -> local
+        self.loops: list[str] = []         # loop variables, outermost first
+
+    def emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+
+    def body(self, nodes: list, depth: int) -> None:
+        if not nodes:
+            self.emit(depth, "pass")
+        for node in nodes:
+            if node[0] == "text":
+                self.emit(depth, f"_a({node[1]!r})")
+            elif node[0] == "expr":
+                value = self.value(node[1])
+                self.emit(depth, f"_a({value if node[1][1] else f'_text({value})'})")
+            elif node[0] == "if":
+                for i, (cond, branch) in enumerate(node[1]):
+                    self.emit(depth, f"{'elif' if i else 'if'} {self.condition(cond)}:")
+                    self.body(branch, depth + 1)
+                if node[2] is not None:
+                    self.emit(depth, "else:")
+                    self.body(node[2], depth + 1)
+            else:
+                _, var, expr, loop_body, else_body = node
+                d = len(self.loops)
+                self.emit(depth, f"_s{d} = _items({self.value(expr)})")
+                self.emit(depth, f"_n{d} = len(_s{d})")
+                self.emit(depth, f"for _i{d}, _v{d} in enumerate(_s{d}):")
+                self.loops.append(var)
+                self.body(loop_body, depth + 1)
+                self.loops.pop()
+                if else_body is not None:
+                    self.emit(depth, f"if not _n{d}:")
+                    self.body(else_body, depth + 1)
+
+    def value(self, expr: tuple) -> str:
+        name, filters = expr
+        code = self.variable(name)
+        for f in filters:
+            local = self.filters.setdefault(f, f"f_{f}")
+            code = f"{local}({code})"
+        return code
+
+    def variable(self, name: str) -> str:
+        # Names were checked by the parser: loop.* only inside loops, no other attributes
+        head, _, attr = name.partition(".")
+        if head == "loop":
+            d = len(self.loops) - 1
+            return {"index": f"(_i{d} + 1)", "first": f"(_i{d} == 0)",
+                    "last": f"(_i{d} == _n{d} - 1)", "length": f"_n{d}"}[attr]
+        for d in range(len(self.loops) - 1, -1, -1):
+            if self.loops[d] == name:
+                return f"_v{d}"
+        return self.names.setdefault(name, f"g_{name}")
+
+    def condition(self, cond: tuple) -> str:
+        if cond[0] == "value":
+            if cond[1][0].startswith("loop.") and not cond[1][1]:
+                return self.value(cond[1])  # already a bool / int
+            return f"_truthy({self.value(cond[1])})"
+        if cond[0] == "not":
+            return f"(not {self.condition(cond[1])})"
+        return f"({self.condition(cond[1])} {cond[0]} {self.condition(cond[2])})"
+
+
+@lru_cache(maxsize=1024)
+def compile_block(source: str) -> LogicBlock:
+    """Parse one block / expression (as cut out by find_spans) and compile it to a function."""
+    nodes = _Parser(_tokens(source)).parse()
+    gen = _Codegen()
+    gen.body(nodes, 1)
+    head = ["def _block(get, filters):", "    _out = []", "    _a = _out.append"]
+    head += [f"    {local} = get({name!r})" for name, local in gen.names.items()]
+    head += [f"    {local} = filters[{name!r}]" for name, local in gen.filters.items()]
+    code = "\n".join(head + gen.lines + ["    return ''.join(_out)"])
+    namespace = {"_text": _text, "_truthy": _truthy, "_items": _items}
+    try:
+        compiled = compile(code, "<theme block>", "exec")
+    except SyntaxError as e:  # the parser should never let this through; fail like any malformed block
+        raise TemplateSyntaxError(f"cannot compile block ({e.msg})") from None
+    exec(compiled, namespace)
+    return LogicBlock(namespace["_block"], tuple(gen.names), tuple(gen.filters), code)
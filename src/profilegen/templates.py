@@ -0,0 +1,328 @@
+# templates.py
+from bisect import bisect_right
+import hashlib
+from pathlib import Path
+import re
+import threading
+from typing import BinaryIO, Callable, Iterator
+
+from .template_lang import LogicBlock, Scope, TemplateSyntaxError, compile_block, find_spans
+
+_TAG_RE = re.compile(r"\{\{\s*([#/]?)([a-zA-Z0-9_]+)\s*\}\}")
+
+# Hard-coded handles in stats widget URLs: ?username=foo / ?user=foo / &user=foo
+_HANDLE_RE = re.compile(r"(?:username=|[?&]user=)([^&\"']+)")
+
+# Markers of the stats widgets; a <div> holding both is a stats region
+_STATS_MARKER = "github-readme-stats"
+_STREAK_MARKER = "github-readme-streak-stats"
+
+# Segment kinds
+LITERAL = 0
+SLOT = 1
+HANDLE = 2  # hard-coded GitHub handle; replaced by the target username when known
+STATS = 3   # a whole stats region, when it is replaced (e.g. by locally rendered cards)
+LOGIC = 4   # {% for %} / {% if %} block or {{ x | filter }}, compiled to a function (see template_lang)
+
+CHUNK_SIZE = 64 << 10  # target size of the byte chunks iter_render() yields
+
+
+class CompiledTemplate:
+    """
+    A theme parsed once into (kind, text, in_stats) segments:
+      (LITERAL, "<h1>", False)  -> copied as-is
+      (SLOT, "name", False)     -> replaced by lookup("name") at render time
+      (HANDLE, "mkazemie", True) -> replaced by the GitHub username, if any
+      (LOGIC, "{% if motto %}...{% endif %}", False) -> its compiled function's output
+    Segments inside a stats region are dropped when rendering without stats, or
+    collapsed into one (STATS, "", True) segment when the region is replaced.
+    `digest` is the SHA-256 of the source text, for content-addressed caching.
+    LOGIC segments read variables (lists included) and filters from a Scope;
+    without one they see the plain `lookup` values.
+    iter_render() / write() produce the same document as UTF-8 chunks, from
+    literals encoded once per template, without building it as one string.
+    """
+    __slots__ = (
+        "segments", "digest", "slots", "variables", "has_stats", "has_logic",
+        "_no_stats", "_stats_replaced", "_encoded", "_logic",
+    )
+
+    def __init__(self, segments: tuple[tuple[int, str, bool], ...], digest: str = ""):
+        self.segments = segments
+        self.digest = digest
+        self.slots = tuple(text for kind, text, _ in segments if kind == SLOT)
+        self.has_stats = any(in_stats for _, _, in_stats in segments)
+        self._logic: dict[str, LogicBlock] = {
+            text: compile_block(text) for kind, text, _ in segments if kind == LOGIC
+        }
+        self.has_logic = bool(self._logic)
+        # Every variable the theme reads, placeholders and block variables alike, in order of first use
+        self.variables = tuple(dict.fromkeys(
+            name
+            for kind, text, _ in segments if kind in (SLOT, LOGIC)
+            for name in ((text,) if kind == SLOT else self._logic[text].names)
+        ))
+        self._no_stats = tuple(seg for seg in segments if not seg[2])
+        replaced = []
+        for seg in segments:
+            if not seg[2]:
+                replaced.append(seg)
+            elif not replaced or replaced[-1][0] != STATS:
+                replaced.append((STATS, "", True))
+        self._stats_replaced = tuple(replaced)
+        self._encoded: dict[tuple[bool, bool], tuple[tuple[int, bytes | str], ...]] = {}
+
+    def select(self, include_stats: bool = True, replace_stats: bool = False) -> tuple[tuple[int, str, bool], ...]:
+        """The segments to render for the given stats options."""
+        if not include_stats:
+            return self._no_stats
+        return self._stats_replaced if replace_stats else self.segments
+
+    def block(self, source: str) -> LogicBlock:
+        """The compiled function of a LOGIC segment."""
+        return self._logic[source]
+
+    def render(
+        self,
+        lookup: Callable[[str], str],
+        handle: str = "",
+        include_stats: bool = True,
+        stats_html: str = "",
+        scope: Scope | None = None,
+    ) -> str:
+        """Fill the template; a non-empty `stats_html` stands in for each stats region."""
+        if scope is None and self._logic:
+            scope = Scope(lookup)
+        done: dict[str, str] = {}  # a block repeated in the theme renders the same: evaluate it once
+        parts = []
+        for kind, text, _ in self.select(include_stats, bool(stats_html)):
+            if kind == LITERAL:
+                parts.append(text)
+            elif kind == SLOT:
+                parts.append(lookup(text))
+            elif kind == HANDLE:
+                parts.append(handle or text)
+            elif kind == LOGIC:
+                out = done.get(text)
+                if out is None:
+                    out = done[text] = self._logic[text].fn(*scope)
+                parts.append(out)
+            else:
+                parts.append(stats_html)
+        return "".join(parts)
+
+    def _encoded_segments(self, include_stats: bool, replace_stats: bool) -> tuple[tuple[int, bytes | str], ...]:
+        key = (include_stats, replace_stats)
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            # Literals and default handles as bytes; slot names and block sources stay str
+            encoded = self._encoded[key] = tuple(
+                (kind, text if kind in (SLOT, LOGIC) else text.encode("utf-8"))
+                for kind, text, _ in self.select(include_stats, replace_stats)
+            )
+        return encoded
+
+    def iter_render(
+        self,
+        lookup: Callable[[str], str],
+        handle: str = "",
+        include_stats: bool = True,
+        stats_html: str = "",
+        scope: Scope | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """render() as UTF-8 chunks of about `chunk_size` bytes (a longer single segment is its own chunk)."""
+        if scope is None and self._logic:
+            scope = Scope(lookup)
+        done: dict[str, bytes] = {}
+        handle_bytes = handle.encode("utf-8")
+        stats_bytes = stats_html.encode("utf-8")
+        buf, size = [], 0
+        for kind, data in self._encoded_segments(include_stats, bool(stats_html)):
+            if kind == LITERAL:
+                part = data
+            elif kind == SLOT:
+                part = lookup(data).encode("utf-8")
+            elif kind == HANDLE:
+                part = handle_bytes or data
+            elif kind == LOGIC:
+                part = done.get(data)
+                if part is None:
+                    part = done[data] = self._logic[data].fn(*scope).encode("utf-8")
+            else:
+                part = stats_bytes
+            if len(part) >= chunk_size:
+                if buf:
+                    yield b"".join(buf)
+                    buf, size = [], 0
+                yield part
+                continue
+            buf.append(part)
+            size += len(part)
+            if size >= chunk_size:
+                yield b"".join(buf)
+                buf, size = [], 0
+        if buf:
+            yield b"".join(buf)
+
+    def write(
+        self,
+        fp: BinaryIO,
+        lookup: Callable[[str], str],
+        handle: str = "",
+        include_stats: bool = True,
+        stats_html: str = "",
+        scope: Scope | None = None,
+    ) -> int:
+        """Render into the binary file `fp`; returns the number of bytes written."""
+        written = 0
+        for chunk in self.iter_render(lookup, handle, include_stats, stats_html, scope):
+            fp.write(chunk)
+            written += len(chunk)
+        return written
+
+
+def encode_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """UTF-8 encode `text` piecewise, so a large document is never held twice as bytes."""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size].encode("utf-8")
+
+
+def _div_open_before(low: str, lo: int, hi: int) -> int:
+    """Index of the last '<div>' / '<div ...>' in low[lo:hi], or -1."""
+    while True:
+        i = low.rfind("<div", lo, hi)
+        if i < 0 or low[i + 4:i + 5] in (">", " ", "\t", "\n", "\r"):
+            return i
+        hi = i
+
+
+def _legacy_stats_regions(text: str) -> list[tuple[int, int]]:
+    """
+    Find <div>...github-readme-stats...github-readme-streak-stats...</div> blocks
+    with plain forward scans (the old DOTALL regex could backtrack quadratically).
+    """
+    low = text.lower()
+    regions = []
+    pos = 0
+    while True:
+        a = low.find(_STATS_MARKER, pos)
+        if a < 0:
+            break
+        b = low.find(_STREAK_MARKER, a)
+        end = low.find("</div>", b) if b >= 0 else -1
+        if end < 0:
+            break
+        start = _div_open_before(low, pos, a)
+        if start < 0:
+            pos = a + len(_STATS_MARKER)
+            continue
+        pos = end + len("</div>")
+        regions.append((start, pos))
+    return regions
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    """
+    Split template text into literal chunks, {{placeholder}} slots, stats handles
+    and {% %} blocks. Stats regions are either marked explicitly with
+    {{#stats}}...{{/stats}} or detected from the widget <div> used by existing
+    themes; a region that starts or ends inside a block is not one.
+    Raises TemplateSyntaxError for malformed blocks.
+    """
+    spans = find_spans(text) if "{%" in text or "|" in text else []
+    for start, end in spans:
+        try:
+            compile_block(text[start:end])
+        except TemplateSyntaxError as e:
+            raise TemplateSyntaxError(e.message, text.count("\n", 0, start) + e.line) from None
+    span_starts = [start for start, _ in spans]
+
+    def in_span(pos: int) -> bool:
+        i = bisect_right(span_starts, pos) - 1
+        return i >= 0 and pos < spans[i][1]
+
+    def inside_span(pos: int) -> bool:
+        return in_span(pos) and pos not in span_starts
+
+    tags = [(start, end, LOGIC, text[start:end]) for start, end in spans]
+    edges = []
+    open_at = None
+    for m in _TAG_RE.finditer(text):
+        if in_span(m.start()):
+            continue
+        sigil, name = m.groups()
+        if not sigil:
+            tags.append((m.start(), m.end(), SLOT, name))
+        elif name == "stats" and sigil == "#" and open_at is None:
+            tags.append((m.start(), m.end(), None, name))
+            open_at = m.end()
+        elif name == "stats" and sigil == "/" and open_at is not None:
+            tags.append((m.start(), m.end(), None, name))
+            edges += [open_at, m.start()]
+            open_at = None
+    if not edges:
+        for start, end in _legacy_stats_regions(text):
+            if not (inside_span(start) or inside_span(end)):
+                edges += [start, end]
+    tags.sort()
+
+    def in_stats(pos: int) -> bool:
+        return bisect_right(edges, pos) % 2 == 1
+
+    segments = []
+
+    def emit_literal(start: int, end: int) -> None:
+        cuts = [start] + [e for e in edges if start < e < end] + [end]
+        for a, b in zip(cuts, cuts[1:]):
+            stats = in_stats(a)
+            pos = a
+            for m in _HANDLE_RE.finditer(text, a, b):
+                segments.append((LITERAL, text[pos:m.start(1)], stats))
+                segments.append((HANDLE, m.group(1), stats))
+                pos = m.end()
+            if pos < b:
+                segments.append((LITERAL, text[pos:b], stats))
+
+    pos = 0
+    for start, end, kind, name in tags:
+        if start > pos:
+            emit_literal(pos, start)
+        if kind is not None:
+            segments.append((kind, name, in_stats(start)))
+        pos = end
+    if pos < len(text):
+        emit_literal(pos, len(text))
+    return CompiledTemplate(
+        tuple(seg for seg in segments if seg[1] or seg[0] != LITERAL),
+        digest=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+    )
+
+
+# ---------------------------
+# Process-wide cache: path -> (mtime_ns, size, compiled)
+# ---------------------------
+_cache: dict[Path, tuple[int, int, CompiledTemplate]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_template(path: Path) -> CompiledTemplate:
+    """
+    Return the compiled template for `path`, re-reading the file only when its
+    mtime or size changed. Raises FileNotFoundError if the file is missing.
+    """
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _cache.get(path)
+    if entry is not None and entry[:2] == key:
+        return entry[2]
+
+    compiled = compile_template(path.read_text(encoding="utf-8"))
+    with _cache_lock:
+        _cache[path] = (*key, compiled)
+    return compiled
+
+
+def clear_template_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,333 @@
+# theme_lint.py
+"""
+Check contributed themes before they ship.
+
+    python src/theme_lint.py                        # every theme in src/themes
+    python src/theme_lint.py my_theme.txt --allow company --report lint.json
+
+Each theme is compiled and rendered on a process pool, against a matrix of
+fixture profiles (empty, typical, maximal, unicode, huge lists) times the three
+stats options (kept, dropped, replaced by local cards). Errors:
+  - a template syntax error, or template syntax left in the output ({{#foo}}, {{ name }, ...);
+  - unknown placeholders, which render as a space (--allow NAME for batch-only columns);
+  - stats widgets that stay in the README without stats (outside {{#stats}}...{{/stats}}
+    or the widget <div>), or unbalanced {{#stats}} / {{/stats}} tags;
+  - a compile or render time (median of --runs) or an output size over budget;
+    renders still running after RENDER_LIMIT_S are aborted (where SIGALRM exists).
+Warnings: profile fields the theme never shows. Exits 1 on errors (and on
+warnings with --strict), or when a theme does not finish within --timeout.
+"""
+import argparse
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import re
+import signal
+import statistics
+import sys
+import threading
+import time
+
+from .generate_readme import TEMPLATES_DIR, RenderContext, _render_template
+from .profile_input import ProfileInput
+from .template_lang import TemplateSyntaxError
+from .templates import _STATS_MARKER, _STREAK_MARKER, _TAG_RE, HANDLE, compile_template
+from .theme_registry import BLOCK_PLACEHOLDERS
+
+# Fixture -> (render budget in ms, median of --runs; output budget in bytes)
+BUDGETS = {
+    "empty": (5.0, 64 << 10),
+    "typical": (5.0, 64 << 10),
+    "maximal": (10.0, 128 << 10),
+    "unicode": (5.0, 64 << 10),
+    "huge_lists": (50.0, 1 << 20),
+}
+COMPILE_BUDGET_MS = 20.0
+MAX_THEME_BYTES = 256 << 10
+RENDER_LIMIT_S = 2.0  # measuring one fixture (warm-up + --runs renders) is aborted after this
+TIMEOUT_S = 120.0     # for the whole run; themes still rendering by then fail
+
+STATS_CARDS = '<div id="theme-lint-stats-cards"></div>'
+CONTEXTS = {
+    "stats": {},
+    "no_stats": {"include_stats": False},
+    "cards": {"stats_cards": STATS_CARDS},
+}
+
+# Every name a theme can read, and the profile fields a user fills in
+KNOWN = frozenset({*ProfileInput().text_values(), *BLOCK_PLACEHOLDERS, "skills", "tech_stack"})
+INPUT_FIELDS = {
+    # field -> the names that show it
+    "name": ("name",), "title": ("title",), "email": ("email",), "motto": ("motto",), "summary": ("summary",),
+    "linkedin": ("linkedin",), "github": ("github", "github_username"), "instagram": ("instagram",),
+    "website": ("website",), "youtube": ("youtube",), "facebook": ("facebook", "Facebook"),
+    "skills": ("skills", "skills_block"), "tech_stack": ("tech_stack", "tech_stack_block"),
+}
+
+_LEFTOVER_RE = re.compile(r"\{\{.{0,40}?(?:\}\}|$)|\{%.{0,40}?(?:%\}|$)", re.MULTILINE)
+
+
+def fixtures() -> dict[str, ProfileInput]:
+    techs = ("Python", "Docker", "Kubernetes", "PostgreSQL", "React", "Go", "Rust", "TypeScript", "AWS", "Linux")
+    links = {
+        "linkedin": "https://www.linkedin.com/in/ada", "github": "https://github.com/ada",
+        "instagram": "https://instagram.com/ada", "website": "https://ada.example.com",
+        "youtube": "https://youtube.com/@ada", "facebook": "https://facebook.com/ada",
+    }
+    return {
+        "empty": ProfileInput(),
+        "typical": ProfileInput(
+            name="Ada Lovelace", title="Engineer", email="ada@example.com", motto="Keep shipping",
+            summary="I build analytical engines.", github="https://github.com/ada",
+            skills=("Analysis", "Engines"), tech_stack=techs[:5],
+        ),
+        "maximal": ProfileInput(
+            name="Ada " * 20, title="Principal engineer, " * 10, email="ada.lovelace@example.com",
+            motto="Measure twice " * 20, github_username="ada-lovelace",
+            summary="\n\n".join(f"Paragraph {i}: *emphasis*, `code`, [a link](https://example.com/{i})." * 8
+                                for i in range(10)),
+            skills=tuple(f"Skill {i}" for i in range(50)), tech_stack=techs * 5, **links,
+        ),
+        "unicode": ProfileInput(
+            name="Zoë Ångström 李小龙 🚀", title="مهندس نرم‌افزار", email="zoë@exämple.com",
+            motto="“Quotes”, <b>tags</b> & *stars* _under_ #hash | pipes", summary="Ñandú 👩🏽‍💻 é́ ​ ❤️",
+            github="https://github.com/zoë", skills=("Ελληνικά", "日本語", "C++ & C#"), tech_stack=("C++", "C#", "Node.js"),
+        ),
+        "huge_lists": ProfileInput(
+            name="Ada", github="https://github.com/ada",
+            skills=tuple(f"Skill {i}" for i in range(2000)),
+            tech_stack=tuple(f"{techs[i % len(techs)]} {i}" for i in range(2000)),
+        ),
+    }
+
+
+@dataclass
+class ThemeReport:
+    name: str
+    path: str
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    compile_ms: float | None = None
+    renders: dict[str, dict] = field(default_factory=dict)  # "fixture/context" -> {"ms", "bytes"}
+
+    def ok(self, strict: bool = False) -> bool:
+        return not self.errors and not (strict and self.warnings)
+
+    def slowest(self) -> tuple[str, dict] | None:
+        return max(self.renders.items(), key=lambda kv: kv[1]["ms"], default=None)
+
+    def largest(self) -> tuple[str, dict] | None:
+        return max(self.renders.items(), key=lambda kv: kv[1]["bytes"], default=None)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _line(source: str, pos: int) -> int:
+    return source.count("\n", 0, pos) + 1
+
+
+class _Aborted(Exception):
+    pass
+
+
+@contextmanager
+def _time_limit(seconds: float):
+    """Raise _Aborted in the block after `seconds`; a no-op without SIGALRM or off the main thread."""
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def abort(signum, frame):
+        raise _Aborted
+
+    previous = signal.signal(signal.SIGALRM, abort)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _median_ms(fn, runs: int, budget_ms: float) -> float:
+    """Median wall time of fn() over `runs` runs after a warm-up; a warm-up far over budget is not repeated."""
+    t0 = time.perf_counter()
+    fn()
+    first = (time.perf_counter() - t0) * 1e3
+    if first > budget_ms * 10:
+        return first
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+
+def lint_theme(path: str, allow: tuple[str, ...] = (), runs: int = 5, scale: float = 1.0) -> ThemeReport:
+    # Top-level so it can be pickled into pool workers
+    report = ThemeReport(Path(path).stem, path)
+    source = Path(path).read_text(encoding="utf-8")
+    if len(source.encode("utf-8")) > MAX_THEME_BYTES * scale:
+        report.errors.append(f"theme is {len(source.encode('utf-8')) >> 10} KiB (limit {MAX_THEME_BYTES >> 10} KiB)")
+        return report
+    try:
+        template = compile_template(source)
+    except TemplateSyntaxError as e:
+        report.errors.append(f"syntax error: {e}")
+        return report
+    report.compile_ms = round(_median_ms(lambda: compile_template(source), runs, COMPILE_BUDGET_MS * scale), 3)
+    if report.compile_ms > COMPILE_BUDGET_MS * scale:
+        report.errors.append(f"compiles in {report.compile_ms:.1f} ms (budget {COMPILE_BUDGET_MS * scale:.0f} ms)")
+
+    # Placeholders
+    slot_lines: dict[str, int] = {}
+    for m in _TAG_RE.finditer(source):
+        if not m.group(1):
+            slot_lines.setdefault(m.group(2), _line(source, m.start()))
+    for name in template.variables:
+        if name not in KNOWN and name not in allow:
+            where = f"line {slot_lines[name]}" if name in slot_lines else "in a {% %} block"
+            report.errors.append(f"unknown placeholder {name!r} ({where}) renders as a space")
+    used = set(template.variables)
+    if any(kind == HANDLE for kind, _, _ in template.segments):
+        used.add("github_username")  # hard-coded handles in widget URLs follow the user
+    unused = [input_field for input_field, names in INPUT_FIELDS.items() if not used.intersection(names)]
+    if unused:
+        report.warnings.append(f"never shows the profile's {', '.join(unused)}")
+
+    # Stats regions
+    tags = [m.group(1) for m in _TAG_RE.finditer(source) if m.group(1) and m.group(2) == "stats"]
+    depth = 0
+    for sigil in tags:
+        depth += 1 if sigil == "#" else -1
+        if depth not in (0, 1):
+            break
+    if depth:
+        report.errors.append("unbalanced {{#stats}} / {{/stats}} tags (the markers are ignored)")
+
+    # Renders; output problems are reported once, with the renders they appear in
+    found: dict[str, list[str]] = {}
+    for fixture, profile in fixtures().items():
+        render_budget, size_budget = (b * scale for b in BUDGETS[fixture])
+        for context, options in CONTEXTS.items():
+            label = f"{fixture}/{context}"
+            ctx = RenderContext(report.name, **options)
+            try:
+                with _time_limit(RENDER_LIMIT_S * scale):
+                    out = _render_template(template, profile, ctx)
+                    ms = _median_ms(lambda: _render_template(template, profile, ctx), runs, render_budget)
+            except _Aborted:
+                report.errors.append(f"{label}: still rendering after {RENDER_LIMIT_S * scale:.0f} s (aborted)")
+                break  # the other stats options cost the same
+            except Exception as e:
+                report.errors.append(f"{label}: render failed: {type(e).__name__}: {e}")
+                continue
+            size = len(out.encode("utf-8"))
+            report.renders[label] = {"ms": round(ms, 3), "bytes": size}
+            if ms > render_budget:
+                report.errors.append(f"{label}: renders in {ms:.1f} ms (budget {render_budget:.0f} ms)")
+            if size > size_budget:
+                report.errors.append(f"{label}: {size >> 10} KiB of output (budget {int(size_budget) >> 10} KiB)")
+            problems = []
+            if context != "stats":
+                low = out.lower()
+                if _STATS_MARKER in low or _STREAK_MARKER in low:
+                    problems.append("stats widgets left in the README; wrap them in {{#stats}}...{{/stats}}")
+            if context == "cards" and template.has_stats and STATS_CARDS not in out:
+                problems.append("the stats region was not replaced by the local cards")
+            for m in _LEFTOVER_RE.finditer(out):
+                pos = source.find(m.group(0))
+                where = f" (line {_line(source, pos)})" if pos >= 0 else ""
+                problems.append(f"template syntax left in the output: {m.group(0)!r}{where}")
+            for message in problems:
+                labels = found.setdefault(message, [])
+                if label not in labels:
+                    labels.append(label)
+    renders = len(BUDGETS) * len(CONTEXTS)
+    for message, labels in found.items():
+        where = ", ".join(labels) if len(labels) <= 3 else f"{len(labels)} of {renders} renders"
+        report.errors.append(f"{message} [{where}]")
+    return report
+
+
+def theme_paths(targets: list[Path]) -> list[Path]:
+    """The .txt themes among `targets` (files, or directories to scan); TEMPLATES_DIR when empty."""
+    paths = []
+    for target in targets or [TEMPLATES_DIR]:
+        paths += sorted(target.glob("*.txt")) if target.is_dir() else [target]
+    return paths
+
+
+def lint_themes(
+    paths: list[Path],
+    allow: tuple[str, ...] = (),
+    runs: int = 5,
+    scale: float = 1.0,
+    workers: int | None = None,
+    timeout: float = TIMEOUT_S,
+) -> list[ThemeReport]:
+    """
+    Lint `paths` on a process pool, one theme per task. A theme still running after
+    `timeout` seconds (for the whole run) is reported as failed and its worker killed.
+    """
+    if not paths:
+        return []
+    pool = multiprocessing.Pool(min(workers or os.cpu_count() or 1, len(paths)))
+    try:
+        pending = [(p, pool.apply_async(lint_theme, (str(p), allow, runs, scale))) for p in paths]
+        deadline = time.monotonic() + timeout
+        reports = []
+        for path, result in pending:
+            try:
+                reports.append(result.get(max(0.0, deadline - time.monotonic())))
+            except multiprocessing.TimeoutError:
+                reports.append(ThemeReport(path.stem, str(path), errors=[f"not finished within {timeout:.0f} s"]))
+            except Exception as e:
+                reports.append(ThemeReport(path.stem, str(path), errors=[f"{type(e).__name__}: {e}"]))
+    finally:
+        pool.terminate()  # stops runaway renders; finished pools exit the same way
+        pool.join()
+    return reports
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Check themes for broken placeholders, stats regions and budgets.")
+    ap.add_argument("themes", type=Path, nargs="*", help="Theme files or directories (default: the bundled themes)")
+    ap.add_argument("--allow", action="append", default=[], metavar="NAME",
+                    help="Placeholder filled by extra batch columns, not an error (repeatable)")
+    ap.add_argument("--runs", type=int, default=5, help="Timed renders per fixture (median)")
+    ap.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow or loaded machines)")
+    ap.add_argument("--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    ap.add_argument("--timeout", type=float, default=TIMEOUT_S, help="Seconds for the whole run")
+    ap.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    ap.add_argument("--report", type=Path, default=None, help="Write the JSON report here")
+    args = ap.parse_args(argv)
+
+    paths = theme_paths(args.themes)
+    reports = lint_themes(paths, tuple(args.allow), args.runs, args.scale, args.workers, args.timeout)
+    for r in reports:
+        summary = ""
+        slowest, largest = r.slowest(), r.largest()
+        if slowest and largest:
+            summary = (f"  compile {r.compile_ms:.2f} ms, slowest render {slowest[1]['ms']:.2f} ms ({slowest[0]}), "
+                       f"largest {largest[1]['bytes'] / 1024:.1f} KiB ({largest[0]})")
+        print(f"{r.name:20s} {'ok' if r.ok(args.strict) else 'FAIL':4s}{summary}")
+        for e in r.errors:
+            print(f"  error: {e}")
+        for w in r.warnings:
+            print(f"  warning: {w}")
+    if args.report:
+        args.report.write_text(json.dumps([r.as_dict() for r in reports], indent=2, ensure_ascii=False),
+                               encoding="utf-8")
+    failed = sum(not r.ok(args.strict) for r in reports)
+    print(f"{len(reports)} themes, {failed} failed", file=sys.stderr)
+    return 1 if failed or not reports else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# theme_pack.py
+"""
+Precompiled theme pack: every theme of a directory, already split into
+segments, in one binary file that is opened with mmap.
+
+    python src/theme_pack.py build src/themes themes.pack
+    python src/theme_pack.py list themes.pack
+
+Worker processes that open the same pack share its pages through the OS page
+cache, and only the themes actually requested are decoded (once per process).
+Point PROFILEGEN_THEME_PACK at a pack to serve its themes alongside the loose
+src/themes/*.txt files (a loose file of the same name wins).
+
+Layout (little-endian):
+    header   magic "PGTP", version u16, reserved u16, theme count u32, index offset u64
+    theme    digest 32s, segment count u32, text size u32 (bytes), flags u8 (1 = has stats),
+             then per segment: kind u8, in_stats u8, text offset u32, text length u32 (code points),
+             then the UTF-8 text all segments slice into
+    index    per theme: name length u16, record offset u64, record length u64, name (UTF-8)
+"""
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+import threading
+
+from .templates import CompiledTemplate, compile_template
+
+MAGIC = b"PGTP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIQ")
+_THEME = struct.Struct("<32sIIB3x")
+_SEGMENT = struct.Struct("<BBxxII")
+_INDEX = struct.Struct("<HQQ")
+
+_HAS_STATS = 1
+
+
+def _encode_theme(template: CompiledTemplate) -> bytes:
+    table, texts, pos = [], [], 0
+    for kind, text, in_stats in template.segments:
+        table.append(_SEGMENT.pack(kind, in_stats, pos, len(text)))
+        texts.append(text)
+        pos += len(text)
+    blob = "".join(texts).encode("utf-8")
+    header = _THEME.pack(
+        bytes.fromhex(template.digest), len(table), len(blob), _HAS_STATS if template.has_stats else 0
+    )
+    return header + b"".join(table) + blob
+
+
+def build_pack(themes_dir: Path, out: Path) -> int:
+    """Compile every <name>.txt in `themes_dir` into `out`; returns the number of themes."""
+    themes = sorted(Path(themes_dir).glob("*.txt"))
+    records, index = [], []
+    offset = _HEADER.size
+    for path in themes:
+        record = _encode_theme(compile_template(path.read_text(encoding="utf-8")))
+        record += b"\0" * (-len(record) % 8)  # keep records 8-byte aligned
+        records.append(record)
+        index.append((path.stem.encode("utf-8"), offset, len(record)))
+        offset += len(record)
+
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(index), offset))
+        f.writelines(records)
+        for name, rec_offset, length in index:
+            f.write(_INDEX.pack(len(name), rec_offset, length) + name)
+    os.replace(tmp, out)  # processes with the old pack mapped keep reading the old file
+    return len(index)
+
+
+class ThemePack:
+    """Read-only view of a pack file; get() decodes a theme on first use and keeps it."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, index_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} theme pack")
+        self._index: dict[str, tuple[int, int]] = {}
+        pos = index_offset
+        for _ in range(count):
+            name_len, offset, length = _INDEX.unpack_from(self._mm, pos)
+            pos += _INDEX.size
+            self._index[self._mm[pos:pos + name_len].decode("utf-8")] = (offset, length)
+            pos += name_len
+        self._decoded: dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> list[str]:
+        return sorted(self._index)
+
+    def get(self, name: str) -> CompiledTemplate:
+        """Raises KeyError for themes not in the pack."""
+        template = self._decoded.get(name)
+        if template is not None:
+            return template
+        offset, _ = self._index[name]
+        digest, count, text_size, _ = _THEME.unpack_from(self._mm, offset)
+        table = offset + _THEME.size
+        blob = table + count * _SEGMENT.size
+        with memoryview(self._mm) as mv:
+            text = str(mv[blob:blob + text_size], "utf-8")  # one decode; segments are slices of it
+            segments = tuple(
+                (kind, text[start:start + length], bool(in_stats))
+                for kind, in_stats, start, length in _SEGMENT.iter_unpack(mv[table:blob])
+            )
+        template = CompiledTemplate(segments, digest=digest.hex())
+        with self._lock:
+            return self._decoded.setdefault(name, template)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse  # not needed by the workers that only read packs
+
+    ap = argparse.ArgumentParser(description="Build or inspect a precompiled theme pack.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compile a themes directory into a pack")
+    build.add_argument("themes_dir", type=Path)
+    build.add_argument("out", type=Path)
+    show = sub.add_parser("list", help="List the themes in a pack")
+    show.add_argument("pack", type=Path)
+    args = ap.parse_args(argv)
+
+    if args.command == "build":
+        count = build_pack(args.themes_dir, args.out)
+        print(f"{count} themes -> {args.out} ({args.out.stat().st_size} bytes)", file=sys.stderr)
+        return 0
+    pack = ThemePack(args.pack)
+    for name in pack.names():
+        template = pack.get(name)
+        print(f"{name}\t{len(template.segments)} segments\t{len(template.variables)} variables"
+              f"\t{'stats' if template.has_stats else '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
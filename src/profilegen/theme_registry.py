@@ -0,0 +1,150 @@
+# theme_registry.py
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+import threading
+import time
+
+from .templates import CompiledTemplate, load_template
+from .theme_pack import ThemePack
+
+BLOCK_PLACEHOLDERS = ("skills_block", "tech_stack_block")
+
+
+@dataclass(frozen=True)
+class ThemeInfo:
+    """A theme plus what it declares: its placeholders, dynamic blocks and stats region."""
+    name: str
+    path: Path
+    template: CompiledTemplate
+    placeholders: tuple[str, ...]  # unique, in order of first use (block variables included)
+    blocks: tuple[str, ...]
+    has_stats: bool
+
+
+def _signature(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _info(name: str, path: Path, template: CompiledTemplate) -> ThemeInfo:
+    placeholders = template.variables
+    return ThemeInfo(
+        name=name,
+        path=path,
+        template=template,
+        placeholders=placeholders,
+        blocks=tuple(b for b in BLOCK_PLACEHOLDERS if b in placeholders),
+        has_stats=template.has_stats,
+    )
+
+
+class ThemeRegistry:
+    """
+    Index of <name>.txt themes in one directory, optionally backed by a theme pack
+    (see theme_pack) whose themes are served unless a loose file shadows them.
+    The directory is scanned once and then re-checked at most every `poll_interval`
+    seconds: a changed directory mtime triggers a rescan (themes added/removed), and
+    edited files are recompiled on next use. A rebuilt pack is reopened the same
+    way. Between checks lookups touch no files.
+    """
+
+    def __init__(self, themes_dir: Path, poll_interval: float = 2.0, pack: Path | None = None):
+        self.themes_dir = Path(themes_dir)
+        self.poll_interval = poll_interval
+        self.pack_path = Path(pack) if pack else None
+        self._lock = threading.Lock()
+        self._paths: dict[str, Path] = {}
+        self._infos: dict[str, tuple[tuple[int, int], ThemeInfo]] = {}
+        self._dir_mtime: int | None = None
+        self._pack: ThemePack | None = None
+        self._pack_sig: tuple[int, int] | None = None
+        self._checked_at = float("-inf")
+
+    def refresh(self, force: bool = False) -> None:
+        if not force and time.monotonic() - self._checked_at < self.poll_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked_at < self.poll_interval:
+                return  # another thread refreshed while we waited for the lock
+            try:
+                self._rescan()
+            finally:
+                # Only now: concurrent callers must not skip the refresh before the index is filled
+                self._checked_at = now
+
+    def _rescan(self) -> None:
+        self._rescan_pack()
+        try:
+            dir_mtime = self.themes_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._paths, self._dir_mtime = {}, None
+            dir_mtime = None
+        if dir_mtime is not None and dir_mtime != self._dir_mtime:
+            self._dir_mtime = dir_mtime
+            self._paths = {p.stem: p for p in self.themes_dir.glob("*.txt")}
+        for name, (sig, info) in list(self._infos.items()):
+            path = self._paths.get(name)
+            if info.path == self.pack_path:
+                # Pack themes go stale when the pack changes or a loose file now shadows them
+                stale = path is not None or sig != self._pack_sig
+            else:
+                try:
+                    stale = path is None or _signature(path) != sig
+                except FileNotFoundError:
+                    stale = True
+            if stale:
+                del self._infos[name]
+
+    def _rescan_pack(self) -> None:
+        if self.pack_path is None:
+            return
+        try:
+            sig = _signature(self.pack_path)
+        except FileNotFoundError:
+            self._pack, self._pack_sig = None, None
+            return
+        if sig != self._pack_sig:
+            # The old mapping is left to the garbage collector: a ThemeInfo may still be in use
+            self._pack, self._pack_sig = ThemePack(self.pack_path), sig
+
+    def names(self) -> list[str]:
+        self.refresh()
+        pack = self._pack
+        return sorted(self._paths.keys() | set(pack.names() if pack else ()))
+
+    def get(self, name: str) -> ThemeInfo:
+        """Raises FileNotFoundError for unknown themes."""
+        self.refresh()
+        entry = self._infos.get(name)
+        if entry is not None:
+            return entry[1]
+
+        path = self._paths.get(name)
+        pack, pack_sig = self._pack, self._pack_sig
+        if path is None:
+            if pack is None or name not in pack:
+                raise FileNotFoundError(f"Theme file not found: {self.themes_dir / f'{name}.txt'}")
+            sig, info = pack_sig, _info(name, pack.path, pack.get(name))
+        else:
+            try:
+                sig = _signature(path)
+                template = load_template(path)
+            except FileNotFoundError:  # removed since the last scan
+                raise FileNotFoundError(f"Theme file not found: {path}") from None
+            info = _info(name, path, template)
+        with self._lock:
+            self._infos[name] = (sig, info)
+        return info
+
+    def __contains__(self, name: str) -> bool:
+        self.refresh()
+        pack = self._pack
+        return name in self._paths or (pack is not None and name in pack)
+
+
+@lru_cache(maxsize=None)
+def registry_for(themes_dir: Path, pack: Path | None = None) -> ThemeRegistry:
+    """The process-wide registry for a themes directory (and optional theme pack)."""
+    return ThemeRegistry(themes_dir, pack=pack)
@@ -0,0 +1,8 @@
+# publish.py
+"""`python src/publish.py ...` from a checkout; installed, the same CLI is `profilegen-publish` (see profilegen.publish)."""
+import sys
+
+from profilegen.publish import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,56 +1,256 @@
+from contextlib import nullcontext
+import io
+import os
+import time
+import zipfile
 import streamlit as st
 from pathlib import Path
-import re  # needed to strip the stats block
-from generate_readme import generate_readme  # no LOGO_MAP import
+from profilegen.badge_svg import Asset, asset_files, inline_assets
+from profilegen.chip_store import ChipStore
+from profilegen.generate_readme import TEMPLATES_DIR, THEME_PACK, RenderContext
+from profilegen.html_render import get_renderer, html_page
+from profilegen.link_check import BROKEN, OK, LinkCache, check_profile_links
+from profilegen.live_preview import LivePreview
+from profilegen.local_stats import collect_stats, stats_cards
+from profilegen import metrics
+from profilegen.profile_input import ProfileInput
+from profilegen.render_cache import RenderCache
+from profilegen.template_lang import TemplateSyntaxError
+from profilegen.templates import encode_chunks
+from profilegen.theme_registry import ThemeRegistry, registry_for
+
+
+@st.cache_resource
+def _render_cache() -> RenderCache:
+    """One cache per server process, shared by all sessions (disk tier if PROFILEGEN_CACHE_DB is set)."""
+    disk_path = os.environ.get("PROFILEGEN_CACHE_DB")
+    return RenderCache(disk_path=Path(disk_path) if disk_path else None)
+
+
+@st.cache_resource
+def _theme_registry() -> ThemeRegistry:
+    """Scanned once per server process; picks up added/edited themes by mtime polling."""
+    return registry_for(TEMPLATES_DIR, THEME_PACK)
+
+
+@st.cache_resource
+def _link_cache() -> LinkCache:
+    """Link check results, shared by all sessions for link_check.LINK_TTL_S."""
+    return LinkCache()
+
+
+LIVE_PREVIEW_DEBOUNCE_S = 0.4
+
+
+BADGE_MODE_LABELS = {
+    "remote": "shields.io (online)",
+    "local": "Local SVG per tech",
+    "strip": "Single SVG strip",
+}
+
+
+_LINK_LABELS = {"github": "GitHub", "linkedin": "LinkedIn", "youtube": "YouTube"}
+
+
+def _show_link_check(profile: ProfileInput) -> None:
+    with st.spinner("Checking links..."), metrics.span("ui.link_check"):
+        # Visitors' URLs: nothing on the server's own network is contacted
+        results = check_profile_links(profile, cache=_link_cache(), public_only=True)
+    if not results:
+        st.info("No links to check.")
+    for field, result in results.items():
+        label = f"**{_LINK_LABELS.get(field, field.capitalize())}**: `{result.url}`"
+        if result.verdict == OK:
+            st.success(f"{label} works" + (f" ({result.detail})" if result.detail else ""))
+        elif result.verdict == BROKEN:
+            st.error(f"{label} is broken: {result.detail}")
+        else:
+            st.warning(f"{label} could not be verified: {result.detail}")
+
+
+def _preview_html(output: str, theme: str, assets: tuple[Asset, ...] = ()) -> str:
+    """
+    The README as HTML, rendered here rather than by the browser: chunk parses are cached
+    per theme, so only chunks with changed values are parsed again. The render's local
+    SVGs (`assets`) are inlined.
+    """
+    with metrics.span("ui.preview_html"):
+        body = get_renderer().render(output, _theme_registry().get(theme).template.digest)
+    with metrics.span("ui.inline_assets"):
+        return inline_assets(body, assets)
+
+
+def _readme_zip(output: str, assets: dict[str, bytes]) -> bytes:
+    """README.md plus the locally generated SVGs (badges, stats cards) it references."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open("README.md", "w") as f:
+            f.writelines(encode_chunks(output))
+        for member, data in assets.items():
+            zf.writestr(member, data)
+    return buf.getvalue()
+
+
+def _stats_roots() -> tuple[Path, ...]:
+    """
+    Directories visitors may scan for local stats: PROFILEGEN_STATS_ROOTS, separated by
+    os.pathsep. Unset, the option is hidden: the server's filesystem is not for browsing.
+    """
+    configured = os.environ.get("PROFILEGEN_STATS_ROOTS", "")
+    return tuple(Path(r.strip()).expanduser().resolve() for r in configured.split(os.pathsep) if r.strip())
+
+
+def _local_stats_form(allowed: tuple[Path, ...]) -> tuple[str, tuple[Asset, ...]]:
+    """Scan local clones into stats cards; the cards are kept for the session until the next scan."""
+    with st.container(border=True):
+        c1, c2 = st.columns(2)
+        roots = c1.text_input("Folders with your git clones (comma-separated)", key="stats_roots",
+                              placeholder=str(allowed[0]),
+                              help="Within: " + ", ".join(str(r) for r in allowed))
+        authors = c2.text_input("Your commit emails or names (comma-separated)", key="stats_authors",
+                                help="Only these authors' commits count toward streaks. Empty counts all commits.")
+        if st.button("Scan repositories", key="stats_scan", disabled=not roots.strip()):
+            # Relative folders are taken from the first allowed root; anything resolving outside them is refused
+            paths = [(allowed[0] / r.strip()).resolve() for r in roots.split(",") if r.strip()]
+            outside = [p for p in paths if not any(p.is_relative_to(root) for root in allowed)]
+            if outside:
+                st.error("Only folders within " + ", ".join(f"`{r}`" for r in allowed) + " can be scanned.")
+            else:
+                with st.spinner("Scanning repositories..."):
+                    stats = collect_stats(paths, authors.split(","))
+                st.session_state.stats_cards = stats_cards(stats)
+                st.session_state.stats_summary = (
+                    f"{stats.repos} repositories ({stats.scanned} rescanned), {stats.commits} commits"
+                )
+        if "stats_summary" in st.session_state:
+            st.caption(st.session_state.stats_summary)
+    return st.session_state.get("stats_cards", ("", ()))
+
+
+def _show_live_preview(theme: str, profile: ProfileInput, ctx: RenderContext, show_raw: bool):
+    """
+    Incremental preview: only blocks whose inputs changed are re-rendered.
+    Rapid edits are debounced; a newer rerun interrupts the wait, so stale states are skipped.
+    """
+    live = st.session_state.setdefault("live_preview", LivePreview(debounce=LIVE_PREVIEW_DEBOUNCE_S))
+    template = _theme_registry().get(theme).template
+    with st.container(border=True):
+        st.markdown("#### Live preview")
+        pending = live.pending(template, profile, ctx)
+        if pending:
+            time.sleep(live.wait_s())
+        status = st.empty()  # Streamlit stops here if a newer rerun arrived during the wait
+        if pending:
+            live.update(template, profile, ctx)
+        status.caption(f"Rendered in {live.last_render_s * 1000:.1f} ms")
+        st.html(_preview_html(live.output, theme, live.assets))
+    if show_raw:
+        st.code(live.output, language="markdown")
 
 # ---------------------------
 # Helpers for "chips" inputs
 # ---------------------------
-def _norm(s: str) -> str:
-    return (s or "").strip()
+CHIPS_PER_PAGE = 24  # widgets per rerun stay bounded however long the list gets
 
-def _contains_case_insensitive(lst, item) -> bool:
-    return _norm(item).lower() in {x.lower() for x in lst}
+def _on_bulk_import(state_key: str, text_key: str):
+    added = st.session_state[state_key].add_many(st.session_state[text_key])
+    st.session_state[text_key] = ""
+    st.session_state[f"{state_key}_import_msg"] = f"Added {added} new item(s)."
 
-def _add_to_list(state_key: str, value: str):
-    value = _norm(value)
-    if not value:
-        return
-    lst = st.session_state[state_key]
-    if not _contains_case_insensitive(lst, value):
-        lst.append(value)
+def _set_page(page_key: str, page: int):
+    st.session_state[page_key] = page
 
-def _remove_from_list(state_key: str, index: int):
-    st.session_state[state_key].pop(index)
+def _render_bulk_import(state_key: str, label: str):
+    """Paste a comma/newline-separated list; duplicates are skipped in one pass."""
+    if not st.toggle(f"Paste a list of {label.lower()}", key=f"{state_key}_bulk_open"):
+        return
+    text_key = f"{state_key}_bulk_text"
+    st.text_area("One per line, or separated by commas", key=text_key, height=100)
+    st.button("Import", key=f"{state_key}_bulk_btn", on_click=_on_bulk_import, args=(state_key, text_key))
+    msg = st.session_state.pop(f"{state_key}_import_msg", None)
+    if msg:
+        st.caption(msg)
 
 def _render_chips(state_key: str, label: str):
-    """Render compact, clickable chips that remove on click."""
-    items = st.session_state[state_key]
-    if not items:
+    """Render compact, clickable chips that remove on click, one page at a time."""
+    store: ChipStore = st.session_state[state_key]
+    if not len(store):
         st.caption(f"No {label.lower()} added yet.")
         return
 
+    items = store.items()
+    pages = (len(items) - 1) // CHIPS_PER_PAGE + 1
+    page_key = f"{state_key}_page"
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+
     # More, narrower columns so chips wrap nicely in a compact grid
     chip_cols = st.columns(6, gap="small")
-    for i, item in enumerate(items):
-        col = chip_cols[i % len(chip_cols)]
-        with col:
+    for i, (item_id, item) in enumerate(items[page * CHIPS_PER_PAGE:(page + 1) * CHIPS_PER_PAGE]):
+        with chip_cols[i % len(chip_cols)]:
             # Single button acts as the chip. Clicking removes the item.
-            clicked = st.button(
+            # Keyed by the item's stable id, so removing one chip leaves the others untouched.
+            st.button(
                 item,
-                key=f"{state_key}_chip_{i}",
+                key=f"{state_key}_chip_{item_id}",
                 help=f"Remove '{item}'",       # this sets title="Remove '...'"
                 use_container_width=False,     # keep chips compact
+                on_click=store.remove,
+                args=(item_id,),
+            )
+
+    if pages > 1:
+        c1, c2, c3 = st.columns([1, 2, 1])
+        c1.button("‹ Prev", key=f"{page_key}_prev", disabled=page == 0,
+                  on_click=_set_page, args=(page_key, page - 1))
+        c2.caption(f"Page {page + 1} of {pages} · {len(items)} {label.lower()}")
+        c3.button("Next ›", key=f"{page_key}_next", disabled=page == pages - 1,
+                  on_click=_set_page, args=(page_key, page + 1))
+
+def _debug_ui() -> bool:
+    """
+    Whether visitors may open the metrics panel with ?debug=1: only when PROFILEGEN_DEBUG_UI
+    is set. Unset, the parameter is ignored: timings are not for every visitor to switch on.
+    """
+    return os.environ.get("PROFILEGEN_DEBUG_UI", "").lower() in ("1", "true", "yes", "on")
+
+
+def _show_metrics_panel(registry: metrics.Registry):
+    """Debug panel: per-stage timings and counters aggregated over this session's runs."""
+    snap = registry.snapshot()
+    with st.expander("🔧 Pipeline metrics", expanded=True):
+        if not snap["stages"]:
+            st.caption("Nothing measured yet. Generate a profile.")
+        else:
+            st.dataframe(
+                [
+                    {
+                        "stage": name,
+                        "count": s["count"],
+                        "mean ms": round(s["mean_s"] * 1000, 3),
+                        "p50 ms": round(s["p50_s"] * 1000, 3),
+                        "p95 ms": round(s["p95_s"] * 1000, 3),
+                        "max ms": round(s["max_s"] * 1000, 3),
+                    }
+                    for name, s in snap["stages"].items()
+                ],
+                hide_index=True,
             )
-            if clicked:
-                _remove_from_list(state_key, i)
-                st.rerun()
+        if snap["counters"]:
+            st.json(snap["counters"])
+        c1, c2 = st.columns(2)
+        c1.download_button("Prometheus", registry.to_prometheus(), file_name="metrics.prom", mime="text/plain")
+        c2.button("Reset", key="metrics_reset", on_click=registry.reset)
+        st.caption("ui.* stages time the Python side of Streamlit calls; browser rendering is not included.")
 
 # ---------------------------
 # Layout: Left (CTA) | Center (App) | Right (Tutorial)
 # ---------------------------
 st.set_page_config(page_title="GitHub Profile Generator", page_icon="🐙", layout="wide")
 
+# ?debug=1 times this session's runs (nobody else's) and shows the metrics panel, if the server allows it
+show_metrics = _debug_ui() and st.query_params.get("debug") == "1"
+session_metrics = st.session_state.setdefault("metrics", metrics.Registry()) if show_metrics else None
+
 left_col, center_col, right_col = st.columns([1, 2, 1], gap="large")
 
 # ---------------------------
@@ -73,11 +273,12 @@ with left_col:
 **Contact:** [mkazemiesfahani@gmail.com](mailto:mkazemiesfahani@gmail.com)
             """
         )
+    metrics_slot = st.container()  # filled at the end of the run, once this run's stages are measured
 
 # ---------------------------
 # CENTER: The App (your existing UI)
 # ---------------------------
-with center_col:
+with center_col, (metrics.recording(session_metrics) if show_metrics else nullcontext()):
     # --- Add logo ---
     logo_path = Path("images/logo.png")  # adjust filename if needed
     if logo_path.exists():
@@ -92,18 +293,22 @@ with center_col:
     st.caption("Create a polished GitHub profile README from a theme.")
 
     # --- Theme discovery ---
-    themes_dir = Path("src/themes")
-    themes_dir.mkdir(parents=True, exist_ok=True)
-    themes = sorted([p.stem for p in themes_dir.glob("*.txt")])
+    theme_registry = _theme_registry()
+    themes = theme_registry.names()
     if not themes:
         st.warning("No themes found in `src/themes`. Add at least one `.txt` template.")
     theme = st.radio("Select theme", themes, horizontal=True) if themes else None
+    try:
+        theme_has_stats = theme_registry.get(theme).has_stats if theme in theme_registry else False
+    except TemplateSyntaxError as e:
+        st.error(f"Theme `{theme}` cannot be used: {e}")
+        theme, theme_has_stats = None, False
 
     # Init session state lists/inputs
     if "skills" not in st.session_state:
-        st.session_state.skills = []
+        st.session_state.skills = ChipStore()
     if "tech_stack" not in st.session_state:
-        st.session_state.tech_stack = []
+        st.session_state.tech_stack = ChipStore()
     if "skill_input" not in st.session_state:
         st.session_state.skill_input = ""
     if "tech_input" not in st.session_state:
@@ -114,6 +319,7 @@ with center_col:
     linkedin = github = instagram = website = youtube = facebook = ""
     github_username = ""  # optional; derive from URL if blank
     tech_stack_use_logos = True
+    badge_mode = "remote"
 
     # --- Inputs ---
     if theme == "default":
@@ -147,11 +353,12 @@ with center_col:
             col_in, col_btn = st.columns([4, 1])
 
             def _on_add_skill():
-                _add_to_list("skills", st.session_state.skill_input)
+                st.session_state.skills.add(st.session_state.skill_input)
                 st.session_state.skill_input = ""
 
             col_in.text_input("Add a skill", key="skill_input", placeholder="e.g., Machine Vision", on_change=_on_add_skill)
             col_btn.button("Add", key="add_skill_btn", on_click=_on_add_skill, use_container_width=True)
+            _render_bulk_import("skills", "Skills")
             _render_chips("skills", "Skills")
 
         # ------------------------
@@ -162,7 +369,7 @@ with center_col:
             col_in2, col_btn2 = st.columns([4, 1])
 
             def _on_add_tech():
-                _add_to_list("tech_stack", st.session_state.tech_input)
+                st.session_state.tech_stack.add(st.session_state.tech_input)
                 st.session_state.tech_input = ""
 
             col_in2.text_input(
@@ -174,6 +381,14 @@ with center_col:
             col_btn2.button("Add", key="add_tech_btn", on_click=_on_add_tech, use_container_width=True)
 
             tech_stack_use_logos = st.checkbox("Try to include logos when recognized", value=True)
+            badge_mode = st.selectbox(
+                "Badges",
+                list(BADGE_MODE_LABELS),
+                format_func=BADGE_MODE_LABELS.get,
+                help="Local badges are generated here as SVG files (text-only, no logos) and need no "
+                     "external requests; download them with the README as a .zip.",
+            )
+            _render_bulk_import("tech_stack", "Tech")
             _render_chips("tech_stack", "Tech")
 
     st.divider()
@@ -183,49 +398,62 @@ with center_col:
     # ------------------------
     colA, colB, colC = st.columns([1, 1, 2])
     show_raw = colA.checkbox("Show raw README.md", value=True)
-    include_stats = colB.checkbox("Include GitHub stats", value=True,
-                                  help="Adds the Top Languages & Streak image widgets.")
+    live_preview = colA.checkbox("Live preview", value=False,
+                                 help="Update the preview as you type, re-rendering only what changed.")
+    check_links = colA.checkbox("Check links", value=False,
+                                help="Open every profile link and report the ones that are broken.")
+    include_stats = colB.checkbox("Include GitHub stats", value=True, disabled=not theme_has_stats,
+                                  help="Adds the Top Languages & Streak image widgets."
+                                  if theme_has_stats else "This theme has no GitHub stats section.")
+    stats_roots = _stats_roots()
+    local_stats = stats_roots and colB.checkbox(
+        "Compute stats locally", value=False, disabled=not theme_has_stats,
+        help="Render the stats cards from git clones on this machine instead of the third-party widgets.",
+    )
     generate_clicked = colC.button("Generate Profile", type="primary", use_container_width=True)
-
-    # Assemble user data for placeholder filling
-    user_data = {
-        "name": name,
-        "title": title,
-        "email": email,
-        "motto": motto,
-        "summary": summary,
-        "linkedin": linkedin,
-        "github": github,
-        "instagram": instagram,
-        "website": website,
-        "youtube": youtube,
-        "Facebook": facebook,
-        "github_username": github_username,
-        "skills": st.session_state.skills,
-        "tech_stack": st.session_state.tech_stack,
-        "tech_stack_use_logos": tech_stack_use_logos,
-    }
+    cards, card_assets = ("", ())
+    if local_stats and include_stats and theme_has_stats:
+        cards, card_assets = _local_stats_form(stats_roots)
+
+    # Assemble an immutable snapshot of the form for rendering
+    profile = ProfileInput(
+        name=name,
+        title=title,
+        email=email,
+        motto=motto,
+        summary=summary,
+        linkedin=linkedin,
+        github=github,
+        instagram=instagram,
+        website=website,
+        youtube=youtube,
+        facebook=facebook,
+        github_username=github_username,
+        skills=st.session_state.skills.values(),
+        tech_stack=st.session_state.tech_stack.values(),
+        tech_stack_use_logos=tech_stack_use_logos,
+    )
+
+    ctx = RenderContext(theme, include_stats, badge_mode, cards, card_assets)
+
+    if live_preview and theme:
+        _show_live_preview(theme, profile, ctx, show_raw)
 
     if generate_clicked:
         if not theme:
             st.error("No theme selected. Please add a theme file to `src/themes`.")
         else:
             try:
-                output = generate_readme(theme, user_data)
-
-                # Strip the GitHub stats block if disabled
-                if not include_stats:
-                    output = re.sub(
-                        r"<div>.*?github-readme-stats.*?github-readme-streak-stats.*?</div>",
-                        "",
-                        output,
-                        flags=re.DOTALL | re.IGNORECASE,
-                    )
+                with metrics.span("ui.render"):
+                    output, rendered_assets = _render_cache().render_with_assets(profile, ctx)
 
                 st.success("Profile generated!")
+                if check_links:
+                    _show_link_check(profile)
+                preview = _preview_html(output, theme, rendered_assets)
                 with st.container(border=True):
                     st.markdown("#### Preview")
-                    st.markdown(output, unsafe_allow_html=True)
+                    st.html(preview)
 
                 if show_raw:
                     st.markdown("#### Raw README.md")
@@ -233,11 +461,29 @@ with center_col:
 
                 with st.container(border=True):
                     st.subheader("Ready?")
+                    assets = asset_files(rendered_assets)
+                    if not assets:
+                        st.download_button(
+                            label="⬇️ Download README.md",
+                            data=output,
+                            file_name="README.md",
+                            mime="text/markdown",
+                            use_container_width=True,
+                        )
+                    else:
+                        st.download_button(
+                            label="⬇️ Download README.md + images (.zip)",
+                            data=_readme_zip(output, assets),
+                            file_name="README.zip",
+                            mime="application/zip",
+                            use_container_width=True,
+                        )
+                        st.caption("Unzip into the root of your profile repo so `badges/` sits next to README.md.")
                     st.download_button(
-                        label="⬇️ Download README.md",
-                        data=output.encode("utf-8"),
-                        file_name="README.md",
-                        mime="text/markdown",
+                        label="⬇️ Download as web page (.html)",
+                        data=html_page(preview, name or "Profile"),
+                        file_name="profile.html",
+                        mime="text/html",
                         use_container_width=True,
                     )
 
@@ -283,3 +529,7 @@ with right_col:
 - Want multiple styles? Contribute to this [repo](https://github.com/mkazemie/github-profile-generator) to create more templates!
             """
         )
+
+if show_metrics:
+    with metrics_slot:
+        _show_metrics_panel(session_metrics)
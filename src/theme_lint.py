@@ -0,0 +1,8 @@
+# theme_lint.py
+"""`python src/theme_lint.py ...` from a checkout; installed, the same CLI is `profilegen-theme-lint` (see profilegen.theme_lint)."""
+import sys
+
+from profilegen.theme_lint import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# theme_pack.py
+"""`python src/theme_pack.py ...` from a checkout; installed, the same CLI is `profilegen-theme-pack` (see profilegen.theme_pack)."""
+import sys
+
+from profilegen.theme_pack import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+from datetime import date
+
+import pytest
+
+from profilegen.badge_svg import asset_files, get_store, svg_digest
+from profilegen.generate_readme import RenderContext, render_with_assets
+from profilegen.local_stats import UserStats, stats_cards
+from profilegen.profile_input import ProfileInput
+from profilegen.render_cache import RenderCache
+
+
+@pytest.fixture(autouse=True)
+def badge_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILEGEN_BADGE_DIR", str(tmp_path / "badges"))
+    get_store.cache_clear()
+    yield tmp_path / "badges"
+    get_store.cache_clear()
+
+
+def _profile(**fields):
+    return ProfileInput.from_mapping({"name": "Ada", "tech_stack": ["Python", "Docker"], **fields})
+
+
+@pytest.mark.parametrize("mode, count", [("local", 2), ("strip", 1)])
+def test_assets_come_from_the_render_not_the_text(mode, count):
+    fake = "badges/0123456789abcdef.svg"
+    text, assets = render_with_assets(_profile(summary=f"![x]({fake})"), RenderContext("default", badge_mode=mode))
+    assert fake in text
+    files = asset_files(assets)
+    assert len(files) == count and fake not in files
+    assert all(member in text for member in files)
+
+
+def test_evicted_badges_are_drawn_again(badge_dir):
+    cache = RenderCache()
+    ctx = RenderContext("default", badge_mode="local")
+    expected = asset_files(cache.render_with_assets(_profile(), ctx).assets)
+    for path in badge_dir.glob("*.svg"):
+        path.unlink()
+    assert asset_files(cache.render_with_assets(_profile(), ctx).assets) == expected
+    assert cache.memory_hits == 1
+
+
+def test_stats_cards_stay_out_of_the_store(badge_dir):
+    stats = UserStats(languages=(("Python", 1000),), days=(("2026-01-01", 3),), repos=1, scanned=1)
+    cards, svgs = stats_cards(stats, date(2026, 1, 2))
+    ctx = RenderContext("default", stats_cards=cards, stats_assets=svgs)
+    text, assets = render_with_assets(_profile(tech_stack=[]), ctx)
+    assert set(asset_files(assets)) == {a.member for a in svgs}
+    assert all(a.member in text for a in svgs)
+    assert not list(badge_dir.glob("*.svg"))
+    assert svg_digest(svgs[0].svg) == svgs[0].digest
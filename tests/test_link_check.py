@@ -0,0 +1,47 @@
+import http.server
+import threading
+
+import pytest
+
+from profilegen import link_check
+from profilegen.link_check import OK, check_urls, request_target
+
+
+@pytest.fixture
+def server():
+    """A local HTTP server answering 200 for every request line it can parse; records the targets."""
+    seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            seen.append(self.path)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", seen
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.mark.parametrize("url, target", [
+    ("https://example.com", "/"),
+    ("https://example.com/a b", "/a%20b"),
+    ("https://example.com/?q=café", "/?q=caf%C3%A9"),
+    ("https://example.com/?q=a b&x=1", "/?q=a%20b&x=1"),
+    ("https://example.com/p?q=%C3%A9&next=/x?y", "/p?q=%C3%A9&next=/x?y"),
+])
+def test_request_target_is_ascii(url, target):
+    assert request_target(url) == target
+
+
+@pytest.mark.parametrize("query, sent", [("q=café", "q=caf%C3%A9"), ("q=a b", "q=a%20b")])
+def test_query_is_percent_encoded_on_the_wire(server, query, sent):
+    base, seen = server
+    result = check_urls([f"{base}/search?{query}"], link_check.LinkCache())[f"{base}/search?{query}"]
+    assert result.verdict == OK, result
+    assert seen == [f"/search?{sent}"]
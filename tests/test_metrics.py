@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from profilegen import metrics
+
+
+@pytest.fixture(autouse=True)
+def disabled(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_recording_is_scoped_to_the_block_and_thread():
+    session = metrics.Registry()
+    other = threading.Thread(target=lambda: metrics.count("other.thread"))
+    with metrics.recording(session):
+        with metrics.span("inside"):
+            pass
+        metrics.count("inside.count")
+        other.start()
+        other.join()
+    metrics.count("outside.count")
+    assert metrics.span("outside") is metrics._NOOP
+
+    snap = session.snapshot()
+    assert list(snap["stages"]) == ["inside"] and snap["counters"] == {"inside.count": 1}
+    assert metrics.snapshot() == {"stages": {}, "counters": {}}
+    assert not metrics.enabled()
+
+
+def test_process_metrics_still_get_everything_when_enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    session = metrics.Registry()
+    with metrics.recording(session):
+        metrics.count("both")
+    metrics.count("process.only")
+    assert session.snapshot()["counters"] == {"both": 1}
+    assert metrics.snapshot()["counters"] == {"both": 1, "process.only": 1}
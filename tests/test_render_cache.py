@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from profilegen.generate_readme import RenderContext, render_profile
+from profilegen.profile_input import ProfileInput
+from profilegen.render_cache import RenderCache
+
+
+def _profiles(n):
+    return [ProfileInput.from_mapping({"name": f"User {i}", "skills": [f"skill{i % 7}"]}) for i in range(n)]
+
+
+def test_concurrent_renders_with_a_disk_tier(tmp_path):
+    ctx = RenderContext("default")
+    profiles = _profiles(40)
+    expected = [render_profile(p, ctx) for p in profiles]
+    cache = RenderCache(max_entries=8, disk_path=tmp_path / "c.db")
+    with ThreadPoolExecutor(16) as pool:
+        for _ in range(3):
+            assert list(pool.map(lambda p: cache.render(p, ctx), profiles)) == expected
+    cache.close()
+    assert cache.misses == len(profiles)
+
+    reopened = RenderCache(disk_path=tmp_path / "c.db")
+    assert [reopened.render(p, ctx) for p in profiles] == expected
+    assert reopened.disk_hits == len(profiles) and reopened.misses == 0
+    reopened.close()
+
+
+def test_memory_hits_do_not_wait_for_the_disk(tmp_path):
+    ctx = RenderContext("default")
+    hot, cold = _profiles(2)
+    cache = RenderCache(disk_path=tmp_path / "c.db")
+    cache.render(hot, ctx)
+
+    entered, release = threading.Event(), threading.Event()
+    disk_get = cache._disk.get
+
+    def slow_get(key):
+        entered.set()
+        release.wait(5)
+        return disk_get(key)
+
+    cache._disk.get = slow_get
+    slow = threading.Thread(target=cache.render, args=(cold, ctx))
+    slow.start()
+    try:
+        assert entered.wait(5)
+        # would block on the lock if it were held across the sqlite read
+        fast = threading.Thread(target=cache.render, args=(hot, ctx))
+        fast.start()
+        fast.join(2)
+        assert not fast.is_alive() and cache.memory_hits == 1
+    finally:
+        release.set()
+        slow.join()
+        cache.close()
@@ -0,0 +1,29 @@
+import pytest
+
+from profilegen.template_lang import TemplateSyntaxError, compile_block
+from profilegen.templates import compile_template
+
+
+@pytest.mark.parametrize("source", ["{% if x² %}y{% endif %}", "{% for s in skillś %}{{ s }}{% endfor %}", "{{ é | upper }}"])
+def test_non_identifier_names_are_syntax_errors(source):
+    with pytest.raises(TemplateSyntaxError):
+        compile_block(source)
+
+
+def test_error_line_is_the_block_line_in_the_theme():
+    with pytest.raises(TemplateSyntaxError) as e:
+        compile_template("# Title\n\nintro\n{% if x² %}\nshown\n{% endif %}\n")
+    assert e.value.line == 4
+
+
+def test_python_syntax_errors_become_template_errors(monkeypatch):
+    from profilegen import template_lang
+
+    monkeypatch.setattr(template_lang._Codegen, "variable", lambda self, name: "1 +")
+    with pytest.raises(TemplateSyntaxError, match="cannot compile block"):
+        compile_block.__wrapped__("{% if anything %}y{% endif %}")
+
+
+def test_ascii_names_still_compile():
+    block = compile_block("{% for s in skills %}{{ s | upper }}{% if not loop.last %}, {% endif %}{% endfor %}")
+    assert block.fn({"skills": ("a", "b")}.get, {"upper": str.upper}) == "A, B"